@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import SavedSearch
+
+# Register your models here.
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('name', 'user', 'query', 'is_active', 'created_at')
+    list_filter = ('is_active', 'created_at')
+    search_fields = ('name', 'query', 'user__username')
+    ordering = ('-created_at',)
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
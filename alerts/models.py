@@ -0,0 +1,69 @@
+from django.db import models
+from jobs.models import Job
+from users.models import User
+
+# Create your models here.
+class SavedSearch(models.Model):
+    """
+    A job seeker's saved job search: ``query`` as the job list's ``search``
+    parameter and ``filters`` as its JobFilter parameters. Active searches
+    are matched against new and reactivated jobs (see alerts.percolator).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100)
+    query = models.CharField(max_length=200, blank=True)
+    # Normalized JobFilter parameters, e.g. {"job_type": "full_time", "skills": [3, 7]}
+    filters = models.JSONField(default=dict, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.user.username})"
+
+
+class SavedSearchTerm(models.Model):
+    """
+    Reverse index entry: an active search is listed under the terms of one
+    of its constraints, so a job is only checked against searches sharing
+    one of its own terms (``skill:3``, ``word:python``, ``job_type:contract``...).
+    """
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=80)
+
+    class Meta:
+        constraints = [
+            # Also the (term, search) index the percolator probes
+            models.UniqueConstraint(fields=['term', 'search'], name='unique_saved_search_term'),
+        ]
+
+    def __str__(self):
+        return self.term
+
+
+class SavedSearchMatch(models.Model):
+    """A job matching a saved search, waiting for (or included in) the user's next digest."""
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='saved_search_matches')
+    # Denormalized from the search: digests are collected per user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_search_matches')
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['search', 'job'], name='unique_saved_search_match'),
+        ]
+        indexes = [
+            models.Index(fields=['user'], name='alert_match_pending_idx', condition=models.Q(notified_at__isnull=True)),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.search_id} -> {self.job_id}"
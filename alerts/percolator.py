@@ -0,0 +1,169 @@
+"""
+Reverse ("percolator") matching of new jobs against saved searches.
+
+Running every saved search against every new job costs a query per search.
+Instead each active search is filed in SavedSearchTerm under the terms of
+one constraint it cannot match without, and a job only fetches the
+searches filed under one of its own terms, with one indexed query, before
+checking those few in Python with JobFilter's semantics.
+
+A search is filed under whichever of these is rarest in the index:
+- one ``skill:<id>`` term per accepted skill (a job needs any of them)
+- one ``category:<id>`` term per accepted category
+- its ``job_type:<type>``
+- one ``word:<word>`` of its text query, title, company or location
+Searches without any of those (salary only) are filed under ``any``.
+Words are looked up as whole words, so a word-filed search only alerts on
+jobs containing the word on its own (``python``, not ``pythonic``).
+"""
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from django.db.models import Count
+from rest_framework.filters import search_smart_split
+from jobs.models import Job
+from .models import SavedSearchTerm
+
+WORD_RE = re.compile(r'\w+')
+# Longer words are cut on both sides, so they still meet in the index
+MAX_WORD_LENGTH = 64
+WORD_FILTERS = ('title', 'company', 'location')
+
+
+def words(text):
+    return {word[:MAX_WORD_LENGTH] for word in WORD_RE.findall(text.lower())}
+
+
+def query_terms(query):
+    """``query`` split like the job list's ``search`` parameter: every term must occur in one field."""
+    return [term.lower() for term in search_smart_split(query)]
+
+
+@dataclass
+class JobDocument:
+    """What matching reads of a job, text fields lowercased."""
+    pk: int
+    title: str
+    description: str
+    location: str
+    company: str
+    job_type: str
+    salary_range: str
+    category_ids: frozenset
+    skill_ids: frozenset
+
+    @property
+    def texts(self):
+        return (self.title, self.description, self.location, self.company)
+
+    def terms(self):
+        terms = {'any', f'job_type:{self.job_type}'}
+        terms.update(f'category:{pk}' for pk in self.category_ids)
+        terms.update(f'skill:{pk}' for pk in self.skill_ids)
+        terms.update(f'word:{word}' for word in words(' '.join(self.texts)))
+        return terms
+
+
+def load_jobs(job_ids):
+    """JobDocuments of the active jobs among ``job_ids``, in three queries."""
+    rows = Job.objects.filter(pk__in=job_ids, is_active=True).values_list(
+        'pk', 'title', 'description', 'location', 'company__name', 'job_type', 'salary_range'
+    )
+    links = {}
+    for name, field in (('categories', 'category_id'), ('required_skills', 'skill_id')):
+        through = Job._meta.get_field(name).remote_field.through
+        linked = defaultdict(set)
+        for job_id, target_id in through.objects.filter(job_id__in=job_ids).values_list('job_id', field):
+            linked[job_id].add(target_id)
+        links[name] = linked
+    return [
+        JobDocument(
+            pk=pk, title=title.lower(), description=description.lower(), location=location.lower(),
+            company=company.lower(), job_type=job_type, salary_range=salary_range,
+            category_ids=frozenset(links['categories'][pk]), skill_ids=frozenset(links['required_skills'][pk]),
+        )
+        for pk, title, description, location, company, job_type, salary_range in rows
+    ]
+
+
+def constraint_groups(query, filters):
+    """Alternative term sets a search can be filed under; a matching job carries a term of each."""
+    groups = []
+    if filters.get('skills'):
+        groups.append([f'skill:{pk}' for pk in filters['skills']])
+    if filters.get('categories'):
+        groups.append([f'category:{pk}' for pk in filters['categories']])
+    if filters.get('job_type'):
+        groups.append([f"job_type:{filters['job_type']}"])
+    texts = query_terms(query) + [filters[name].lower() for name in WORD_FILTERS if filters.get(name)]
+    groups.extend([f'word:{word}'] for text in texts for word in sorted(words(text)))
+    return groups
+
+
+def index_search(search):
+    """(Re)file ``search`` under its rarest constraint; inactive searches are removed from the index."""
+    SavedSearchTerm.objects.filter(search=search).delete()
+    if not search.is_active:
+        return []
+    groups = constraint_groups(search.query, search.filters)
+    if groups:
+        counts = dict(
+            SavedSearchTerm.objects.filter(term__in={term for group in groups for term in group})
+            .values_list('term').annotate(total=Count('pk')).order_by()
+        )
+        # Fewest searches to check when a job carries these terms; ties go to the earlier (stricter) kind
+        terms = min(groups, key=lambda group: sum(counts.get(term, 0) for term in group))
+    else:
+        terms = ['any']
+    SavedSearchTerm.objects.bulk_create(SavedSearchTerm(search=search, term=term) for term in terms)
+    return terms
+
+
+def matches(query, filters, job):
+    """Whether ``job`` (a JobDocument) is in the results of the job list filtered like this search."""
+    for term in query_terms(query):
+        if not any(term in text for text in job.texts):
+            return False
+    for name in WORD_FILTERS:
+        if filters.get(name) and filters[name].lower() not in getattr(job, name):
+            return False
+    if filters.get('job_type') and filters['job_type'] != job.job_type:
+        return False
+    # JobFilter compares salary_range as text, like the database does
+    if filters.get('salary_min') and not job.salary_range >= filters['salary_min']:
+        return False
+    if filters.get('salary_max') and not job.salary_range <= filters['salary_max']:
+        return False
+    if filters.get('categories') and job.category_ids.isdisjoint(filters['categories']):
+        return False
+    if filters.get('skills') and job.skill_ids.isdisjoint(filters['skills']):
+        return False
+    return True
+
+
+def percolate(jobs):
+    """
+    ``[(search_id, user_id, job_id)]`` for the active saved searches each of
+    ``jobs`` (JobDocuments) matches, fetching the candidates of all of them
+    with one query.
+    """
+    terms = {job.pk: job.terms() for job in jobs}
+    wanted = set().union(*terms.values())
+    rows = SavedSearchTerm.objects.filter(term__in=wanted, search__is_active=True).values_list(
+        'term', 'search_id', 'search__user_id', 'search__query', 'search__filters'
+    )
+    by_term = defaultdict(list)
+    for term, *search in rows:
+        by_term[term].append(search)
+    found = []
+    for job in jobs:
+        # A search filed under several of the job's terms is checked once
+        checked = set()
+        for term in terms[job.pk]:
+            for search_id, user_id, query, filters in by_term.get(term, ()):
+                if search_id in checked:
+                    continue
+                checked.add(search_id)
+                if matches(query, filters, job):
+                    found.append((search_id, user_id, job.pk))
+    return found
@@ -0,0 +1,56 @@
+from django.conf import settings
+from rest_framework import serializers
+from jobs.filters import JobFilter
+from jobs.models import Job
+from .models import SavedSearch
+
+# JobFilter parameters a saved search may keep; alerts are for active jobs only
+SAVED_FILTERS = ('title', 'location', 'company', 'job_type', 'salary_min', 'salary_max', 'categories', 'skills')
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'query', 'filters', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+        extra_kwargs = {
+            'query': {'help_text': 'Text search, as the job list search parameter'},
+            'filters': {'help_text': f"Job list filters: {', '.join(SAVED_FILTERS)}"},
+            'is_active': {'help_text': 'Whether new matching jobs are sent in digests'},
+        }
+
+    def validate_query(self, value):
+        return value.strip()
+
+    def validate_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Filters must be an object of job list filters.")
+        unknown = sorted(set(value) - set(SAVED_FILTERS))
+        if unknown:
+            raise serializers.ValidationError(f"Unsupported filters: {', '.join(unknown)}.")
+        filterset = JobFilter(data=value, queryset=Job.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        cleaned = {}
+        for name in SAVED_FILTERS:
+            data = filterset.form.cleaned_data.get(name)
+            if name in ('categories', 'skills'):
+                if data:
+                    cleaned[name] = sorted(item.pk for item in data)
+            elif name in ('salary_min', 'salary_max'):
+                if data is not None:
+                    # Compared with salary_range as text, as the job list filter does
+                    cleaned[name] = str(data)
+            elif data:
+                cleaned[name] = data
+        return cleaned
+
+    def validate(self, attrs):
+        query = attrs.get('query', getattr(self.instance, 'query', ''))
+        filters = attrs.get('filters', getattr(self.instance, 'filters', {}))
+        if not query and not filters:
+            raise serializers.ValidationError("A saved search needs a query or at least one filter.")
+        if self.instance is None:
+            limit = settings.SAVED_SEARCH_ALERTS['MAX_SEARCHES_PER_USER']
+            if SavedSearch.objects.filter(user=self.context['request'].user).count() >= limit:
+                raise serializers.ValidationError(f"You can save at most {limit} searches.")
+        return attrs
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from jobs.models import Job
+from .models import SavedSearch
+from .percolator import index_search
+from .tasks import queue_job_matching
+
+# New jobs and jobs saved back to active are matched here. Set-based
+# ``QuerySet.update()`` activations call tasks.queue_job_matching themselves.
+
+@receiver(post_init, sender=Job)
+def snapshot_job_active(sender, instance, **kwargs):
+    instance._alerts_was_active = None if 'is_active' in instance.get_deferred_fields() else instance.is_active
+
+@receiver(post_save, sender=Job)
+def match_new_job(sender, instance, created, **kwargs):
+    # Queued for after commit: categories and skills are saved after the row
+    if instance.is_active and (created or getattr(instance, '_alerts_was_active', None) is False):
+        queue_job_matching([instance.pk])
+    instance._alerts_was_active = instance.is_active
+
+@receiver(post_save, sender=SavedSearch)
+def reindex_saved_search(sender, instance, **kwargs):
+    index_search(instance)
@@ -0,0 +1,93 @@
+from collections import defaultdict
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from jobboard.tasks import RetryingTask, chunked, enqueue_on_commit, single_flight
+from .models import SavedSearchMatch
+from .percolator import load_jobs, percolate
+
+@shared_task(base=RetryingTask)
+def match_saved_searches(job_ids):
+    """
+    Record the saved searches each still active job matches, for the next
+    digests. Safe to redeliver: a search and job are matched at most once.
+    """
+    jobs = load_jobs(job_ids)
+    if not jobs:
+        return 0
+    found = percolate(jobs)
+    SavedSearchMatch.objects.bulk_create(
+        [SavedSearchMatch(search_id=search_id, user_id=user_id, job_id=job_id) for search_id, user_id, job_id in found],
+        ignore_conflicts=True,
+    )
+    return len(found)
+
+def queue_job_matching(job_ids):
+    """Match new or reactivated jobs against saved searches once the current transaction commits."""
+    for batch in chunked(job_ids, settings.SAVED_SEARCH_ALERTS['MATCH_BATCH_SIZE']):
+        enqueue_on_commit(match_saved_searches, batch)
+
+def digest_message(user, matches, connection):
+    limit = settings.SAVED_SEARCH_ALERTS['DIGEST_MAX_JOBS']
+    by_search = defaultdict(list)
+    for match in matches[:limit]:
+        by_search[match.search].append(match.job)
+    sections = [
+        f'{search.name}:\n' + ''.join(f'- {job.title} at {job.company.name} ({job.location})\n' for job in jobs)
+        for search, jobs in by_search.items()
+    ]
+    more = len(matches) - limit
+    if more > 0:
+        sections.append(f'...and {more} more.\n')
+    jobs = len({match.job_id for match in matches})
+    return EmailMessage(
+        subject=f"{jobs} new job{'s' if jobs != 1 else ''} for your saved searches",
+        body=f'Hi {user.username},\n\nNew jobs match your saved searches:\n\n' + '\n'.join(sections),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+        connection=connection,
+    )
+
+@shared_task(base=RetryingTask)
+def send_saved_search_digests():
+    """
+    Email every user with new saved-search matches one digest of them,
+    DIGEST_BATCH_SIZE users at a time. Matches are claimed under row locks
+    before sending, so neither a redelivered nor a concurrent run repeats a
+    digest; matches of jobs closed in the meantime are dropped.
+    """
+    options = settings.SAVED_SEARCH_ALERTS
+    sent = 0
+    with single_flight('alerts:digests', timeout=3600) as acquired:
+        if not acquired:
+            return sent
+        connection = get_connection()
+        while True:
+            user_ids = list(
+                SavedSearchMatch.objects.filter(notified_at__isnull=True)
+                .order_by().values_list('user_id', flat=True).distinct()[:options['DIGEST_BATCH_SIZE']]
+            )
+            if not user_ids:
+                break
+            with transaction.atomic():
+                # Rows another run is claiming are skipped, and the claim commits before any email goes out
+                pending = list(
+                    SavedSearchMatch.objects.filter(user_id__in=user_ids, notified_at__isnull=True)
+                    .select_for_update(skip_locked=True, of=('self',))
+                    .select_related('user', 'search', 'job', 'job__company')
+                    .order_by('user_id', 'search_id', '-job__created_at')
+                )
+                if not pending:
+                    break
+                SavedSearchMatch.objects.filter(pk__in=[match.pk for match in pending]).update(notified_at=timezone.now())
+            by_user = defaultdict(list)
+            for match in pending:
+                if match.job.is_active and match.search.is_active:
+                    by_user[match.user].append(match)
+            for user, matches in by_user.items():
+                if user.is_active and user.email:
+                    digest_message(user, matches, connection).send()
+                    sent += 1
+    return sent
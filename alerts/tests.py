@@ -0,0 +1,183 @@
+from unittest import mock
+from django.conf import settings
+from django.core import mail
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from jobboard.test_utils import BaseAPITestCase
+from categories.models import Category, Skill
+from jobs.models import Job
+from . import percolator
+from .models import SavedSearch, SavedSearchMatch
+from .tasks import match_saved_searches, send_saved_search_digests
+
+# Create your tests here.
+class SavedSearchTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company(name='Acme Analytics')
+        self.python = Skill.objects.create(name='Python')
+        self.go = Skill.objects.create(name='Go')
+        self.communication = Skill.objects.create(name='Communication')
+        self.engineering = Category.objects.create(name='Engineering')
+
+    def save_search(self, user=None, name='Search', query='', **filters):
+        return SavedSearch.objects.create(user=user or self.job_seeker_user, name=name, query=query, filters=filters)
+
+    def post_job(self, skills=None, categories=None, **kwargs):
+        """Create a job the way employers do, running the callbacks queued on commit"""
+        data = {
+            'title': 'Backend Engineer', 'description': 'Build APIs', 'company': self.company.pk,
+            'location': 'Berlin, Germany', 'job_type': 'full_time', 'salary_range': '70000',
+            'required_skills': [skill.pk for skill in skills or [self.communication]],
+            'categories': [category.pk for category in categories or [self.engineering]],
+        }
+        data.update(kwargs)
+        self.authenticate_user(self.employer_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('job-list-create'), data, format='json')
+        self.assertResponseSuccess(response, status.HTTP_201_CREATED)
+        self.remove_authentication()
+        return Job.objects.latest('pk')
+
+    def matched(self, search):
+        return set(SavedSearchMatch.objects.filter(search=search).values_list('job_id', flat=True))
+
+
+class SavedSearchAPITests(SavedSearchTestCase):
+    """Test managing saved searches"""
+
+    def test_create_normalizes_filters(self):
+        self.authenticate_user(self.job_seeker_user)
+        response = self.client.post(reverse('saved-search-list-create'), {
+            'name': 'Python jobs', 'query': ' api ',
+            'filters': {'skills': [self.python.pk], 'job_type': 'full_time', 'salary_min': '50000', 'title': ''},
+        }, format='json')
+        self.assertResponseSuccess(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['query'], 'api')
+        self.assertEqual(
+            response.data['filters'], {'job_type': 'full_time', 'salary_min': '50000', 'skills': [self.python.pk]}
+        )
+        search = SavedSearch.objects.get(pk=response.data['id'])
+        self.assertEqual(search.user, self.job_seeker_user)
+        self.assertEqual(list(search.terms.values_list('term', flat=True)), [f'skill:{self.python.pk}'])
+
+    def test_invalid_searches_rejected(self):
+        self.authenticate_user(self.job_seeker_user)
+        url = reverse('saved-search-list-create')
+        for filters in ({'is_active': False}, {'job_type': 'forever'}, {'skills': [999999]}, {}):
+            response = self.client.post(url, {'name': 'Bad', 'filters': filters}, format='json')
+            self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+        with override_settings(SAVED_SEARCH_ALERTS={**settings.SAVED_SEARCH_ALERTS, 'MAX_SEARCHES_PER_USER': 1}):
+            self.assertResponseSuccess(self.client.post(url, {'name': 'One', 'query': 'python'}, format='json'), 201)
+            response = self.client.post(url, {'name': 'Two', 'query': 'go'}, format='json')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_users_see_only_their_searches(self):
+        search = self.save_search(query='python')
+        self.authenticate_user(self.employer_user)
+        self.assertEqual(self.client.get(reverse('saved-search-list-create')).data, [])
+        response = self.client.get(reverse('saved-search-detail', args=[search.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pausing_removes_search_from_index(self):
+        search = self.save_search(query='python')
+        self.authenticate_user(self.job_seeker_user)
+        response = self.client.patch(reverse('saved-search-detail', args=[search.pk]), {'is_active': False}, format='json')
+        self.assertResponseSuccess(response)
+        self.assertFalse(search.terms.exists())
+        self.post_job(title='Python Developer')
+        self.assertEqual(self.matched(search), set())
+
+
+class PercolatorTests(SavedSearchTestCase):
+    """Test the reverse index and matching of new jobs"""
+
+    def test_search_filed_under_rarest_constraint(self):
+        for _ in range(3):
+            self.save_search(job_type='full_time')
+        search = self.save_search(query='django', job_type='full_time')
+        self.assertEqual(list(search.terms.values_list('term', flat=True)), ['word:django'])
+        only_salary = self.save_search(salary_min='1000')
+        self.assertEqual(list(only_salary.terms.values_list('term', flat=True)), ['any'])
+
+    def test_new_job_matched_against_candidates_only(self):
+        wanted = self.save_search(name='Python Berlin', skills=[self.python.pk], location='berlin')
+        # A candidate through its skill, rejected on salary
+        too_cheap = self.save_search(skills=[self.python.pk], salary_max='100')
+        # Filed under word:paris, the rarer of its constraints
+        elsewhere = self.save_search(skills=[self.python.pk], location='Paris')
+        # Never candidates: filed under a skill the job does not require
+        for _ in range(20):
+            self.save_search(skills=[self.go.pk])
+
+        with mock.patch('alerts.percolator.matches', wraps=percolator.matches) as checked:
+            job = self.post_job(skills=[self.python])
+        self.assertEqual(checked.call_count, 2)
+        self.assertEqual(self.matched(wanted), {job.pk})
+        self.assertEqual(self.matched(too_cheap), set())
+        self.assertEqual(list(elsewhere.terms.values_list('term', flat=True)), ['word:paris'])
+
+    def test_matching_agrees_with_job_list(self):
+        """Test that a search matches exactly when the job list with its parameters returns the job"""
+        job = self.post_job(
+            title='Senior Python Developer', skills=[self.python], categories=[self.engineering],
+            description='Django and PostgreSQL', location='Remote, Europe',
+        )
+        searches = [
+            ('django', {}), ('python developer', {}), ('"python developer"', {}), ('rust', {}),
+            ('', {'title': 'python', 'job_type': 'full_time'}), ('', {'title': 'python', 'job_type': 'contract'}),
+            ('', {'company': 'acme', 'location': 'europe'}), ('', {'location': 'berlin'}),
+            ('', {'categories': [self.engineering.pk], 'skills': [self.python.pk, self.go.pk]}),
+            ('', {'skills': [self.go.pk]}), ('postgresql', {'salary_min': '60000'}), ('', {'salary_max': '60000'}),
+        ]
+        document, = percolator.load_jobs([job.pk])
+        for query, filters in searches:
+            params = {**filters, 'search': query}
+            listed = self.client.get(reverse('job-list-create'), params)
+            expected = job.pk in {item['id'] for item in listed.data}
+            self.assertEqual(percolator.matches(query, filters, document), expected, params)
+
+    def test_activation_matches_once(self):
+        search = self.save_search(query='engineer')
+        job = self.post_job(is_active=False)
+        self.assertEqual(self.matched(search), set())
+
+        self.authenticate_user(self.employer_user)
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.patch(reverse('job-activation', args=[job.pk]))
+        self.assertEqual(self.matched(search), {job.pk})
+        self.assertEqual(SavedSearchMatch.objects.count(), 1)
+
+        self.assertEqual(match_saved_searches.delay([job.pk]).get(), 1)
+        self.assertEqual(SavedSearchMatch.objects.count(), 1)
+
+
+class DigestTests(SavedSearchTestCase):
+    """Test batched digest emails"""
+
+    def test_one_digest_per_user(self):
+        other = self.create_user(email='other@test.com')
+        python = self.save_search(name='Python', skills=[self.python.pk])
+        berlin = self.save_search(name='Berlin', location='berlin')
+        self.save_search(user=other, name='Go', skills=[self.go.pk])
+        first = self.post_job(title='Python Engineer', skills=[self.python])
+        second = self.post_job(title='Go Engineer', skills=[self.go])
+        closed = self.post_job(title='Closed Python Role', skills=[self.python])
+        Job.objects.filter(pk=closed.pk).update(is_active=False)
+        self.assertEqual(self.matched(python), {first.pk, closed.pk})
+        self.assertEqual(self.matched(berlin), {first.pk, second.pk, closed.pk})
+
+        self.assertEqual(send_saved_search_digests.delay().get(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        digest = next(message for message in mail.outbox if message.to == ['seeker@test.com'])
+        self.assertIn('2 new jobs', digest.subject)
+        self.assertIn('Python Engineer at Acme Analytics', digest.body)
+        self.assertIn('Go Engineer', digest.body)
+        self.assertNotIn('Closed Python Role', digest.body)
+        self.assertFalse(SavedSearchMatch.objects.filter(notified_at__isnull=True).exists())
+
+        self.assertEqual(send_saved_search_digests.delay().get(), 0)
+        self.assertEqual(len(mail.outbox), 2)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import SavedSearchListCreateView, SavedSearchDetailView
+
+urlpatterns = [
+    path('searches/', SavedSearchListCreateView.as_view(), name='saved-search-list-create'),
+    path('searches/<int:pk>/', SavedSearchDetailView.as_view(), name='saved-search-detail'),
+]
@@ -0,0 +1,50 @@
+from rest_framework import generics, permissions
+from .models import SavedSearch
+from .serializers import SavedSearchSerializer
+from drf_spectacular.utils import extend_schema, OpenApiExample
+
+# Create your views here.
+@extend_schema(
+    tags=['alerts'],
+    summary='List and create saved searches',
+    description=(
+        'Job seekers save job list searches (a text query plus job list filters) and receive '
+        'digests of new or reactivated jobs matching them.'
+    ),
+    examples=[
+        OpenApiExample(
+            'Saved Search Example',
+            value={
+                'name': 'Python in Berlin',
+                'query': 'backend',
+                'filters': {'location': 'Berlin', 'job_type': 'full_time', 'skills': [1]},
+            },
+            request_only=True,
+        )
+    ]
+)
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return SavedSearch.objects.none()
+        return SavedSearch.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+@extend_schema(
+    tags=['alerts'],
+    summary='Retrieve, update or delete a saved search',
+    description='Users manage their own saved searches; set is_active to false to pause alerts.'
+)
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return SavedSearch.objects.none()
+        return SavedSearch.objects.filter(user=self.request.user)
@@ -0,0 +1,30 @@
+from django.contrib import admin
+from .models import PlatformCounter, DailySignupRollup, DailyJobRollup, DailyApplicationRollup
+
+# Register your models here.
+@admin.register(PlatformCounter)
+class PlatformCounterAdmin(admin.ModelAdmin):
+    list_display = ('name', 'value', 'updated_at')
+    readonly_fields = ('updated_at',)
+    search_fields = ('name',)
+    ordering = ('name',)
+
+@admin.register(DailySignupRollup)
+class DailySignupRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'user_type', 'count')
+    list_filter = ('user_type',)
+    date_hierarchy = 'day'
+    ordering = ('-day',)
+
+@admin.register(DailyJobRollup)
+class DailyJobRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'posted', 'activated', 'deactivated')
+    date_hierarchy = 'day'
+    ordering = ('-day',)
+
+@admin.register(DailyApplicationRollup)
+class DailyApplicationRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'status', 'count')
+    list_filter = ('status',)
+    date_hierarchy = 'day'
+    ordering = ('-day',)
@@ -0,0 +1,340 @@
+import json
+from abc import ABC, abstractmethod
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from applications.models import Application
+from categories.models import Category, Skill
+from companies.models import Company
+from jobs.models import Job
+from users.models import User
+
+# Compared against the baseline: (metric, True if higher is worse)
+COMPARED_METRICS = (
+    ('p50_ms', True),
+    ('p95_ms', True),
+    ('p99_ms', True),
+    ('requests_per_second', False),
+    ('queries_per_request', True),
+)
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class Scenario(ABC):
+    """
+    One benchmarked endpoint. ``prepare`` samples ids from the seeded
+    database; ``next_request`` returns ``(method, path, data, user)`` or
+    None when the scenario has run out of unused rows (writes use each row once).
+    """
+    name = None
+    writes = False
+
+    def __init__(self, rng, size):
+        self.rng = rng
+        self.size = size
+        self.lock = threading.Lock()
+
+    def prepare(self):
+        pass
+
+    @abstractmethod
+    def next_request(self):
+        pass
+
+
+class JobListScenario(Scenario):
+    name = 'job-list'
+
+    def prepare(self):
+        self.locations = list(
+            Job.objects.filter(is_active=True).values_list('location', flat=True).distinct()[:50]
+        ) or ['Remote']
+        self.job_types = [key for key, _ in Job.JOB_TYPES]
+
+    def next_request(self):
+        mix = self.rng.choice((
+            {},
+            {'job_type': self.rng.choice(self.job_types)},
+            {'location': self.rng.choice(self.locations)},
+            {'job_type': self.rng.choice(self.job_types), 'ordering': '-created_at'},
+            {'ordering': 'title'},
+        ))
+        return 'get', reverse('job-list-create'), mix, None
+
+
+class JobSearchScenario(Scenario):
+    name = 'job-search'
+
+    def prepare(self):
+        self.titles = [
+            title.split()[0] for title in
+            Job.objects.filter(is_active=True).values_list('title', flat=True)[:200] if title.split()
+        ] or ['Engineer']
+        self.categories = list(Category.objects.values_list('pk', flat=True)[:50])
+        self.skills = list(Skill.objects.values_list('pk', flat=True)[:200])
+
+    def next_request(self):
+        mixes = [{'search': self.rng.choice(self.titles)}, {'title': self.rng.choice(self.titles)}]
+        if self.categories:
+            mixes.append({'categories': self.rng.choice(self.categories)})
+        if self.skills:
+            mixes.append({
+                'skills': self.rng.sample(self.skills, min(2, len(self.skills))),
+                'search': self.rng.choice(self.titles),
+            })
+        return 'get', reverse('job-search'), self.rng.choice(mixes), None
+
+
+class CompanyDetailScenario(Scenario):
+    name = 'company-detail'
+
+    def prepare(self):
+        self.company_ids = list(Company.objects.values_list('pk', flat=True)[:1000])
+        if not self.company_ids:
+            raise CommandError('No companies to benchmark; seed the database first')
+
+    def next_request(self):
+        return 'get', reverse('company-detail', kwargs={'pk': self.rng.choice(self.company_ids)}), {}, None
+
+
+class ApplicationCreateScenario(Scenario):
+    name = 'application-create'
+    writes = True
+
+    def prepare(self):
+        seekers = list(User.objects.filter(user_type='job_seeker', is_active=True).values_list('pk', flat=True)[:500])
+        jobs = list(Job.objects.filter(is_active=True).values_list('pk', flat=True)[:500])
+        taken = set(
+            Application.objects.filter(applicant_id__in=seekers, job_id__in=jobs).values_list('applicant_id', 'job_id')
+        )
+        pairs = [(seeker, job) for seeker in seekers for job in jobs if (seeker, job) not in taken]
+        self.rng.shuffle(pairs)
+        self.pairs = iter(pairs[:self.size])
+
+    def next_request(self):
+        with self.lock:
+            pair = next(self.pairs, None)
+        if pair is None:
+            return None
+        seeker, job = pair
+        data = {'job': job, 'cover_letter': 'Benchmark application'}
+        return 'post', reverse('application-list-create'), data, seeker
+
+
+class ApplicationStatusScenario(Scenario):
+    name = 'application-status'
+    writes = True
+
+    def prepare(self):
+        rows = list(
+            Application.objects.filter(status='applied', job__posted_by__isnull=False)
+            .values_list('pk', 'job__posted_by_id')[:self.size]
+        )
+        self.rows = iter(rows)
+
+    def next_request(self):
+        with self.lock:
+            row = next(self.rows, None)
+        if row is None:
+            return None
+        application_id, poster = row
+        path = reverse('application-status-update', kwargs={'pk': application_id})
+        return 'patch', path, {'status': 'reviewed'}, poster
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        JobListScenario, JobSearchScenario, CompanyDetailScenario,
+        ApplicationCreateScenario, ApplicationStatusScenario,
+    )
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the real URLconf with concurrent requests against a seeded database and report '
+        'p50/p95/p99 latency, requests/sec and queries/request per endpoint as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients (threads)')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint')
+        parser.add_argument(
+            '--endpoints', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS),
+            help='Endpoints to benchmark'
+        )
+        parser.add_argument(
+            '--read-only', action='store_true',
+            help='Skip endpoints that create applications or change their status'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for filter mixes and sampled rows')
+        parser.add_argument(
+            '--host', help='Host header sent with each request (default: the first ALLOWED_HOSTS entry, or localhost)'
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--baseline', help='Compare against a report saved with --output')
+        parser.add_argument(
+            '--tolerance', type=float, default=10.0,
+            help='Percent a metric may worsen against the baseline before it counts as a regression'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        names = [
+            name for name in options['endpoints']
+            if not (options['read_only'] and SCENARIOS[name].writes)
+        ]
+        self.tokens = {}
+        self.tokens_lock = threading.Lock()
+        self.host = options['host'] or next(
+            (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost'
+        )
+
+        # Notification emails would otherwise be sent (or printed) while measuring
+        with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            results = {}
+            for name in names:
+                scenario = SCENARIOS[name](rng, options['warmup'] + options['requests'])
+                scenario.prepare()
+                self.run_scenario(scenario, options['warmup'], options['concurrency'])
+                results[name] = self.run_scenario(scenario, options['requests'], options['concurrency'])
+
+        report = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'seed': options['seed'],
+            },
+            'endpoints': results,
+        }
+        rendered = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(rendered + '\n')
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(rendered)
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline:
+                regressions = compare(json.load(baseline), report, options['tolerance'])
+            for regression in regressions:
+                self.stderr.write(self.style.ERROR(regression))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+            self.stderr.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def token_for(self, user_id):
+        with self.tokens_lock:
+            if user_id not in self.tokens:
+                user = User.objects.get(pk=user_id)
+                self.tokens[user_id] = f'Bearer {RefreshToken.for_user(user).access_token}'
+            return self.tokens[user_id]
+
+    def run_scenario(self, scenario, count, concurrency):
+        """Issue up to ``count`` requests from ``concurrency`` clients; returns the endpoint's stats."""
+        latencies = []
+        queries = []
+        statuses = Counter()
+        remaining = iter(range(count))
+        lock = threading.Lock()
+
+        executed = defaultdict(int)
+
+        def counting(execute, sql, params, many, context):
+            executed[threading.get_ident()] += 1
+            return execute(sql, params, many, context)
+
+        def client_loop():
+            client = Client(HTTP_HOST=self.host)
+            ident = threading.get_ident()
+            with connection.execute_wrapper(counting):
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    request = scenario.next_request()
+                    if request is None:
+                        return
+                    method, path, data, user_id = request
+                    headers = {'HTTP_AUTHORIZATION': self.token_for(user_id)} if user_id else {}
+                    kwargs = {'content_type': 'application/json'} if method != 'get' else {}
+                    body = json.dumps(data) if method != 'get' else data
+                    before = executed[ident]
+                    started = time.perf_counter()
+                    response = getattr(client, method)(path, body, **kwargs, **headers)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        queries.append(executed[ident] - before)
+                        statuses[response.status_code] += 1
+
+        def worker():
+            try:
+                client_loop()
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        if concurrency <= 1:
+            # Stay on the caller's connection (and transaction, when run from a test)
+            client_loop()
+        else:
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': sum(count for code, count in statuses.items() if code >= 400),
+            'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+            'requests_per_second': round(len(latencies) / wall, 2) if wall else 0.0,
+            'mean_ms': round(sum(latencies) * 1000 / len(latencies), 3) if latencies else 0.0,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'queries_per_request': round(sum(queries) / len(queries), 2) if queries else 0.0,
+        }
+
+
+def compare(baseline, report, tolerance):
+    """Describe every metric that worsened by more than ``tolerance`` percent (any query increase counts)."""
+    regressions = []
+    for name, current in report['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous or not current['requests']:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS:
+            old, new = previous.get(metric), current[metric]
+            if old is None:
+                continue
+            if metric == 'queries_per_request':
+                worse = new > old
+            elif higher_is_worse:
+                worse = new > old * (1 + tolerance / 100)
+            else:
+                worse = new < old * (1 - tolerance / 100)
+            if worse:
+                regressions.append(f'{name}: {metric} {old} -> {new}')
+    return regressions
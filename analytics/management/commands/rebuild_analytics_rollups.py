@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from analytics.rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Recompute platform counters and daily rollups from the raw tables'
+
+    def handle(self, *args, **options):
+        rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS('Analytics rollups rebuilt'))
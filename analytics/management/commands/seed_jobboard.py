@@ -0,0 +1,370 @@
+import io
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate
+from django import setup
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from analytics.rollups import rebuild_rollups
+from applications.models import Application
+from categories.models import Category, Skill
+from companies.models import Company
+from jobs.models import Job
+from users.models import User
+
+SEED_PASSWORD = 'seed-password'
+
+CATEGORIES = (
+    'Technology', 'Finance', 'Healthcare', 'Education', 'Marketing', 'Sales', 'Design', 'Operations',
+    'Legal', 'Human Resources', 'Customer Support', 'Logistics', 'Manufacturing', 'Retail', 'Hospitality',
+    'Media', 'Research', 'Construction', 'Energy', 'Government',
+)
+SKILLS = (
+    'Python', 'Django', 'JavaScript', 'TypeScript', 'React', 'SQL', 'PostgreSQL', 'Go', 'Rust', 'Java',
+    'Kotlin', 'Swift', 'AWS', 'Docker', 'Kubernetes', 'Terraform', 'Linux', 'Excel', 'Accounting',
+    'Negotiation', 'Copywriting', 'SEO', 'Figma', 'Project Management', 'Data Analysis', 'Machine Learning',
+    'Statistics', 'Customer Service', 'Forklift', 'Nursing', 'Teaching', 'Public Speaking', 'Spanish',
+    'German', 'Recruiting', 'Bookkeeping', 'Photoshop', 'Video Editing', 'Salesforce', 'Supply Chain',
+)
+FIRST_NAMES = ('Ada', 'Ben', 'Chloe', 'Dev', 'Elena', 'Farid', 'Grace', 'Hiro', 'Ines', 'Jon', 'Kemi', 'Liam')
+LAST_NAMES = ('Okafor', 'Smith', 'Garcia', 'Kim', 'Novak', 'Rossi', 'Singh', 'Muller', 'Silva', 'Chen')
+LOCATIONS = (
+    'Remote', 'New York', 'London', 'Berlin', 'Lagos', 'Nairobi', 'Toronto', 'Bangalore', 'Singapore',
+    'Sao Paulo', 'Paris', 'Austin', 'Sydney', 'Amsterdam', 'Cape Town',
+)
+SENIORITY = ('Junior', '', 'Senior', 'Lead', 'Principal')
+ROLES = (
+    'Software Engineer', 'Data Analyst', 'Product Manager', 'Account Executive', 'Designer', 'Accountant',
+    'Nurse', 'Teacher', 'Support Specialist', 'Warehouse Associate', 'Marketing Manager', 'Recruiter',
+)
+COMPANY_WORDS = ('Acme', 'Blue', 'Northern', 'Apex', 'Bright', 'Summit', 'Vertex', 'Green', 'Silver', 'Nova')
+COMPANY_SUFFIXES = ('Labs', 'Systems', 'Group', 'Health', 'Logistics', 'Capital', 'Studios', 'Works')
+JOB_TYPES = [key for key, _ in Job.JOB_TYPES]
+STATUS_WEIGHTS = (('applied', 50), ('reviewed', 20), ('interview', 10), ('rejected', 17), ('accepted', 3))
+
+# Zipf exponents: a handful of employers post most jobs, a handful of jobs draw most applications
+COMPANY_SKEW = 1.1
+JOB_SKEW = 1.0
+HISTORY_DAYS = 730
+
+# Set in every worker process by _init_worker
+PLAN = None
+
+
+def zipf_cum_weights(count, exponent):
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def copy_value(value):
+    """Encode one value in PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def write_rows(model, columns, rows):
+    """
+    Insert ``rows`` (tuples ordered like the ``columns`` attnames) into
+    ``model``'s table: ``COPY`` on PostgreSQL, ``executemany`` elsewhere.
+    Values are written as given; no ``auto_now`` or signal runs.
+    """
+    if not rows:
+        return
+    fields = [model._meta.get_field(column) for column in columns]
+    table = connection.ops.quote_name(model._meta.db_table)
+    names = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            buffer = ''.join('\t'.join(copy_value(value) for value in row) + '\n' for row in rows)
+            sql = f'COPY {table} ({names}) FROM STDIN'
+            raw = cursor.cursor
+            if hasattr(raw, 'copy'):
+                # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer)
+            else:
+                raw.copy_expert(sql, io.StringIO(buffer))
+        else:
+            placeholders = ', '.join(['%s'] * len(fields))
+            cursor.executemany(
+                f'INSERT INTO {table} ({names}) VALUES ({placeholders})',
+                [[field.get_db_prep_save(value, connection) for field, value in zip(fields, row)] for row in rows]
+            )
+
+
+class Plan:
+    """
+    Everything a worker needs to generate any chunk on its own: counts, first
+    ids, the time anchor and the popularity orderings. Every chunk draws from
+    its own RNG seeded by (seed, phase, chunk start), so the output depends
+    only on the options, not on how chunks are scheduled across processes.
+    """
+
+    def __init__(self, options, anchor, first_ids, category_ids, skill_ids):
+        self.seed = options['seed']
+        self.users = options['users']
+        self.companies = options['companies']
+        self.jobs = options['jobs']
+        self.applications = options['applications']
+        self.anchor = anchor
+        self.first_user, self.first_company, self.first_job, self.first_application = first_ids
+        self.category_ids = category_ids
+        self.skill_ids = skill_ids
+        self.password = make_password(SEED_PASSWORD)
+        # Two employers per company: its creator and a second manager
+        self.employers = min(self.companies * 2, self.users // 2)
+        self.seekers = self.users - self.employers
+
+        rng = random.Random(f'{self.seed}:plan')
+        self.job_companies = rng.choices(
+            range(self.companies), cum_weights=zipf_cum_weights(self.companies, COMPANY_SKEW), k=self.jobs
+        )
+        # Viral jobs are spread across employers rather than all being the oldest postings
+        self.jobs_by_popularity = list(range(self.jobs))
+        rng.shuffle(self.jobs_by_popularity)
+
+    def rng(self, phase, start):
+        return random.Random(f'{self.seed}:{phase}:{start}')
+
+    def created_at(self, index, count):
+        """Spread rows evenly over the history window in id order, as a live site would create them."""
+        return self.anchor - timedelta(days=HISTORY_DAYS * (1 - index / count))
+
+    def company_creator(self, company_index):
+        return self.first_user + (2 * company_index) % max(self.employers, 1)
+
+
+def _init_worker(plan):
+    global PLAN
+    if not apps.ready:
+        # Spawned (not forked) workers start from a fresh interpreter
+        setup()
+    PLAN = plan
+
+
+def seed_users(start, stop):
+    plan = PLAN
+    rng = plan.rng('users', start)
+    rows = []
+    for index in range(start, stop):
+        pk = plan.first_user + index
+        user_type = 'employer' if index < plan.employers else 'job_seeker'
+        rows.append((
+            pk, plan.password, f'seed{pk}', rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+            f'seed{pk}@example.com', False, False, True, plan.created_at(index, plan.users), user_type,
+            '', '', '',
+        ))
+    with transaction.atomic():
+        write_rows(User, (
+            'id', 'password', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_superuser',
+            'is_active', 'date_joined', 'user_type', 'bio', 'experience', 'education',
+        ), rows)
+    return len(rows)
+
+
+def seed_companies(start, stop):
+    plan = PLAN
+    rng = plan.rng('companies', start)
+    rows = []
+    managers = []
+    for index in range(start, stop):
+        pk = plan.first_company + index
+        creator = plan.company_creator(index)
+        created_at = plan.created_at(index, plan.companies)
+        name = f'{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {pk}'
+        rows.append((
+            pk, name, f'{name} is hiring.', rng.choice(LOCATIONS), f'https://company{pk}.example.com',
+            f'jobs@company{pk}.example.com', creator, created_at, created_at,
+        ))
+        managers.append((pk, creator))
+        if plan.employers > 1:
+            managers.append((pk, plan.first_user + (2 * index + 1) % plan.employers))
+    with transaction.atomic():
+        write_rows(Company, (
+            'id', 'name', 'description', 'location', 'website', 'contact_email', 'created_by_id',
+            'created_at', 'updated_at',
+        ), rows)
+        write_rows(Company.managers.through, ('company_id', 'user_id'), sorted(set(managers)))
+    return len(rows)
+
+
+def seed_jobs(start, stop):
+    plan = PLAN
+    rng = plan.rng('jobs', start)
+    rows = []
+    categories = []
+    skills = []
+    for index in range(start, stop):
+        pk = plan.first_job + index
+        company_index = plan.job_companies[index]
+        created_at = plan.created_at(index, plan.jobs)
+        is_active = rng.random() < 0.85
+        expires_at = created_at + timedelta(days=60)
+        if is_active and expires_at < plan.anchor:
+            expires_at = plan.anchor + timedelta(days=rng.randint(1, 60))
+        low = rng.randrange(30, 180, 5)
+        rows.append((
+            pk, f'{rng.choice(SENIORITY)} {rng.choice(ROLES)}'.strip(),
+            'Seeded posting. ' * rng.randint(5, 40), plan.first_company + company_index,
+            plan.company_creator(company_index), rng.choice(LOCATIONS), rng.choice(JOB_TYPES),
+            f'${low},000-${low + rng.randrange(10, 60, 5)},000', is_active, expires_at, created_at, created_at,
+        ))
+        categories.extend((pk, category) for category in rng.sample(plan.category_ids, rng.randint(1, 3)))
+        skills.extend((pk, skill) for skill in rng.sample(plan.skill_ids, rng.randint(2, 6)))
+    with transaction.atomic():
+        write_rows(Job, (
+            'id', 'title', 'description', 'company_id', 'posted_by_id', 'location', 'job_type',
+            'salary_range', 'is_active', 'expires_at', 'created_at', 'updated_at',
+        ), rows)
+        write_rows(Job.categories.through, ('job_id', 'category_id'), categories)
+        write_rows(Job.required_skills.through, ('job_id', 'skill_id'), skills)
+    return len(rows)
+
+
+def seed_applications(start, stop):
+    """Applications for job seekers ``start``..``stop``; ids come from the seeker index so chunks never collide."""
+    plan = PLAN
+    rng = plan.rng('applications', start)
+    job_weights = _job_weights(plan)
+    mean = plan.applications / max(plan.seekers, 1)
+    # Application ids are allocated in fixed blocks per seeker
+    per_seeker = max(1, int(mean * 10))
+    statuses, status_weights = zip(*STATUS_WEIGHTS)
+    rows = []
+    for seeker in range(start, stop):
+        applicant = plan.first_user + plan.employers + seeker
+        # Heavy-tailed activity: most seekers apply a few times, some apply a lot
+        wanted = min(per_seeker, round(mean * rng.paretovariate(2.0) / 2))
+        chosen = set(rng.choices(plan.jobs_by_popularity, cum_weights=job_weights, k=wanted)) if wanted else ()
+        for offset, job_index in enumerate(sorted(chosen)):
+            job_created = plan.created_at(job_index, plan.jobs)
+            applied = job_created + (plan.anchor - job_created) * rng.random() ** 2
+            status = rng.choices(statuses, weights=status_weights)[0]
+            changed = applied + (plan.anchor - applied) * rng.random() if status != 'applied' else None
+            rows.append((
+                plan.first_application + seeker * per_seeker + offset, plan.first_job + job_index, applicant,
+                plan.first_company + plan.job_companies[job_index], 'Please consider my application.',
+                status, applied, changed or applied, changed,
+            ))
+    with transaction.atomic():
+        write_rows(Application, (
+            'id', 'job_id', 'applicant_id', 'company_id', 'cover_letter', 'status',
+            'applied_date', 'updated_date', 'status_changed_at',
+        ), rows)
+    return len(rows)
+
+
+_job_weights_cache = {}
+
+def _job_weights(plan):
+    key = (plan.seed, plan.jobs)
+    if key not in _job_weights_cache:
+        _job_weights_cache[key] = zipf_cum_weights(plan.jobs, JOB_SKEW)
+    return _job_weights_cache[key]
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a large, deterministic (by --seed) data set: users, companies, jobs with categories and '
+        'skills, and applications, with skewed employer and job popularity. Uses COPY on PostgreSQL and '
+        f'a process pool. Seeded users log in with the password "{SEED_PASSWORD}". Status history and '
+        'funnel rollups are not generated; platform counters and daily rollups are rebuilt at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000)
+        parser.add_argument('--companies', type=int, default=10_000)
+        parser.add_argument('--jobs', type=int, default=200_000)
+        parser.add_argument('--applications', type=int, default=3_000_000, help='Approximate target')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--anchor', help='ISO date the generated history ends on (default: today); fix it for identical reruns'
+        )
+        parser.add_argument('--chunk-size', type=int, default=20_000, help='Rows per insert batch and task')
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes (1 runs inline)')
+
+    def handle(self, *args, **options):
+        if options['users'] < 2 or options['companies'] < 1 or options['jobs'] < 1:
+            raise CommandError('Need at least 2 users, 1 company and 1 job')
+        anchor = (
+            datetime.fromisoformat(options['anchor']).replace(tzinfo=dt_timezone.utc)
+            if options['anchor'] else timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        )
+        plan = Plan(options, anchor, self.first_ids(), *self.vocabulary())
+        self.chunk_size = options['chunk_size']
+
+        phases = (
+            ('users', seed_users, plan.users),
+            ('companies', seed_companies, plan.companies),
+            ('jobs', seed_jobs, plan.jobs),
+            ('applications', seed_applications, plan.seekers),
+        )
+        started = time.perf_counter()
+        pool = None
+        if options['workers'] > 1:
+            pool = ProcessPoolExecutor(options['workers'], initializer=_init_worker, initargs=(plan,))
+        else:
+            _init_worker(plan)
+        try:
+            for name, func, count in phases:
+                if pool is not None:
+                    # Workers may fork now; they must open their own connections, not share ours
+                    connections.close_all()
+                self.run_phase(name, func, count, pool.map if pool is not None else map)
+                if name == 'companies':
+                    self.link_employers(plan)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self.reset_sequences()
+        rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.perf_counter() - started:.1f}s'))
+
+    def run_phase(self, name, func, count, mapper):
+        phase_started = time.perf_counter()
+        starts = list(range(0, count, self.chunk_size))
+        stops = [min(start + self.chunk_size, count) for start in starts]
+        rows = sum(mapper(func, starts, stops))
+        self.stdout.write(f'{name}: {rows} rows in {time.perf_counter() - phase_started:.1f}s')
+
+    def first_ids(self):
+        return tuple(
+            (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+            for model in (User, Company, Job, Application)
+        )
+
+    def vocabulary(self):
+        Category.objects.bulk_create([Category(name=name) for name in CATEGORIES], ignore_conflicts=True)
+        Skill.objects.bulk_create([Skill(name=name) for name in SKILLS], ignore_conflicts=True)
+        return (
+            list(Category.objects.filter(name__in=CATEGORIES).order_by('pk').values_list('pk', flat=True)),
+            list(Skill.objects.filter(name__in=SKILLS).order_by('pk').values_list('pk', flat=True)),
+        )
+
+    def link_employers(self, plan):
+        # Employers 2c and 2c+1 work for company c; one set-based UPDATE
+        User.objects.filter(pk__gte=plan.first_user, pk__lt=plan.first_user + plan.employers).update(
+            company_id=(F('pk') - plan.first_user) / 2 % plan.companies + plan.first_company
+        )
+
+    def reset_sequences(self):
+        # Rows were inserted with explicit ids
+        models = [
+            User, Company, Company.managers.through, Job, Job.categories.through,
+            Job.required_skills.through, Application,
+        ]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
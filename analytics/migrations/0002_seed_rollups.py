@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def seed_rollups(apps, schema_editor):
+    from analytics.rollups import rebuild_rollups
+    rebuild_rollups(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('applications', '0003_alter_application_unique_together_and_more'),
+        ('jobs', '0003_alter_job_options_job_jobs_job_is_acti_745178_idx_and_more'),
+        ('users', '0002_user_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_rollups, migrations.RunPython.noop),
+    ]
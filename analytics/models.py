@@ -0,0 +1,54 @@
+from django.db import models
+from users.models import User
+from applications.models import Application
+
+# Create your models here.
+class PlatformCounter(models.Model):
+    """Running platform-wide total (e.g. users.total), kept in step by signals."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class DailySignupRollup(models.Model):
+    day = models.DateField()
+    user_type = models.CharField(max_length=20, choices=User.USER_TYPES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'user_type'], name='unique_signup_rollup_day_type')
+        ]
+        ordering = ['-day']
+
+    def __str__(self):
+        return f"{self.day} {self.user_type}: {self.count}"
+
+class DailyJobRollup(models.Model):
+    day = models.DateField(unique=True)
+    posted = models.PositiveIntegerField(default=0)
+    activated = models.PositiveIntegerField(default=0)
+    deactivated = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+
+    def __str__(self):
+        return f"{self.day}: +{self.posted} posted"
+
+class DailyApplicationRollup(models.Model):
+    """Applications entering each status per day (``applied`` = new applications)."""
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status'], name='unique_application_rollup_day_status')
+        ]
+        ordering = ['-day']
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.count}"
@@ -0,0 +1,128 @@
+from collections import Counter
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import PlatformCounter, DailySignupRollup, DailyJobRollup, DailyApplicationRollup
+
+USER_COUNTERS = {
+    'total': 'users.total',
+    'active': 'users.active',
+    'job_seeker': 'users.job_seeker',
+    'employer': 'users.employer',
+    'admin': 'users.admin',
+}
+
+def _increment(model, lookup, deltas):
+    """
+    Add ``deltas`` to the row identified by ``lookup`` with a single UPDATE,
+    creating the row on first use. Safe under concurrent writers.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another writer created the row first
+        model.objects.filter(**lookup).update(**changes)
+
+def bump_counters(deltas):
+    """Apply ``{counter_name: delta}`` to the platform counters."""
+    for name, delta in deltas.items():
+        _increment(PlatformCounter, {'name': name}, {'value': delta})
+
+def record_signups(user_type, count=1, day=None):
+    _increment(
+        DailySignupRollup,
+        {'day': day or timezone.localdate(), 'user_type': user_type},
+        {'count': count}
+    )
+
+def record_job_events(posted=0, activated=0, deactivated=0, day=None):
+    _increment(
+        DailyJobRollup,
+        {'day': day or timezone.localdate()},
+        {'posted': posted, 'activated': activated, 'deactivated': deactivated}
+    )
+
+def record_application_statuses(status, count=1, day=None):
+    _increment(
+        DailyApplicationRollup,
+        {'day': day or timezone.localdate(), 'status': status},
+        {'count': count}
+    )
+
+def get_user_counters():
+    values = dict(
+        PlatformCounter.objects.filter(name__in=USER_COUNTERS.values()).values_list('name', 'value')
+    )
+    return {key: values.get(name, 0) for key, name in USER_COUNTERS.items()}
+
+def _archive_model(apps, app_label, name):
+    # Historical app registries (data migrations) may predate the archive tables
+    try:
+        return apps.get_model(app_label, name)
+    except LookupError:
+        return None
+
+def _count_by_day(models, field):
+    """Rows per day of ``field`` summed over live and archive tables."""
+    counts = Counter()
+    for model in filter(None, models):
+        for row in model.objects.annotate(day=TruncDate(field)).values('day').annotate(count=Count('pk')).order_by():
+            counts[row['day']] += row['count']
+    return counts
+
+@transaction.atomic
+def rebuild_rollups(apps=global_apps):
+    """
+    Recompute counters and the reconstructible parts of the daily rollups from
+    the raw tables. Activation history and non-``applied`` status transitions
+    cannot be derived from current rows, so those columns are left untouched.
+
+    ``apps`` allows running from a data migration with historical models.
+    """
+    User = apps.get_model('users', 'User')
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('applications', 'Application')
+    Counter = apps.get_model('analytics', 'PlatformCounter')
+    Signups = apps.get_model('analytics', 'DailySignupRollup')
+    Jobs = apps.get_model('analytics', 'DailyJobRollup')
+    Applications = apps.get_model('analytics', 'DailyApplicationRollup')
+
+    totals = User.objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(is_active=True)),
+        job_seeker=Count('pk', filter=Q(user_type='job_seeker')),
+        employer=Count('pk', filter=Q(user_type='employer')),
+        admin=Count('pk', filter=Q(user_type='admin')),
+    )
+    for key, name in USER_COUNTERS.items():
+        Counter.objects.update_or_create(name=name, defaults={'value': totals[key]})
+
+    Signups.objects.all().delete()
+    Signups.objects.bulk_create([
+        Signups(day=row['day'], user_type=row['user_type'], count=row['count'])
+        for row in User.objects.annotate(day=TruncDate('date_joined'))
+        .values('day', 'user_type').annotate(count=Count('pk')).order_by()
+    ])
+
+    posted_by_day = _count_by_day(
+        [Job, _archive_model(apps, 'jobs', 'ArchivedJob')], 'created_at'
+    )
+    Jobs.objects.exclude(day__in=posted_by_day).update(posted=0)
+    for day, count in posted_by_day.items():
+        Jobs.objects.update_or_create(day=day, defaults={'posted': count})
+
+    applied_by_day = _count_by_day(
+        [Application, _archive_model(apps, 'applications', 'ArchivedApplication')], 'applied_date'
+    )
+    Applications.objects.filter(status='applied').exclude(day__in=applied_by_day).delete()
+    for day, count in applied_by_day.items():
+        Applications.objects.update_or_create(day=day, status='applied', defaults={'count': count})
@@ -0,0 +1,72 @@
+from collections import Counter
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from users.models import User
+from jobs.models import Job
+from applications.pipeline import applications_transitioned
+from .rollups import USER_COUNTERS, bump_counters, record_signups, record_job_events, record_application_statuses
+
+# Rollups are maintained from model saves. Set-based ``QuerySet.update()``
+# paths bypass these handlers and must call the rollup helpers themselves.
+# Application activity arrives through the pipeline's transition signal.
+
+def _snapshot(instance, *fields):
+    # Never touch deferred fields here: that would cost a query per instance
+    deferred = instance.get_deferred_fields()
+    if any(field in deferred for field in fields):
+        return None
+    return tuple(getattr(instance, field) for field in fields)
+
+@receiver(post_init, sender=User)
+def snapshot_user(sender, instance, **kwargs):
+    instance._rollup_snapshot = _snapshot(instance, 'user_type', 'is_active')
+
+@receiver(post_save, sender=User)
+def track_user_save(sender, instance, created, **kwargs):
+    if created:
+        record_signups(instance.user_type, day=timezone.localdate(instance.date_joined))
+        bump_counters({
+            USER_COUNTERS['total']: 1,
+            USER_COUNTERS[instance.user_type]: 1,
+            USER_COUNTERS['active']: 1 if instance.is_active else 0,
+        })
+    else:
+        old_type, was_active = getattr(instance, '_rollup_snapshot', None) or (instance.user_type, instance.is_active)
+        deltas = {}
+        if old_type != instance.user_type:
+            deltas[USER_COUNTERS[old_type]] = -1
+            deltas[USER_COUNTERS[instance.user_type]] = 1
+        if was_active != instance.is_active:
+            deltas[USER_COUNTERS['active']] = 1 if instance.is_active else -1
+        bump_counters(deltas)
+    instance._rollup_snapshot = (instance.user_type, instance.is_active)
+
+@receiver(post_delete, sender=User)
+def track_user_delete(sender, instance, **kwargs):
+    bump_counters({
+        USER_COUNTERS['total']: -1,
+        USER_COUNTERS[instance.user_type]: -1,
+        USER_COUNTERS['active']: -1 if instance.is_active else 0,
+    })
+
+@receiver(post_init, sender=Job)
+def snapshot_job(sender, instance, **kwargs):
+    instance._rollup_is_active = _snapshot(instance, 'is_active')
+
+@receiver(post_save, sender=Job)
+def track_job_save(sender, instance, created, **kwargs):
+    if created:
+        record_job_events(posted=1, day=timezone.localdate(instance.created_at))
+    elif getattr(instance, '_rollup_is_active', None) not in (None, (instance.is_active,)):
+        if instance.is_active:
+            record_job_events(activated=1)
+        else:
+            record_job_events(deactivated=1)
+    instance._rollup_is_active = (instance.is_active,)
+
+@receiver(applications_transitioned)
+def track_application_transitions(sender, transitions, at, **kwargs):
+    counts = Counter(t.to_status for t in transitions)
+    for status, count in counts.items():
+        record_application_statuses(status, count=count, day=timezone.localdate(at))
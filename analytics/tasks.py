@@ -0,0 +1,15 @@
+from celery import shared_task
+from jobboard.tasks import RetryingTask, single_flight
+from .rollups import rebuild_rollups
+
+@shared_task(base=RetryingTask)
+def reconcile_counters():
+    """
+    Periodically recompute counters and rollups from the raw tables to repair
+    any drift left by missed or failed incremental updates.
+    """
+    with single_flight('analytics:reconcile-counters', timeout=3600) as acquired:
+        if not acquired:
+            return False
+        rebuild_rollups()
+        return True
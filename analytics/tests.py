@@ -0,0 +1,288 @@
+from collections import Counter
+from datetime import timedelta
+import json
+import os
+import random
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from jobboard.test_utils import BaseAPITestCase, ConcurrentAPITestCase
+from applications.models import Application
+from companies.models import Company
+from jobs.models import Job
+from users.models import User
+from .models import PlatformCounter, DailySignupRollup, DailyJobRollup, DailyApplicationRollup
+from .rollups import get_user_counters
+from .tasks import reconcile_counters
+from jobboard.tasks import single_flight
+from jobboard.sqlstats import get_sql_stats
+from .management.commands.benchmark_api import Scenario
+
+# Create your tests here.
+class RollupMaintenanceTests(BaseAPITestCase):
+    """Rollups are kept in step with model writes"""
+
+    def test_user_counters_track_signups_and_activation(self):
+        counters = get_user_counters()
+        self.assertEqual(counters['total'], 3)
+        self.assertEqual(counters['job_seeker'], 1)
+        self.assertEqual(counters['employer'], 1)
+        self.assertEqual(counters['admin'], 1)
+        self.assertEqual(counters['active'], 3)
+
+        user = self.create_user(username='newseeker')
+        user.is_active = False
+        user.save()
+
+        counters = get_user_counters()
+        self.assertEqual(counters['total'], 4)
+        self.assertEqual(counters['job_seeker'], 2)
+        self.assertEqual(counters['active'], 3)
+
+        user.delete()
+        counters = get_user_counters()
+        self.assertEqual(counters['total'], 3)
+        self.assertEqual(counters['job_seeker'], 1)
+
+    def test_daily_job_and_application_rollups(self):
+        job = self.create_test_job()
+        application = self.create_test_application(job=job)
+
+        job.is_active = False
+        job.save()
+        application.status = 'reviewed'
+        application.save()
+
+        today = timezone.localdate()
+        job_rollup = DailyJobRollup.objects.get(day=today)
+        self.assertEqual((job_rollup.posted, job_rollup.deactivated), (1, 1))
+        self.assertEqual(DailyApplicationRollup.objects.get(day=today, status='applied').count, 1)
+        self.assertEqual(DailyApplicationRollup.objects.get(day=today, status='reviewed').count, 1)
+
+    def test_rebuild_reconciles_drift(self):
+        PlatformCounter.objects.filter(name='users.total').update(value=999)
+        DailySignupRollup.objects.all().delete()
+
+        call_command('rebuild_analytics_rollups', stdout=StringIO())
+
+        self.assertEqual(get_user_counters()['total'], 3)
+        self.assertEqual(
+            sum(DailySignupRollup.objects.values_list('count', flat=True)), 3
+        )
+
+    def test_reconcile_task_skips_overlapping_runs(self):
+        PlatformCounter.objects.filter(name='users.total').update(value=999)
+
+        with single_flight('analytics:reconcile-counters', timeout=60):
+            self.assertFalse(reconcile_counters.delay().get())
+        self.assertEqual(get_user_counters()['total'], 999)
+
+        self.assertTrue(reconcile_counters.delay().get())
+        self.assertEqual(get_user_counters()['total'], 3)
+
+class PlatformStatsViewTests(BaseAPITestCase):
+    def test_stats_admin_only(self):
+        self.authenticate_user(self.employer_user)
+        response = self.client.get(reverse('admin-platform-stats'))
+        self.assertResponsePermissionDenied(response)
+
+    def test_stats_range_query(self):
+        old_day = timezone.localdate() - timedelta(days=20)
+        DailySignupRollup.objects.create(day=old_day, user_type='employer', count=4)
+
+        self.authenticate_user(self.admin_user)
+        response = self.client.get(reverse('admin-platform-stats') + '?days=7')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['signups']['employer'], 1)
+        self.assertEqual(response.data['totals']['total'], 3)
+
+        response = self.client.get(reverse('admin-platform-stats') + '?days=30')
+        self.assertEqual(response.data['signups']['employer'], 5)
+        self.assertEqual(len(response.data['daily']), 2)
+
+    def test_stats_rejects_unsupported_range(self):
+        self.authenticate_user(self.admin_user)
+        response = self.client.get(reverse('admin-platform-stats') + '?days=12')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_stats_reads_only_rollups(self):
+        self.authenticate_user(self.admin_user)
+        # JWT auth user lookup + counters + three rollup reads
+        with self.assertNumQueries(5):
+            self.client.get(reverse('admin-platform-stats') + '?days=365')
+
+
+class SQLStatsViewTests(BaseAPITestCase):
+    def test_sql_stats_admin_only(self):
+        self.authenticate_user(self.employer_user)
+        response = self.client.get(reverse('admin-sql-stats'))
+        self.assertResponsePermissionDenied(response)
+
+    def test_sql_stats_by_view(self):
+        get_sql_stats().reset()
+        self.client.get(reverse('job-list-create'))
+
+        self.authenticate_user(self.admin_user)
+        response = self.client.get(reverse('admin-sql-stats') + '?view=job-list-create&order=calls&limit=5')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        fingerprints = response.data['fingerprints']
+        self.assertTrue(0 < len(fingerprints) <= 5)
+        self.assertEqual([entry['calls'] for entry in fingerprints], sorted((entry['calls'] for entry in fingerprints), reverse=True))
+        for key in ('fingerprint', 'sql', 'total_ms', 'mean_ms', 'p95_ms', 'rows'):
+            self.assertIn(key, fingerprints[0])
+        self.assertIn('plans', response.data)
+
+    def test_sql_stats_rejects_unknown_order(self):
+        self.authenticate_user(self.admin_user)
+        response = self.client.get(reverse('admin-sql-stats') + '?order=sql')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_sql_stats_reset(self):
+        self.client.get(reverse('job-list-create'))
+        self.authenticate_user(self.admin_user)
+        response = self.client.delete(reverse('admin-sql-stats'))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(get_sql_stats().snapshot(view='job-list-create'))
+
+
+class BenchmarkCommandTests(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_test_job()
+        self.create_test_application(job=self.job)
+        # One unapplied seeker per warmup and measured application-create request
+        for index in range(2, 7):
+            self.create_user(username=f'seeker{index}', email=f'seeker{index}@test.com')
+
+    def run_benchmark(self, *args):
+        out = StringIO()
+        call_command('benchmark_api', '--requests=4', '--warmup=1', '--concurrency=1', *args, stdout=out, stderr=StringIO())
+        return json.loads(out.getvalue())
+
+    def test_scenario_requires_next_request(self):
+        class Incomplete(Scenario):
+            name = 'incomplete'
+
+        with self.assertRaises(TypeError):
+            Incomplete(random.Random(0), 1)
+
+    def test_reports_every_endpoint(self):
+        report = self.run_benchmark()
+        endpoints = report['endpoints']
+        self.assertEqual(
+            set(endpoints),
+            {'job-list', 'job-search', 'company-detail', 'application-create', 'application-status'}
+        )
+        for name in ('job-list', 'job-search', 'company-detail'):
+            self.assertEqual(endpoints[name]['requests'], 4)
+            self.assertEqual(endpoints[name]['errors'], 0)
+            self.assertGreater(endpoints[name]['queries_per_request'], 0)
+            self.assertLessEqual(endpoints[name]['p50_ms'], endpoints[name]['p99_ms'])
+        # Writes use each sampled seeker/job pair once
+        self.assertEqual(endpoints['application-create']['requests'], 4)
+        self.assertEqual(endpoints['application-create']['status_codes'], {'201': 4})
+        self.assertEqual(Application.objects.filter(job=self.job).count(), 6)
+        self.assertEqual(endpoints['application-status']['status_codes'], {'200': 4})
+        self.assertEqual(Application.objects.filter(job=self.job, status='reviewed').count(), 5)
+
+    def test_read_only_skips_writes(self):
+        report = self.run_benchmark('--read-only', '--endpoints', 'job-search', 'application-create')
+        self.assertEqual(list(report['endpoints']), ['job-search'])
+
+    def test_compare_flags_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, 'baseline.json')
+            call_command(
+                'benchmark_api', '--requests=2', '--warmup=0', '--concurrency=1', '--read-only',
+                '--endpoints', 'company-detail', f'--output={baseline}', stdout=StringIO(), stderr=StringIO()
+            )
+            with open(baseline) as saved:
+                report = json.load(saved)
+            report['endpoints']['company-detail']['queries_per_request'] -= 1
+            with open(baseline, 'w') as saved:
+                json.dump(report, saved)
+
+            with self.assertRaisesMessage(CommandError, 'regression'):
+                self.run_benchmark('--read-only', '--endpoints', 'company-detail', f'--baseline={baseline}')
+
+
+class BenchmarkConcurrencyTests(ConcurrentAPITestCase):
+    def test_concurrent_clients(self):
+        self.create_test_job()
+        out = StringIO()
+        call_command(
+            'benchmark_api', '--requests=8', '--warmup=0', '--concurrency=4', '--read-only',
+            '--endpoints', 'job-search', 'company-detail', stdout=out, stderr=StringIO()
+        )
+        endpoints = json.loads(out.getvalue())['endpoints']
+        for name in ('job-search', 'company-detail'):
+            self.assertEqual(endpoints[name]['requests'], 8)
+            self.assertEqual(endpoints[name]['errors'], 0)
+            self.assertGreater(endpoints[name]['requests_per_second'], 0)
+
+
+class SeedCommandTests(BaseAPITestCase):
+    def seed(self, **options):
+        options = {
+            'users': 60, 'companies': 4, 'jobs': 30, 'applications': 120, 'seed': 7,
+            'anchor': '2026-01-01', 'chunk_size': 7, 'workers': 1, **options,
+        }
+        first_job = (Job.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+        first_user = (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+        first_company = (Company.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+        call_command('seed_jobboard', **options, stdout=StringIO())
+        jobs = [
+            (job.pk - first_job, job.company_id - first_company, job.title, job.job_type, job.is_active)
+            for job in Job.objects.filter(pk__gte=first_job).order_by('pk')
+        ]
+        applications = list(
+            (job_id - first_job, applicant_id - first_user, application_status)
+            for job_id, applicant_id, application_status in Application.objects.filter(job_id__gte=first_job)
+            .order_by('job_id', 'applicant_id').values_list('job_id', 'applicant_id', 'status')
+        )
+        return jobs, applications
+
+    def test_seeds_related_rows(self):
+        jobs, applications = self.seed()
+        self.assertEqual(len(jobs), 30)
+        self.assertEqual(User.objects.filter(username__startswith='seed').count(), 60)
+        self.assertEqual(User.objects.filter(username__startswith='seed', user_type='employer').count(), 8)
+        self.assertTrue(applications)
+
+        job = Job.objects.latest('pk')
+        self.assertTrue(job.categories.exists())
+        self.assertTrue(job.required_skills.exists())
+        self.assertTrue(job.company.managers.filter(pk=job.posted_by_id).exists())
+        self.assertFalse(Application.objects.exclude(company_id=F('job__company_id')).exists())
+        self.assertTrue(User.objects.get(username=f'seed{job.posted_by_id}').check_password('seed-password'))
+
+        # Skewed: the largest employer posts more than an even share
+        per_company = Counter(company for _, company, *_ in jobs)
+        self.assertGreater(max(per_company.values()), 30 / 4)
+
+        # Counters were rebuilt from the new rows
+        self.assertEqual(get_user_counters()['total'], User.objects.count())
+
+        # New rows get fresh ids from the sequences
+        self.assertGreater(self.create_test_job().pk, job.pk)
+
+    def test_deterministic_by_seed(self):
+        first = self.seed()
+        self.assertEqual(self.seed(), first)
+        self.assertNotEqual(self.seed(seed=8), first)
+
+
+class SeedCommandProcessPoolTests(ConcurrentAPITestCase):
+    def test_worker_processes(self):
+        call_command(
+            'seed_jobboard', users=50, companies=3, jobs=20, applications=80, workers=2, chunk_size=10,
+            anchor='2026-01-01', stdout=StringIO()
+        )
+        self.assertEqual(Job.objects.count(), 20)
+        self.assertEqual(User.objects.filter(username__startswith='seed').count(), 50)
+        self.assertTrue(Application.objects.exists())
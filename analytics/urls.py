@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import PlatformStatsView, SQLStatsView
+
+urlpatterns = [
+    # Admin-only endpoints
+    path('admin/stats/', PlatformStatsView.as_view(), name='admin-platform-stats'),
+    path('admin/sql-stats/', SQLStatsView.as_view(), name='admin-sql-stats'),
+]
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.utils import timezone
+from jobboard.sqlstats import get_sql_stats
+from users.permissions import IsAdminUserRole
+from .models import DailySignupRollup, DailyJobRollup, DailyApplicationRollup
+from .rollups import get_user_counters
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
+
+STATS_RANGES = (7, 30, 365)
+SQL_STATS_ORDERINGS = ('total_ms', 'mean_ms', 'p95_ms', 'max_ms', 'calls', 'rows')
+
+# Create your views here.
+@extend_schema(
+    tags=['analytics', 'admin'],
+    summary='Admin: Platform statistics over time',
+    description=(
+        'Signups, job activity and application activity for the last 7, 30 or 365 days. '
+        'Reads only the pre-aggregated rollup tables, so the cost depends on the range '
+        '(at most one row per day and series), never on the size of the raw tables.'
+    ),
+    parameters=[
+        OpenApiParameter(name='days', description='Range in days', required=False, type=int, enum=list(STATS_RANGES)),
+    ],
+    responses={
+        200: OpenApiExample(
+            'Platform Stats Example',
+            value={
+                'days': 7,
+                'since': '2025-10-01',
+                'totals': {'total': 120, 'active': 100, 'job_seeker': 90, 'employer': 25, 'admin': 5},
+                'signups': {'job_seeker': 12, 'employer': 3, 'admin': 0},
+                'jobs': {'posted': 8, 'activated': 2, 'deactivated': 1},
+                'applications': {'applied': 40, 'reviewed': 22, 'interview': 6, 'rejected': 9, 'accepted': 1},
+                'daily': [{'day': '2025-10-01', 'signups': 2, 'jobs_posted': 1, 'applications': 5}]
+            }
+        )
+    }
+)
+class PlatformStatsView(APIView):
+    permission_classes = [IsAdminUserRole]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except (TypeError, ValueError):
+            days = None
+        if days not in STATS_RANGES:
+            return Response(
+                {'error': f'days must be one of {", ".join(map(str, STATS_RANGES))}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        since = timezone.localdate() - timedelta(days=days - 1)
+        signup_rows = list(
+            DailySignupRollup.objects.filter(day__gte=since).values_list('day', 'user_type', 'count')
+        )
+        job_rows = list(
+            DailyJobRollup.objects.filter(day__gte=since).values_list('day', 'posted', 'activated', 'deactivated')
+        )
+        application_rows = list(
+            DailyApplicationRollup.objects.filter(day__gte=since).values_list('day', 'status', 'count')
+        )
+
+        signups = {user_type: 0 for user_type, _ in DailySignupRollup._meta.get_field('user_type').choices}
+        applications = {key: 0 for key, _ in DailyApplicationRollup._meta.get_field('status').choices}
+        jobs = {'posted': 0, 'activated': 0, 'deactivated': 0}
+        daily = {}
+
+        def day_entry(day):
+            return daily.setdefault(day, {'day': day, 'signups': 0, 'jobs_posted': 0, 'applications': 0})
+
+        for day, user_type, count in signup_rows:
+            signups[user_type] = signups.get(user_type, 0) + count
+            day_entry(day)['signups'] += count
+        for day, posted, activated, deactivated in job_rows:
+            jobs['posted'] += posted
+            jobs['activated'] += activated
+            jobs['deactivated'] += deactivated
+            day_entry(day)['jobs_posted'] += posted
+        for day, application_status, count in application_rows:
+            applications[application_status] = applications.get(application_status, 0) + count
+            if application_status == 'applied':
+                day_entry(day)['applications'] += count
+
+        return Response({
+            'days': days,
+            'since': since,
+            'totals': get_user_counters(),
+            'signups': signups,
+            'jobs': jobs,
+            'applications': applications,
+            'daily': [daily[day] for day in sorted(daily)],
+        })
+
+
+@extend_schema(
+    tags=['analytics', 'admin'],
+    summary='Admin: SQL statement statistics',
+    description=(
+        'Executed SQL grouped by fingerprint (literals, placeholders and IN lists normalized), '
+        'with calls, total, mean and p95 time and rows, broken down per view, plus the most '
+        'recent captured EXPLAIN plans of slow SELECTs. With view, every figure (and the sort) is '
+        'that view\'s share of each statement. Statistics are per worker process and '
+        'in memory only; DELETE clears them.'
+    ),
+    parameters=[
+        OpenApiParameter(name='view', description='Only statements run by this URL name', required=False, type=str),
+        OpenApiParameter(name='order', description='Sort key', required=False, type=str, enum=list(SQL_STATS_ORDERINGS)),
+        OpenApiParameter(name='limit', description='Number of fingerprints (max 500)', required=False, type=int),
+    ],
+    responses={
+        200: OpenApiExample(
+            'SQL Stats Example',
+            value={
+                'fingerprints': [{
+                    'fingerprint': '3f1c2a9b0d4e5f61',
+                    'sql': 'SELECT "jobs_job"."id" FROM "jobs_job" WHERE "jobs_job"."id" IN (...)',
+                    'calls': 42, 'total_ms': 120.5, 'mean_ms': 2.869, 'p95_ms': 6.1, 'max_ms': 9.8, 'rows': 840,
+                    'views': {'job-search': {
+                        'calls': 40, 'total_ms': 118.0, 'mean_ms': 2.95, 'p95_ms': 6.2, 'max_ms': 9.8, 'rows': 800,
+                    }},
+                }],
+                'plans': [{
+                    'fingerprint': '3f1c2a9b0d4e5f61', 'sql': 'SELECT ...', 'duration_ms': 812.4,
+                    'view': 'job-search', 'captured_at': '2025-10-01T12:00:00Z', 'plan': 'Seq Scan on jobs_job ...',
+                }],
+            }
+        )
+    }
+)
+class SQLStatsView(APIView):
+    permission_classes = [IsAdminUserRole]
+
+    def get(self, request):
+        order = request.query_params.get('order', 'total_ms')
+        if order not in SQL_STATS_ORDERINGS:
+            return Response(
+                {'error': f'order must be one of {", ".join(SQL_STATS_ORDERINGS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 500))
+        except (TypeError, ValueError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        collector = get_sql_stats()
+        return Response({
+            'fingerprints': collector.snapshot(view=request.query_params.get('view'), order=order, limit=limit),
+            'plans': list(reversed(collector.plans)),
+        })
+
+    def delete(self, request):
+        get_sql_stats().reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,20 +1,42 @@
 from django.contrib import admin
-from django.contrib.admin import RelatedOnlyFieldListFilter
+from jobboard.counts import EstimatedCountPaginator
 from .models import Application
+from .pipeline import transition_applications
+
+def status_action(to_status):
+    """
+    Admin action moving the selected applications to ``to_status`` with one
+    conditional UPDATE; rows that may not enter it are left as they are.
+    """
+    label = dict(Application.STATUS_CHOICES)[to_status]
+
+    def action(modeladmin, request, queryset):
+        moved = transition_applications(
+            Application.objects.filter(pk__in=queryset.values('pk')), to_status, changed_by=request.user
+        )
+        skipped = queryset.count() - len(moved)
+        modeladmin.message_user(
+            request, f'{len(moved)} application(s) moved to {label}; {skipped} not eligible.'
+        )
+
+    action.__name__ = f'mark_{to_status}'
+    return admin.action(description=f'Move selected applications to {label}', permissions=['change'])(action)
 
 # Register your models here.
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('job', 'applicant', 'status', 'applied_date', 'updated_date')
-    list_filter = (
-        'status',
-        ('job', RelatedOnlyFieldListFilter),
-        ('applicant', RelatedOnlyFieldListFilter),
-        'applied_date',
-        'updated_date',
-    )
+    # Job and applicant filters would scan the table for their choices; search them instead
+    list_filter = ('status', 'applied_date', 'updated_date')
     search_fields = ('job__title', 'applicant__username', 'cover_letter')
     ordering = ('-applied_date',)
+    list_select_related = ('job', 'applicant')
+    autocomplete_fields = ('job', 'applicant')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [
+        status_action(status) for status, _ in Application.STATUS_CHOICES if Application.allowed_predecessors(status)
+    ]
 
     fieldsets = (
         ('Application Details', {
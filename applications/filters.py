@@ -0,0 +1,17 @@
+import django_filters
+from .models import Application
+
+class ApplicationFilter(django_filters.FilterSet):
+    status = django_filters.MultipleChoiceFilter(
+        field_name="status", choices=Application.STATUS_CHOICES, label="Status"
+    )
+    applied_after = django_filters.IsoDateTimeFilter(
+        field_name="applied_date", lookup_expr="gte", label="Applied on or after"
+    )
+    applied_before = django_filters.IsoDateTimeFilter(
+        field_name="applied_date", lookup_expr="lt", label="Applied before"
+    )
+
+    class Meta:
+        model = Application
+        fields = ['status', 'applied_after', 'applied_before']
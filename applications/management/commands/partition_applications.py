@@ -0,0 +1,52 @@
+import argparse
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from applications import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Range-partition applications by month of applied_date (PostgreSQL): convert the existing '
+        'table, create upcoming partitions, detach old ones, or list them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('convert', 'maintain', 'status'))
+        parser.add_argument(
+            '--months-ahead', type=int, default=settings.APPLICATION_PARTITIONS['MONTHS_AHEAD'],
+            help='Months of partitions to keep created ahead of the current one'
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=settings.APPLICATION_PARTITIONS['RETAIN_MONTHS'],
+            help='Detach partitions older than this many months (0 keeps everything)'
+        )
+        parser.add_argument(
+            '--drop', action=argparse.BooleanOptionalAction,
+            default=settings.APPLICATION_PARTITIONS['DROP_DETACHED'],
+            help='Drop detached partitions instead of keeping them as archive tables (--no-drop keeps them)'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if connections[using].vendor != 'postgresql':
+            raise CommandError('Application partitioning requires PostgreSQL')
+
+        if options['action'] == 'convert':
+            if partitions.convert_to_partitioned(options['months_ahead'], using=using):
+                self.stdout.write(self.style.SUCCESS('Applications table converted to monthly partitions'))
+            else:
+                self.stdout.write('Applications table is already partitioned')
+        elif options['action'] == 'maintain':
+            if not partitions.is_partitioned(using):
+                raise CommandError('Applications table is not partitioned; run "convert" first')
+            for name in partitions.ensure_partitions(options['months_ahead'], using=using):
+                self.stdout.write(f'Created {name}')
+            for name in partitions.detach_partitions(options['retain_months'], drop=options['drop'], using=using):
+                self.stdout.write(f"{'Dropped' if options['drop'] else 'Archived'} {name}")
+        else:
+            if not partitions.is_partitioned(using):
+                raise CommandError('Applications table is not partitioned')
+            for name, rows in partitions.partitions(using):
+                self.stdout.write(f'{name}\t~{max(rows, 0)} rows')
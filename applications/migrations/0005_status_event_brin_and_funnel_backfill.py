@@ -0,0 +1,69 @@
+from collections import defaultdict
+from django.db import migrations
+from django.db.models import Count
+
+# Stages an application must have passed through to be in a given status
+STAGES_REACHED = {
+    'applied': ('applied',),
+    'reviewed': ('applied', 'reviewed'),
+    'interview': ('applied', 'reviewed', 'interview'),
+    'accepted': ('applied', 'reviewed', 'interview', 'accepted'),
+    'rejected': ('applied', 'rejected'),
+}
+
+
+def create_brin_index(apps, schema_editor):
+    # The event log is append-only and time-ordered, so a BRIN index on
+    # created_at stays tiny however large the table grows (PostgreSQL only)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS applications_statusevent_created_brin '
+        'ON applications_applicationstatusevent USING brin (created_at)'
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS applications_statusevent_created_brin')
+
+
+def backfill_funnels(apps, schema_editor):
+    """
+    Seed funnel counts from current statuses. Historical time-in-stage is
+    unknown, so durations start accumulating from new transitions only.
+    """
+    Application = apps.get_model('applications', 'Application')
+    FunnelStageRollup = apps.get_model('applications', 'FunnelStageRollup')
+
+    entered = defaultdict(int)
+    waiting = defaultdict(int)
+    rows = Application.objects.values('job_id', 'job__company_id', 'status').annotate(total=Count('pk')).order_by()
+    for row in rows:
+        for scope in ((row['job__company_id'], row['job_id']), (row['job__company_id'], None)):
+            waiting[scope + (row['status'],)] += row['total']
+            for stage in STAGES_REACHED.get(row['status'], ()):
+                entered[scope + (stage,)] += row['total']
+
+    FunnelStageRollup.objects.bulk_create([
+        FunnelStageRollup(
+            company_id=company_id, job_id=job_id, stage=stage, entered=count,
+            # Final stages are never left; others were left by everyone not still in them
+            exited=0 if stage in ('accepted', 'rejected') else count - waiting[(company_id, job_id, stage)],
+            duration_histogram=[]
+        )
+        for (company_id, job_id, stage), count in entered.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_status_event_log_and_funnels'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_index, drop_brin_index),
+        migrations.RunPython(backfill_funnels, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_company(apps, schema_editor):
+    # One set-based UPDATE; runs before the company indexes exist so it does not maintain them row by row
+    Application = apps.get_model('applications', 'Application')
+    Job = apps.get_model('jobs', 'Job')
+    Application.objects.filter(company__isnull=True).update(
+        company=Subquery(Job.objects.filter(pk=OuterRef('job_id')).values('company_id')[:1])
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_status_event_brin_and_funnel_backfill'),
+        ('companies', '0003_alter_company_options_and_more'),
+        ('jobs', '0003_alter_job_options_job_jobs_job_is_acti_745178_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='company',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='companies.company'),
+        ),
+        migrations.RunPython(backfill_company, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-applied_date', '-id'], name='app_job_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', '-applied_date', '-id'], name='app_job_status_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['company', '-applied_date', '-id'], name='app_company_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['company', 'status', '-applied_date', '-id'], name='app_company_status_inbox_idx'),
+        ),
+    ]
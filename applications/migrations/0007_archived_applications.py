@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_application_company_inbox_indexes'),
+        ('companies', '0003_alter_company_options_and_more'),
+        ('jobs', '0005_archived_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cover_letter', models.TextField()),
+                ('resume', models.FileField(blank=True, null=True, upload_to='resumes/')),
+                ('status', models.CharField(choices=[('applied', 'Applied'), ('reviewed', 'Reviewed'), ('interview', 'Interview'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], max_length=20)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('applied_date', models.DateTimeField()),
+                ('updated_date', models.DateTimeField()),
+                ('status_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to=settings.AUTH_USER_MODEL)),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='companies.company')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='jobs.archivedjob')),
+            ],
+            options={
+                'ordering': ['-applied_date'],
+                'indexes': [models.Index(fields=['applicant', '-applied_date', '-id'], name='archived_app_history_idx')],
+            },
+        ),
+    ]
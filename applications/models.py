@@ -1,6 +1,8 @@
 from django.db import models
+from django.utils import timezone
 from users.models import User
-from jobs.models import Job
+from jobs.models import ArchivedJob, Job
+from companies.models import Company
 
 # Create your models here.
 class Application(models.Model):
@@ -12,14 +14,29 @@ class Application(models.Model):
         ('accepted', 'Accepted'),
     )
 
+    # Allowed next statuses for each status
+    STATUS_TRANSITIONS = {
+        'applied': ('reviewed', 'rejected'),
+        'reviewed': ('interview', 'rejected'),
+        'interview': ('accepted', 'rejected'),
+        'rejected': (),
+        'accepted': (),
+    }
+
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='applications')
+    # Denormalized from job.company so company inboxes filter and page on one index
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name='applications', null=True, blank=True, editable=False
+    )
     cover_letter = models.TextField()
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='applied')
     notes = models.TextField(blank=True, null=True)
     applied_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
+    # When the current status was entered (null = still the original 'applied')
+    status_changed_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         constraints = [
@@ -32,9 +49,119 @@ class Application(models.Model):
             # Common query patterns
             models.Index(fields=['applicant', 'applied_date']),
             models.Index(fields=['job', 'status']),
+
+            # Inbox keyset paging: (scope[, status]) then the ('-applied_date', '-id') cursor order
+            models.Index(fields=['job', '-applied_date', '-id'], name='app_job_inbox_idx'),
+            models.Index(fields=['job', 'status', '-applied_date', '-id'], name='app_job_status_inbox_idx'),
+            models.Index(fields=['company', '-applied_date', '-id'], name='app_company_inbox_idx'),
+            models.Index(fields=['company', 'status', '-applied_date', '-id'], name='app_company_status_inbox_idx'),
         ]
         ordering = ['-applied_date']
 
     def __str__(self):
         return f"{self.applicant.username} - {self.job.title}"
 
+    def save(self, *args, **kwargs):
+        if self.company_id is None and self.job_id is not None:
+            if Application.job.is_cached(self):
+                self.company_id = self.job.company_id
+            else:
+                self.company_id = Job.objects.filter(pk=self.job_id).values_list('company_id', flat=True).first()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def allowed_predecessors(cls, status):
+        """Statuses from which an application may move to ``status``."""
+        return [current for current, targets in cls.STATUS_TRANSITIONS.items() if status in targets]
+
+
+
+class ArchivedApplication(models.Model):
+    """
+    Application of an archived job (see ArchivedJob). Columns and id match
+    Application, so applicant history and admin views read archived rows
+    with the live serializers.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name='applications')
+    applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_applications')
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name='archived_applications', null=True, blank=True
+    )
+    cover_letter = models.TextField()
+    resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    notes = models.TextField(blank=True, null=True)
+    applied_date = models.DateTimeField()
+    updated_date = models.DateTimeField()
+    status_changed_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Applicant history merges these rows in the ('-applied_date', '-id') cursor order
+            models.Index(fields=['applicant', '-applied_date', '-id'], name='archived_app_history_idx'),
+        ]
+        ordering = ['-applied_date']
+
+    def __str__(self):
+        return f"{self.applicant.username} - {self.job.title} (archived)"
+
+
+class ApplicationStatusEvent(models.Model):
+    """
+    Append-only log of application status transitions.
+
+    References are kept without database constraints so the history survives
+    deletion of the application, job or user, and so the log can live on a
+    time-ordered BRIN index (see migration 0005) instead of B-trees.
+    """
+    application = models.ForeignKey(
+        Application, on_delete=models.DO_NOTHING, db_constraint=False, related_name='status_events'
+    )
+    job = models.ForeignKey(Job, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    company = models.ForeignKey(Company, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True, null=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+'
+    )
+    seconds_in_previous_status = models.PositiveIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+class FunnelStageRollup(models.Model):
+    """
+    Incrementally maintained funnel counters for one stage of one job, or of a
+    whole company when ``job`` is null. ``duration_histogram`` holds counts of
+    completed stays in the stage per bucket of FUNNEL_DURATION_BUCKETS.
+    """
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='funnel_stages')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True, related_name='funnel_stages')
+    stage = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    entered = models.PositiveIntegerField(default=0)
+    exited = models.PositiveIntegerField(default=0)
+    total_seconds_in_stage = models.BigIntegerField(default=0)
+    duration_histogram = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'stage'], condition=models.Q(job__isnull=False),
+                name='unique_job_funnel_stage'
+            ),
+            models.UniqueConstraint(
+                fields=['company', 'stage'], condition=models.Q(job__isnull=True),
+                name='unique_company_funnel_stage'
+            ),
+        ]
+
+    def __str__(self):
+        scope = f"job {self.job_id}" if self.job_id else f"company {self.company_id}"
+        return f"{scope} {self.stage}: {self.entered}"
@@ -0,0 +1,254 @@
+"""
+Monthly range partitioning of ``applications_application`` by ``applied_date``
+(PostgreSQL only).
+
+PostgreSQL requires unique constraints of a partitioned table to include the
+partition key, so the table's primary key becomes ``(id, applied_date)`` and
+``unique_job_applicant`` is enforced by a small unpartitioned guard table
+keyed on ``(job_id, applicant_id)``, kept in step by triggers. A duplicate
+application still fails with an IntegrityError naming ``unique_job_applicant``.
+``id`` keeps its own sequence, so ORM access by primary key is unchanged.
+"""
+from datetime import datetime, timezone as dt_timezone
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from .models import Application
+
+TABLE = Application._meta.db_table
+KEY_TABLE = f'{TABLE}_key'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_PREFIX = f'{TABLE}_p'
+ARCHIVED_PREFIX = f'{TABLE}_archived_p'
+
+KEY_SYNC_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {KEY_TABLE}_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM {KEY_TABLE} WHERE job_id = OLD.job_id AND applicant_id = OLD.applicant_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO {KEY_TABLE} (job_id, applicant_id) VALUES (NEW.job_id, NEW.applicant_id);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+KEY_TRUNCATE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {KEY_TABLE}_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE {KEY_TABLE};
+    RETURN NULL;
+END
+$$
+"""
+
+
+def month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(start):
+    return f'{PARTITION_PREFIX}{start:%Y%m}'
+
+
+def partition_start(name):
+    """Month a partition (attached or archived) covers, or None for other tables."""
+    for prefix in (PARTITION_PREFIX, ARCHIVED_PREFIX):
+        suffix = name.removeprefix(prefix)
+        if suffix != name and len(suffix) == 6 and suffix.isdigit():
+            return datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=dt_timezone.utc)
+    return None
+
+
+def partition_bounds(start):
+    return f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+
+
+def is_partitioned(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def partitions(using=DEFAULT_DB_ALIAS):
+    """``[(name, estimated_rows)]`` of attached partitions, oldest first; the default partition last."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname, c.reltuples::bigint FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname',
+            [TABLE]
+        )
+        rows = cursor.fetchall()
+    return sorted(rows, key=lambda row: row[0] == DEFAULT_PARTITION)
+
+
+def _columns(connection):
+    return ', '.join(connection.ops.quote_name(field.column) for field in Application._meta.concrete_fields)
+
+
+def _create_partition(cursor, parent, start, columns):
+    """Create the partition for the month at ``start``, moving any rows the default partition caught."""
+    name = partition_name(start)
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [name])
+    if cursor.fetchone()[0]:
+        return False
+    end = add_months(start, 1)
+    stray = False
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [DEFAULT_PARTITION])
+    if cursor.fetchone()[0]:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE applied_date >= %s AND applied_date < %s)',
+            [start, end]
+        )
+        stray = cursor.fetchone()[0]
+    if not stray:
+        cursor.execute(f'CREATE TABLE {name} PARTITION OF {parent} {partition_bounds(start)}')
+        return True
+
+    # Attaching over rows held by the default partition fails: move them first,
+    # with writers blocked so no row (or guard key) changes meanwhile
+    cursor.execute(f'LOCK TABLE {parent} IN SHARE ROW EXCLUSIVE MODE')
+    cursor.execute(f'CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE applied_date >= %s AND applied_date < %s '
+        f'RETURNING {columns}) INSERT INTO {name} ({columns}) SELECT {columns} FROM moved',
+        [start, end]
+    )
+    cursor.execute(f'ALTER TABLE {parent} ATTACH PARTITION {name} {partition_bounds(start)}')
+    # The delete trigger dropped the moved rows' guard keys
+    cursor.execute(
+        f'INSERT INTO {KEY_TABLE} (job_id, applicant_id) SELECT job_id, applicant_id FROM {name} '
+        'ON CONFLICT DO NOTHING'
+    )
+    return True
+
+
+def convert_to_partitioned(months_ahead, using=DEFAULT_DB_ALIAS, now=None):
+    """
+    Rebuild the applications table as a partitioned table holding the same
+    rows, ids, indexes and foreign keys. Runs in one transaction holding an
+    exclusive lock on the table, so schedule it in a maintenance window.
+    Returns False when the table is already partitioned.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise NotImplementedError('Application partitioning requires PostgreSQL')
+    now = now or timezone.now()
+    columns = _columns(connection)
+    staging = f'{TABLE}_partitioned'
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if is_partitioned(using):
+            return False
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        # Django's foreign keys are deferred: checks still pending from earlier
+        # writes in an enclosing transaction would otherwise block DROP TABLE
+        connection.check_constraints()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE]
+        )
+        foreign_keys = cursor.fetchall()
+        # Plain indexes only: the primary key and unique_job_applicant are replaced below
+        cursor.execute(
+            'SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = %s::regclass '
+            'AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)',
+            [TABLE]
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f'SELECT min(applied_date), max(id) FROM {TABLE}')
+        oldest, max_id = cursor.fetchone()
+
+        cursor.execute(f'CREATE TABLE {staging} (LIKE {TABLE} INCLUDING DEFAULTS) PARTITION BY RANGE (applied_date)')
+        start, last = month_start(oldest or now), add_months(month_start(now), months_ahead)
+        while start <= last:
+            _create_partition(cursor, staging, start, columns)
+            start = add_months(start, 1)
+        # Catches rows outside every monthly partition instead of failing the insert
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {staging} DEFAULT')
+        cursor.execute(f'INSERT INTO {staging} ({columns}) SELECT {columns} FROM {TABLE}')
+
+        cursor.execute(f'DROP TABLE {TABLE}')
+        cursor.execute(f'ALTER TABLE {staging} RENAME TO {TABLE}')
+        cursor.execute(f'CREATE SEQUENCE {TABLE}_id_seq AS bigint OWNED BY {TABLE}.id')
+        if max_id is not None:
+            cursor.execute(f"SELECT setval('{TABLE}_id_seq', %s)", [max_id])
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, applied_date)')
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+        for definition in indexes:
+            cursor.execute(definition)
+
+        cursor.execute(
+            f'CREATE TABLE {KEY_TABLE} (job_id bigint NOT NULL, applicant_id bigint NOT NULL, '
+            'CONSTRAINT unique_job_applicant PRIMARY KEY (job_id, applicant_id))'
+        )
+        cursor.execute(f'INSERT INTO {KEY_TABLE} (job_id, applicant_id) SELECT job_id, applicant_id FROM {TABLE}')
+        cursor.execute(KEY_SYNC_FUNCTION)
+        cursor.execute(KEY_TRUNCATE_FUNCTION)
+        cursor.execute(
+            f'CREATE TRIGGER {KEY_TABLE}_sync AFTER INSERT OR DELETE OR UPDATE OF job_id, applicant_id '
+            f'ON {TABLE} FOR EACH ROW EXECUTE FUNCTION {KEY_TABLE}_sync()'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER {KEY_TABLE}_truncate AFTER TRUNCATE ON {TABLE} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION {KEY_TABLE}_truncate()'
+        )
+    return True
+
+
+def ensure_partitions(months_ahead, using=DEFAULT_DB_ALIAS, now=None):
+    """Create missing partitions from the current month to ``months_ahead`` months out; returns their names."""
+    if not is_partitioned(using):
+        return []
+    now = now or timezone.now()
+    columns = _columns(connections[using])
+    created = []
+    start = month_start(now)
+    for _ in range(months_ahead + 1):
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            if _create_partition(cursor, TABLE, start, columns):
+                created.append(partition_name(start))
+        start = add_months(start, 1)
+    return created
+
+
+def detach_partitions(retain_months, drop=False, using=DEFAULT_DB_ALIAS, now=None):
+    """
+    Detach monthly partitions ending before the last ``retain_months`` months.
+    Detached rows leave the table (and the uniqueness guard); they are kept
+    as ``<table>_archived_p<YYYYMM>`` tables unless ``drop`` is set.
+    Returns the names of the detached partitions.
+    """
+    if retain_months <= 0 or not is_partitioned(using):
+        return []
+    cutoff = add_months(month_start(now or timezone.now()), -retain_months)
+    detached = []
+    for name, _ in partitions(using):
+        start = partition_start(name)
+        if name == DEFAULT_PARTITION or start is None or add_months(start, 1) > cutoff:
+            continue
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+            cursor.execute(
+                f'DELETE FROM {KEY_TABLE} k USING {name} p '
+                'WHERE k.job_id = p.job_id AND k.applicant_id = p.applicant_id'
+            )
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+            else:
+                cursor.execute(f'ALTER TABLE {name} RENAME TO {ARCHIVED_PREFIX}{start:%Y%m}')
+        detached.append(name)
+    return detached
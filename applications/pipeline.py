@@ -0,0 +1,185 @@
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from django.db import IntegrityError, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from jobs.models import Job
+from .models import Application, ApplicationStatusEvent, FunnelStageRollup
+
+# Upper bounds (seconds) of the time-in-stage histogram buckets; the last bucket is open-ended
+FUNNEL_DURATION_BUCKETS = (
+    3600, 6 * 3600, 86400, 2 * 86400, 4 * 86400,
+    7 * 86400, 14 * 86400, 30 * 86400, 90 * 86400,
+)
+
+Transition = namedtuple(
+    'Transition', 'application_id job_id company_id from_status to_status entered_at'
+)
+
+# Sent after transitions are logged, with ``transitions`` (list of Transition),
+# the matching ``events`` (ApplicationStatusEvent rows) and ``at``
+applications_transitioned = Signal()
+
+def duration_bucket(seconds):
+    return bisect_left(FUNNEL_DURATION_BUCKETS, seconds)
+
+def histogram_median(histogram):
+    """Approximate median (seconds) by interpolating inside the bucket holding it."""
+    total = sum(histogram)
+    if not total:
+        return None
+    half = total / 2
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= half:
+            lower = FUNNEL_DURATION_BUCKETS[index - 1] if index else 0
+            upper = FUNNEL_DURATION_BUCKETS[index] if index < len(FUNNEL_DURATION_BUCKETS) else lower * 2
+            return lower + (upper - lower) * (half - seen) / count
+        seen += count
+    return None
+
+def application_transition(application, from_status, to_status, entered_at=None):
+    """Build a Transition for a single Application instance."""
+    return Transition(
+        application_id=application.pk,
+        job_id=application.job_id,
+        company_id=application.company_id,
+        from_status=from_status,
+        to_status=to_status,
+        entered_at=entered_at or application.applied_date,
+    )
+
+@transaction.atomic
+def record_transitions(transitions, changed_by=None, at=None):
+    """
+    Append ``transitions`` to the status event log and fold them into the
+    per-job and per-company funnel rollups. Works for one row or a whole
+    set-based update: the cost is one insert plus one locked read-modify-write
+    per touched (scope, stage), not per application.
+    """
+    transitions = list(transitions)
+    if not transitions:
+        return
+    at = at or timezone.now()
+
+    missing_jobs = {t.job_id for t in transitions if t.company_id is None}
+    if missing_jobs:
+        companies = dict(Job.objects.filter(pk__in=missing_jobs).values_list('pk', 'company_id'))
+        transitions = [
+            t if t.company_id is not None else t._replace(company_id=companies.get(t.job_id))
+            for t in transitions
+        ]
+
+    events = []
+    changes = defaultdict(lambda: {'entered': 0, 'exited': 0, 'seconds': 0, 'buckets': defaultdict(int)})
+    for t in transitions:
+        seconds = None
+        if t.from_status is not None and t.entered_at is not None:
+            seconds = max(int((at - t.entered_at).total_seconds()), 0)
+        events.append(ApplicationStatusEvent(
+            application_id=t.application_id,
+            job_id=t.job_id,
+            company_id=t.company_id,
+            from_status=t.from_status,
+            to_status=t.to_status,
+            changed_by=changed_by,
+            seconds_in_previous_status=seconds,
+            created_at=at,
+        ))
+        for scope in ((t.company_id, t.job_id), (t.company_id, None)):
+            changes[scope + (t.to_status,)]['entered'] += 1
+            if t.from_status is not None:
+                change = changes[scope + (t.from_status,)]
+                change['exited'] += 1
+                if seconds is not None:
+                    change['seconds'] += seconds
+                    change['buckets'][duration_bucket(seconds)] += 1
+
+    ApplicationStatusEvent.objects.bulk_create(events)
+
+    for (company_id, job_id, stage), change in changes.items():
+        _apply_funnel_change(company_id, job_id, stage, change)
+
+    applications_transitioned.send(sender=ApplicationStatusEvent, transitions=transitions, events=events, at=at)
+
+def compare_and_set_status(application, to_status, changed_by=None, notes=None):
+    """
+    Move ``application`` to ``to_status`` only if the stored status still
+    equals ``application.status``, with one UPDATE of the changed columns.
+    Returns False, leaving the instance untouched, when another writer moved
+    the application first.
+    """
+    from_status = application.status
+    at = timezone.now()
+    changes = {'status': to_status, 'status_changed_at': at, 'updated_date': at}
+    if notes is not None:
+        changes['notes'] = notes
+
+    with transaction.atomic():
+        if not Application.objects.filter(pk=application.pk, status=from_status).update(**changes):
+            return False
+        record_transitions(
+            [application_transition(application, from_status, to_status, application.status_changed_at)],
+            changed_by=changed_by,
+            at=at,
+        )
+
+    for field, value in changes.items():
+        setattr(application, field, value)
+    # Keep the save() signal handlers from logging this transition a second time
+    application._pipeline_snapshot = (to_status, at)
+    return True
+
+@transaction.atomic
+def transition_applications(queryset, to_status, changed_by=None, notes=None):
+    """
+    Move every application in ``queryset`` that may legally enter ``to_status``
+    with one conditional ``UPDATE ... WHERE status IN (<allowed predecessors>)``.
+    Matching rows are locked first so the logged ``from_status`` is the one the
+    UPDATE replaced. Returns ``{application_id: from_status}`` for moved rows.
+    """
+    predecessors = Application.allowed_predecessors(to_status)
+    eligible = queryset.filter(status__in=predecessors)
+    rows = list(
+        eligible.select_for_update()
+        .order_by('pk')
+        .values_list('pk', 'job_id', 'company_id', 'status', 'status_changed_at', 'applied_date')
+    )
+    if not rows:
+        return {}
+
+    at = timezone.now()
+    changes = {'status': to_status, 'status_changed_at': at, 'updated_date': at}
+    if notes is not None:
+        changes['notes'] = notes
+    Application.objects.filter(pk__in=[row[0] for row in rows], status__in=predecessors).update(**changes)
+
+    record_transitions(
+        (
+            Transition(pk, job_id, company_id, from_status, to_status, status_changed_at or applied_date)
+            for pk, job_id, company_id, from_status, status_changed_at, applied_date in rows
+        ),
+        changed_by=changed_by,
+        at=at,
+    )
+    return {row[0]: row[3] for row in rows}
+
+def _apply_funnel_change(company_id, job_id, stage, change):
+    lookup = {'company_id': company_id, 'job_id': job_id, 'stage': stage}
+    rollup = FunnelStageRollup.objects.select_for_update().filter(**lookup).first()
+    if rollup is None:
+        try:
+            with transaction.atomic():
+                rollup = FunnelStageRollup.objects.create(**lookup)
+        except IntegrityError:
+            rollup = FunnelStageRollup.objects.select_for_update().get(**lookup)
+
+    histogram = list(rollup.duration_histogram) + [0] * (len(FUNNEL_DURATION_BUCKETS) + 1 - len(rollup.duration_histogram))
+    for bucket, count in change['buckets'].items():
+        histogram[bucket] += count
+
+    rollup.entered += change['entered']
+    rollup.exited += change['exited']
+    rollup.total_seconds_in_stage += change['seconds']
+    rollup.duration_histogram = histogram
+    rollup.save(update_fields=['entered', 'exited', 'total_seconds_in_stage', 'duration_histogram', 'updated_at'])
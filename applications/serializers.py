@@ -1,7 +1,10 @@
+from django.utils import timezone
 from rest_framework import serializers
+from jobboard.exceptions import Conflict
 from jobs.serializers import JobSummarySerializer
 from users.serializers import UserSerializer
 from .models import Application
+from .pipeline import compare_and_set_status
 
 class ApplicationSerializer(serializers.ModelSerializer):
     job_details = JobSummarySerializer(source='job', read_only=True)
@@ -50,22 +53,28 @@ class ApplicationStatusSerializer(serializers.ModelSerializer):
         fields = ['status', 'status_display', 'notes']
     
     def validate_status(self, value):
-        valid_transitions = {
-            'applied': ['reviewed', 'rejected'],
-            'reviewed': ['interview', 'rejected'],
-            'interview': ['accepted', 'rejected'],
-            'rejected': [],
-            'accepted': []
-        }
-        
         current_status = self.instance.status if self.instance else 'applied'
         
-        if value not in valid_transitions.get(current_status, []):
+        if value not in Application.STATUS_TRANSITIONS.get(current_status, ()):
             raise serializers.ValidationError(
                 f"Cannot transition from {current_status} to {value}"
             )
         return value
 
+    def update(self, instance, validated_data):
+        changed_by = validated_data.pop('changed_by', None)
+        notes = validated_data.get('notes')
+
+        if 'status' in validated_data:
+            # Compare-and-set against the status validated above
+            if not compare_and_set_status(instance, validated_data['status'], changed_by, notes):
+                raise Conflict('Application status was changed by another request. Reload and retry.')
+        elif 'notes' in validated_data:
+            instance.updated_date = timezone.now()
+            Application.objects.filter(pk=instance.pk).update(notes=notes, updated_date=instance.updated_date)
+            instance.notes = notes
+        return instance
+
 class ApplicationSummarySerializer(serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
     company_name = serializers.CharField(source='job.company.name', read_only=True)
@@ -100,8 +109,11 @@ class ApplicationDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'applied_date', 'updated_date']
 
 class ApplicationBulkStatusSerializer(serializers.Serializer):
+    MAX_APPLICATIONS = 500
+
     application_ids = serializers.ListField(
         child=serializers.IntegerField(),
+        max_length=MAX_APPLICATIONS,
         help_text="List of application IDs to update"
     )
     status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
@@ -111,10 +123,38 @@ class ApplicationBulkStatusSerializer(serializers.Serializer):
         if not value:
             raise serializers.ValidationError("At least one application ID is required.")
         
-        # Check if all applications exist
-        existing_count = Application.objects.filter(id__in=value).count()
-        if existing_count != len(value):
-            raise serializers.ValidationError("One or more application IDs are invalid.")
-        
-        return value
+        # Unknown IDs are reported per item in the response rather than failing the batch
+        return list(dict.fromkeys(value))
+
+class ApplicationBulkStatusResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    result = serializers.ChoiceField(choices=['updated', 'not_found', 'forbidden', 'invalid_transition', 'conflict'])
+    from_status = serializers.CharField(allow_null=True)
+    status = serializers.CharField(allow_null=True)
+
+class ApplicationBulkStatusResponseSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+    results = ApplicationBulkStatusResultSerializer(many=True)
+
+class RejectRemainingSerializer(serializers.Serializer):
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+class RejectRemainingResponseSerializer(serializers.Serializer):
+    job_id = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+
+
+class FunnelStageSerializer(serializers.Serializer):
+    stage = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+    entered = serializers.IntegerField()
+    exited = serializers.IntegerField()
+    current = serializers.IntegerField()
+    conversion_rate = serializers.FloatField(allow_null=True, help_text="Share of applications that reached this stage")
+    median_seconds_in_stage = serializers.FloatField(allow_null=True)
+    mean_seconds_in_stage = serializers.FloatField(allow_null=True)
 
+class FunnelSerializer(serializers.Serializer):
+    company_id = serializers.IntegerField()
+    job_id = serializers.IntegerField(allow_null=True)
+    total_applications = serializers.IntegerField()
+    stages = FunnelStageSerializer(many=True)
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_init, pre_save, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from jobboard.tasks import chunked, enqueue_on_commit
+from .models import Application
+from .pipeline import application_transition, applications_transitioned, record_transitions
+from .tasks import send_status_notifications
+
+# Status changes made through Model.save() are logged here. Set-based
+# QuerySet.update() paths call pipeline.record_transitions themselves.
+
+# Status-change emails are sent by a worker in batches of this many events
+NOTIFICATION_BATCH_SIZE = 200
+
+@receiver(post_init, sender=Application)
+def snapshot_status(sender, instance, **kwargs):
+    deferred = instance.get_deferred_fields()
+    if 'status' in deferred or 'status_changed_at' in deferred:
+        instance._pipeline_snapshot = None
+    else:
+        instance._pipeline_snapshot = (instance.status, instance.status_changed_at)
+
+@receiver(pre_save, sender=Application)
+def stamp_status_change(sender, instance, **kwargs):
+    snapshot = getattr(instance, '_pipeline_snapshot', None)
+    if instance.pk and snapshot and snapshot[0] != instance.status:
+        instance.status_changed_at = timezone.now()
+
+@receiver(post_save, sender=Application)
+def log_status_change(sender, instance, created, **kwargs):
+    snapshot = getattr(instance, '_pipeline_snapshot', None)
+    changed_by = getattr(instance, '_status_changed_by', None)
+    if created:
+        record_transitions([application_transition(instance, None, instance.status)], changed_by=changed_by)
+    elif snapshot and snapshot[0] != instance.status:
+        old_status, entered_at = snapshot
+        record_transitions(
+            [application_transition(instance, old_status, instance.status, entered_at)],
+            changed_by=changed_by,
+            at=instance.status_changed_at
+        )
+    instance._pipeline_snapshot = (instance.status, instance.status_changed_at)
+
+@receiver(applications_transitioned)
+def queue_status_notifications(sender, events, **kwargs):
+    # New applications (no from_status) are not status changes
+    event_ids = [event.pk for event in events if event.from_status is not None and event.pk is not None]
+    for batch in chunked(event_ids, NOTIFICATION_BATCH_SIZE):
+        enqueue_on_commit(send_status_notifications, batch)
@@ -0,0 +1,56 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from jobboard.tasks import RetryingTask, run_once, single_flight
+from . import partitions
+from .models import Application, ApplicationStatusEvent
+
+@shared_task(base=RetryingTask)
+def send_status_notifications(event_ids):
+    """Email applicants about logged status changes; each event is notified at most once."""
+    events = list(
+        ApplicationStatusEvent.objects.filter(pk__in=event_ids, from_status__isnull=False).order_by('pk')
+    )
+    applications = Application.objects.select_related('applicant', 'job', 'job__company').in_bulk(
+        {event.application_id for event in events}
+    )
+
+    sent = 0
+    connection = get_connection()
+    for event in events:
+        application = applications.get(event.application_id)
+        if application is None or not application.applicant.email:
+            continue
+        with run_once(f'application-status-notification:{event.pk}') as first:
+            if not first:
+                continue
+            EmailMessage(
+                subject=f'Your application for {application.job.title} is now {event.get_to_status_display()}',
+                body=(
+                    f'Hi {application.applicant.username},\n\n'
+                    f'{application.job.company.name} moved your application for "{application.job.title}" '
+                    f'from {event.get_from_status_display()} to {event.get_to_status_display()}.\n'
+                ),
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[application.applicant.email],
+                connection=connection,
+            ).send()
+            sent += 1
+    return sent
+
+@shared_task(base=RetryingTask)
+def maintain_application_partitions():
+    """
+    Keep monthly application partitions created ahead of time and detach
+    expired ones. Does nothing until the table has been converted.
+    """
+    if not partitions.is_partitioned():
+        return {'created': [], 'detached': []}
+    options = settings.APPLICATION_PARTITIONS
+    with single_flight('applications:maintain-partitions', timeout=3600) as acquired:
+        if not acquired:
+            return {'created': [], 'detached': []}
+        return {
+            'created': partitions.ensure_partitions(options['MONTHS_AHEAD']),
+            'detached': partitions.detach_partitions(options['RETAIN_MONTHS'], drop=options['DROP_DETACHED']),
+        }
@@ -1,9 +1,22 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipIf, skipUnless
 from django.test import TestCase
+from django.db import IntegrityError, connection, transaction
+from django.core import mail
+from django.conf import settings
+from django.core.management import call_command, load_command_class
+from django.core.management.base import CommandError
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from jobboard.test_utils import BaseAPITestCase
-from .models import Application
+from jobboard.test_utils import BaseAPITestCase, ConcurrentAPITestCase, QueryBudget
+from .tasks import maintain_application_partitions, send_status_notifications
+from . import partitions
+from .models import Application, ApplicationStatusEvent, ArchivedApplication
+from jobs.archive import archive_inactive_jobs
 from jobs.models import Job
 from categories.models import Category, Skill
 
@@ -245,10 +258,10 @@ class ApplicationUserTests(BaseAPITestCase):
         
         response = self.client.get(reverse('user-applications'))
         self.assertResponseSuccess(response, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
         
         # Should only see user's own applications
-        application_jobs = [app['job_title'] for app in response.data]
+        application_jobs = [app['job_title'] for app in response.data['results']]
         self.assertIn('Python Developer', application_jobs)
         self.assertIn('JavaScript Developer', application_jobs)
     
@@ -257,17 +270,9 @@ class ApplicationUserTests(BaseAPITestCase):
         self.authenticate_user(self.job_seeker_user)
         
         response = self.client.get(reverse('user-applications') + '?status=reviewed')
-        if len(response.data) == 2:  # Returns all instead of filtered
-            # Status filtering not implemented - test basic functionality instead
-            self.assertResponseSuccess(response, status.HTTP_200_OK)
-            self.assertEqual(len(response.data), 2)  # All user's applications
-            statuses = [app['status'] for app in response.data]
-            self.assertIn('applied', statuses)
-            self.assertIn('reviewed', statuses)
-        else:
-            # Status filtering is implemented
-            self.assertEqual(len(response.data), 1)
-            self.assertEqual(response.data[0]['status'], 'reviewed')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['status'], 'reviewed')
     
     def test_retrieve_user_application(self):
         """Test that users can retrieve their own application details"""
@@ -339,7 +344,7 @@ class ApplicationManagementTests(BaseAPITestCase):
         
         response = self.client.get(reverse('job-applications', args=[self.job.id]))
         self.assertResponseSuccess(response, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
     
     def test_list_job_applications_as_company_manager(self):
         """Test that company managers can list applications for company jobs"""
@@ -354,7 +359,7 @@ class ApplicationManagementTests(BaseAPITestCase):
         
         response = self.client.get(reverse('job-applications', args=[self.job.id]))
         self.assertResponseSuccess(response, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
     
     def test_list_job_applications_unauthorized(self):
         """Test that unauthorized users cannot list job applications"""
@@ -453,6 +458,28 @@ class ApplicationAdminTests(BaseAPITestCase):
         response = self.client.get(reverse('admin-application-list'))
         self.assertResponsePermissionDenied(response)
 
+class ApplicationAdminSiteTests(BaseAPITestCase):
+    """Test the Django admin bulk status actions for applications"""
+
+    def test_bulk_status_action_moves_eligible_applications(self):
+        job = self.create_test_job()
+        applied = self.create_test_application(job=job)
+        rejected = self.create_test_application(job=job, applicant=self.create_user(), status='rejected')
+        self.client.force_login(self.admin_user)
+
+        response = self.client.post(
+            reverse('admin:applications_application_changelist'),
+            {'action': 'mark_reviewed', '_selected_action': [applied.pk, rejected.pk]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        applied.refresh_from_db()
+        rejected.refresh_from_db()
+        self.assertEqual(applied.status, 'reviewed')
+        self.assertEqual(rejected.status, 'rejected')
+        event = ApplicationStatusEvent.objects.get(application=applied, to_status='reviewed')
+        self.assertEqual(event.changed_by, self.admin_user)
+
 class ApplicationCompanyTests(BaseAPITestCase):
     """Test company-specific application endpoints"""
     
@@ -524,10 +551,10 @@ class ApplicationCompanyTests(BaseAPITestCase):
         
         response = self.client.get(reverse('company-applications', args=[self.company1.id]))
         self.assertResponseSuccess(response, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # Only applications for company 1
+        self.assertEqual(len(response.data['results']), 2)  # Only applications for company 1
         
         # Verify only company 1 applications are returned
-        application_jobs = [app['job_title'] for app in response.data]
+        application_jobs = [app['job_title'] for app in response.data['results']]
         self.assertIn('Python Developer', application_jobs)
         self.assertIn('JavaScript Developer', application_jobs)
         self.assertNotIn('Backend Developer', application_jobs)
@@ -537,19 +564,27 @@ class ApplicationCompanyTests(BaseAPITestCase):
         self.authenticate_user(self.employer_user)
         
         response = self.client.get(reverse('company-applications', args=[self.company1.id]) + '?status=reviewed')
-
-        if len(response.data) == 2:  # Returns all instead of filtered
-            # Status filtering not implemented - test basic functionality instead
-            self.assertResponseSuccess(response, status.HTTP_200_OK)
-            self.assertEqual(len(response.data), 2)  # All company applications
-            statuses = [app['status'] for app in response.data]
-            self.assertIn('applied', statuses)
-            self.assertIn('reviewed', statuses)
-        else:
-            # Status filtering is implemented
-            self.assertEqual(len(response.data), 1)
-            self.assertEqual(response.data[0]['status'], 'reviewed')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['status'], 'reviewed')
     
+    def test_company_applications_date_range_and_paging(self):
+        """Test applied date filters and cursor pagination of the company inbox"""
+        Application.objects.filter(pk=self.application1.pk).update(applied_date=timezone.now() - timedelta(days=10))
+        self.authenticate_user(self.employer_user)
+        url = reverse('company-applications', args=[self.company1.id])
+
+        since = (timezone.now() - timedelta(days=5)).isoformat()
+        response = self.client.get(url, {'applied_after': since})
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual([app['id'] for app in response.data['results']], [self.application2.id])
+
+        response = self.client.get(url, {'page_size': 1})
+        self.assertEqual([app['id'] for app in response.data['results']], [self.application2.id])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([app['id'] for app in response.data['results']], [self.application1.id])
+        self.assertIsNone(response.data['next'])
+
     def test_list_company_applications_unauthorized(self):
         """Test that non-managers cannot list company applications"""
         self.authenticate_user(self.job_seeker_user)
@@ -557,3 +592,517 @@ class ApplicationCompanyTests(BaseAPITestCase):
         response = self.client.get(reverse('company-applications', args=[self.company1.id]))
         self.assertResponsePermissionDenied(response)
 
+
+class ApplicationFunnelTests(BaseAPITestCase):
+    """Test the status event log and funnel rollups"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company(name='Funnel Company')
+        self.job = self.create_test_job(company=self.company)
+        self.other_job = self.create_test_job(company=self.company)
+        self.application = self.create_test_application(job=self.job)
+        self.create_test_application(job=self.other_job)
+
+    def move(self, application, new_status):
+        return self.client.patch(
+            reverse('application-status-update', args=[application.id]),
+            {'status': new_status}
+        )
+
+    def test_status_changes_are_logged(self):
+        """Test that each transition appends an event with timing and actor"""
+        Application.objects.filter(pk=self.application.pk).update(
+            applied_date=timezone.now() - timedelta(days=3)
+        )
+        self.authenticate_user(self.employer_user)
+        self.assertResponseSuccess(self.move(self.application, 'reviewed'))
+        self.assertResponseSuccess(self.move(self.application, 'interview'))
+
+        events = list(ApplicationStatusEvent.objects.filter(application=self.application))
+        self.assertEqual(
+            [(e.from_status, e.to_status) for e in events],
+            [(None, 'applied'), ('applied', 'reviewed'), ('reviewed', 'interview')]
+        )
+        self.assertEqual(events[1].changed_by, self.employer_user)
+        self.assertGreaterEqual(events[1].seconds_in_previous_status, 3 * 86400 - 5)
+        self.assertEqual(events[1].company_id, self.company.id)
+
+    def test_job_and_company_funnels(self):
+        """Test funnel counts, conversion and time-in-stage per job and per company"""
+        Application.objects.filter(pk=self.application.pk).update(
+            applied_date=timezone.now() - timedelta(days=3)
+        )
+        self.authenticate_user(self.employer_user)
+        self.move(self.application, 'reviewed')
+        self.move(self.application, 'rejected')
+
+        response = self.client.get(reverse('job-application-funnel', args=[self.job.id]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        stages = {stage['stage']: stage for stage in response.data['stages']}
+        self.assertEqual(response.data['total_applications'], 1)
+        self.assertEqual(stages['reviewed']['entered'], 1)
+        self.assertEqual(stages['reviewed']['current'], 0)
+        self.assertEqual(stages['rejected']['conversion_rate'], 1.0)
+        # Three days in 'applied' lands in the 2-4 day bucket
+        self.assertGreater(stages['applied']['median_seconds_in_stage'], 2 * 86400)
+        self.assertLessEqual(stages['applied']['median_seconds_in_stage'], 4 * 86400)
+
+        response = self.client.get(reverse('company-application-funnel', args=[self.company.id]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        stages = {stage['stage']: stage for stage in response.data['stages']}
+        self.assertEqual(response.data['total_applications'], 2)
+        self.assertEqual(stages['applied']['current'], 1)
+        self.assertEqual(stages['reviewed']['conversion_rate'], 0.5)
+
+    def test_funnel_reads_only_rollups(self):
+        """Test that funnel endpoints never aggregate raw application rows"""
+        self.authenticate_user(self.admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('company-application-funnel', args=[self.company.id]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertFalse(any('"applications_application"' in q['sql'] for q in queries.captured_queries))
+
+    def test_funnel_permissions(self):
+        """Test that only job owners, company managers and admins see funnels"""
+        self.authenticate_user(self.job_seeker_user)
+        response = self.client.get(reverse('job-application-funnel', args=[self.job.id]))
+        self.assertResponsePermissionDenied(response)
+        response = self.client.get(reverse('company-application-funnel', args=[self.company.id]))
+        self.assertResponsePermissionDenied(response)
+
+
+class ApplicationBulkStatusTests(BaseAPITestCase):
+    """Test set-based bulk status transitions"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company(name='Bulk Company')
+        self.job = self.create_test_job(company=self.company)
+        self.applications = [
+            self.create_test_application(job=self.job, applicant=self.create_user())
+            for _ in range(5)
+        ]
+        other_employer = self.create_user(user_type='employer')
+        other_company = self.create_test_company(created_by=other_employer)
+        self.foreign_application = self.create_test_application(
+            job=self.create_test_job(company=other_company, posted_by=other_employer)
+        )
+
+    def test_bulk_status_update_reports_each_id(self):
+        """Test per-id outcomes for updated, invalid, forbidden and unknown applications"""
+        accepted = self.applications[2]
+        Application.objects.filter(pk=accepted.pk).update(status='accepted')
+        ids = [self.applications[0].id, self.applications[1].id, accepted.id, self.foreign_application.id, 999999]
+
+        self.authenticate_user(self.employer_user)
+        response = self.client.post(
+            reverse('application-bulk-status'), {'application_ids': ids, 'status': 'reviewed'}, format='json'
+        )
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            [result['result'] for result in response.data['results']],
+            ['updated', 'updated', 'invalid_transition', 'forbidden', 'not_found']
+        )
+        self.assertEqual(
+            Application.objects.filter(pk__in=ids[:2], status='reviewed').count(), 2
+        )
+        self.foreign_application.refresh_from_db()
+        self.assertEqual(self.foreign_application.status, 'applied')
+        # Transitions are logged like single updates
+        event = ApplicationStatusEvent.objects.get(application=self.applications[0], to_status='reviewed')
+        self.assertEqual(event.from_status, 'applied')
+        self.assertEqual(event.changed_by, self.employer_user)
+
+    def test_bulk_status_update_query_count_is_constant(self):
+        """Test that the number of queries does not grow with the number of applications"""
+        self.authenticate_user(self.employer_user)
+        ids = [application.id for application in self.applications]
+        url = reverse('application-bulk-status')
+        # The first transition into a stage creates its funnel rollup rows
+        self.client.post(url, {'application_ids': ids[:1], 'status': 'reviewed'}, format='json')
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(url, {'application_ids': ids[1:2], 'status': 'reviewed'}, format='json')
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(url, {'application_ids': ids[2:], 'status': 'reviewed'}, format='json')
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+    def test_bulk_status_update_requires_ids(self):
+        """Test validation of the application id list"""
+        self.authenticate_user(self.employer_user)
+        response = self.client.post(
+            reverse('application-bulk-status'), {'application_ids': [], 'status': 'reviewed'}, format='json'
+        )
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_reject_remaining_applicants(self):
+        """Test that every open application for the job is rejected in one operation"""
+        Application.objects.filter(pk=self.applications[0].pk).update(status='accepted')
+        self.authenticate_user(self.employer_user)
+        response = self.client.post(
+            reverse('job-reject-remaining', args=[self.job.id]), {'notes': 'Position filled'}, format='json'
+        )
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['rejected'], 4)
+        self.assertEqual(
+            list(Application.objects.filter(job=self.job).order_by('pk').values_list('status', flat=True)),
+            ['accepted'] + ['rejected'] * 4
+        )
+        self.assertEqual(Application.objects.get(pk=self.applications[1].pk).notes, 'Position filled')
+
+    def test_reject_remaining_permissions(self):
+        """Test that job seekers cannot reject applicants"""
+        self.authenticate_user(self.job_seeker_user)
+        response = self.client.post(reverse('job-reject-remaining', args=[self.job.id]))
+        self.assertResponsePermissionDenied(response)
+
+
+class ApplicationNotificationTests(BaseAPITestCase):
+    """Test status-change notifications sent from background tasks"""
+
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_test_job(company=self.create_test_company())
+        self.application = self.create_test_application(job=self.job)
+
+    def test_status_change_emails_applicant_after_commit(self):
+        """Test that a status change queues one email, sent once the transaction commits"""
+        self.authenticate_user(self.employer_user)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.patch(
+                reverse('application-status-update', args=[self.application.id]), {'status': 'reviewed'}
+            )
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.job_seeker_user.email])
+        self.assertIn('Reviewed', mail.outbox[0].subject)
+
+    def test_notification_task_is_idempotent(self):
+        """Test that redelivering the same events does not email twice"""
+        self.authenticate_user(self.employer_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('application-status-update', args=[self.application.id]), {'status': 'reviewed'})
+        event_ids = list(
+            ApplicationStatusEvent.objects.filter(application=self.application).values_list('pk', flat=True)
+        )
+
+        self.assertEqual(send_status_notifications.delay(event_ids).get(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_bulk_transition_notifies_each_applicant(self):
+        """Test that set-based transitions notify every moved applicant"""
+        self.create_test_application(job=self.job, applicant=self.create_user())
+        self.authenticate_user(self.employer_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('job-reject-remaining', args=[self.job.id]))
+        self.assertEqual(len(mail.outbox), 2)
+
+
+class ApplicationStatusConcurrencyTests(ConcurrentAPITestCase):
+    """Test compare-and-set status updates under concurrent requests"""
+
+    def test_concurrent_status_updates(self):
+        company = self.create_test_company()
+        application = self.create_test_application(job=self.create_test_job(company=company))
+        clients = [self.client_for(self.employer_user) for _ in range(self.threads)]
+        targets = ['reviewed', 'rejected']
+
+        responses = self.run_concurrently(
+            lambda index: clients[index].patch(
+                reverse('application-status-update', args=[application.id]),
+                {'status': targets[index % 2]}
+            )
+        )
+
+        codes = [response.status_code for response in responses]
+        # Losers either fail the compare-and-set (409) or read the new status and fail validation (400)
+        self.assertEqual(codes.count(status.HTTP_200_OK), 1, codes)
+        self.assertTrue(set(codes) <= {status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT})
+        application.refresh_from_db()
+        self.assertEqual(
+            list(ApplicationStatusEvent.objects.filter(application=application).values_list('from_status', 'to_status')),
+            [(None, 'applied'), ('applied', application.status)]
+        )
+
+    def test_notes_only_update_keeps_status(self):
+        company = self.create_test_company()
+        application = self.create_test_application(job=self.create_test_job(company=company))
+        response = self.client_for(self.employer_user).patch(
+            reverse('application-status-update', args=[application.id]), {'notes': 'Strong portfolio'}
+        )
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        application.refresh_from_db()
+        self.assertEqual((application.status, application.notes), ('applied', 'Strong portfolio'))
+
+
+class ApplicationArchiveReadThroughTests(BaseAPITestCase):
+    """Test that applicant history and admin views read applications of archived jobs"""
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.applications = []
+        for days_ago in range(6):
+            job = self.create_test_job(is_active=days_ago % 2 == 0)
+            application = self.create_test_application(job=job)
+            Application.objects.filter(pk=application.pk).update(applied_date=now - timedelta(days=days_ago))
+            self.applications.append(application)
+        # Odd days are on inactive jobs: archive them, interleaving live and archived history
+        Job.objects.filter(is_active=False).update(updated_at=now - timedelta(days=365))
+        archive_inactive_jobs(days=180)
+        self.archived_ids = set(ArchivedApplication.objects.values_list('pk', flat=True))
+        self.authenticate_user(self.job_seeker_user)
+
+    def test_history_merges_archive_in_cursor_order(self):
+        """Test that my-applications pages through live and archived rows newest first"""
+        self.assertEqual(self.archived_ids, {self.applications[day].pk for day in (1, 3, 5)})
+        seen = []
+        url = reverse('user-applications')
+        params = {'page_size': 4}
+        while url:
+            response = self.client.get(url, params)
+            self.assertResponseSuccess(response, status.HTTP_200_OK)
+            seen.extend(row['id'] for row in response.data['results'])
+            url, params = response.data['next'], None
+        self.assertEqual(seen, [application.pk for application in self.applications])
+
+        applied_after = (timezone.now() - timedelta(days=2, hours=1)).isoformat()
+        response = self.client.get(reverse('user-applications'), {'status': 'applied', 'applied_after': applied_after})
+        self.assertEqual([row['id'] for row in response.data['results']], [app.pk for app in self.applications[:3]])
+        self.assertEqual(response.data['results'][1]['job_title'], self.applications[1].job.title)
+
+    def test_detail_falls_back_to_archive(self):
+        """Test that an archived application stays readable by its applicant only"""
+        archived = self.applications[1]
+        response = self.client.get(reverse('application-detail', args=[archived.pk]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['job_details']['title'], archived.job.title)
+
+        self.authenticate_user(self.create_user(user_type='job_seeker'))
+        self.assertResponseError(self.client.get(reverse('application-detail', args=[archived.pk])), status.HTTP_404_NOT_FOUND)
+
+    def test_admin_lists_archived_applications(self):
+        """Test that admins list live and archived applications together, or either alone"""
+        self.authenticate_user(self.admin_user)
+        response = self.client.get(reverse('admin-application-list'), {'archived': 'true'})
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual({row['id'] for row in response.data}, self.archived_ids)
+        response = self.client.get(reverse('admin-application-list'), {'archived': 'false'})
+        self.assertFalse({row['id'] for row in response.data} & self.archived_ids)
+
+        response = self.client.get(reverse('admin-application-list'))
+        self.assertEqual([row['id'] for row in response.data], [application.pk for application in self.applications])
+        response = self.client.get(reverse('admin-application-list'), {'page': 2, 'page_size': 4})
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual([row['id'] for row in response.data['results']], [app.pk for app in self.applications[4:]])
+
+
+class ApplicationQueryBudgetTests(BaseAPITestCase):
+    """Application list endpoints must not run a query per listed application"""
+    query_budgets = [
+        QueryBudget('application-list-create', max_queries=4, populate='add_own_applications', user='job_seeker_user'),
+        QueryBudget('user-applications', max_queries=3, populate='add_own_applications', user='job_seeker_user'),
+        QueryBudget('job-applications', max_queries=5, populate='add_job_applications', user='employer_user'),
+        QueryBudget('company-applications', max_queries=4, populate='add_company_applications', user='employer_user'),
+        # One more for the UNION ordering live and archived applications together
+        QueryBudget('admin-application-list', max_queries=5, populate='add_own_applications', user='admin_user'),
+    ]
+
+    def add_own_applications(self, count):
+        for _ in range(count):
+            self.create_test_application()
+        return {}
+
+    def add_job_applications(self, count):
+        if not hasattr(self, 'job'):
+            self.job = self.create_test_job()
+        for _ in range(count):
+            self.create_test_application(job=self.job, applicant=self.create_user())
+        return {'job_id': self.job.pk}
+
+    def add_company_applications(self, count):
+        if not hasattr(self, 'company'):
+            self.company = self.create_test_company()
+        for _ in range(count):
+            self.create_test_application(job=self.create_test_job(company=self.company), applicant=self.create_user())
+        return {'company_id': self.company.pk}
+
+
+class ApplicationPartitionTests(BaseAPITestCase):
+    """Test partition naming and that partitioning stays off outside PostgreSQL"""
+
+    def test_month_arithmetic(self):
+        """Test monthly partition bounds across year ends and time zones"""
+        start = partitions.month_start(datetime(2026, 12, 31, 23, 30, tzinfo=dt_timezone(timedelta(hours=-2))))
+        self.assertEqual(start, datetime(2027, 1, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitions.add_months(start, -1), datetime(2026, 12, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitions.add_months(start, 14), datetime(2028, 3, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(
+            partitions.partition_bounds(start),
+            "FOR VALUES FROM ('2027-01-01T00:00:00+00:00') TO ('2027-02-01T00:00:00+00:00')"
+        )
+
+    def test_partition_names(self):
+        """Test that partition names round-trip to the month they cover"""
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        name = partitions.partition_name(start)
+        self.assertEqual(name, 'applications_application_p202603')
+        self.assertEqual(partitions.partition_start(name), start)
+        self.assertEqual(partitions.partition_start('applications_application_archived_p202603'), start)
+        self.assertIsNone(partitions.partition_start(partitions.DEFAULT_PARTITION))
+        self.assertIsNone(partitions.partition_start('applications_application_key'))
+
+    def test_unpartitioned_database_untouched(self):
+        """Test that maintenance is a no-op until the table is converted"""
+        self.assertFalse(partitions.is_partitioned())
+        self.assertEqual(maintain_application_partitions.delay().get(), {'created': [], 'detached': []})
+        self.assertEqual(partitions.detach_partitions(1), [])
+
+    def test_drop_option_overrides_setting_both_ways(self):
+        """Test that --drop and --no-drop override APPLICATION_PARTITIONS['DROP_DETACHED']"""
+        for default in (False, True):
+            options = {**settings.APPLICATION_PARTITIONS, 'DROP_DETACHED': default}
+            with self.settings(APPLICATION_PARTITIONS=options):
+                parser = load_command_class('applications', 'partition_applications').create_parser(
+                    'manage.py', 'partition_applications'
+                )
+            self.assertIs(parser.parse_args(['maintain']).drop, default)
+            self.assertIs(parser.parse_args(['maintain', '--drop']).drop, True)
+            self.assertIs(parser.parse_args(['maintain', '--no-drop']).drop, False)
+
+    @skipIf(connection.vendor == 'postgresql', 'Conversion is refused only without PostgreSQL')
+    def test_conversion_refused_without_postgresql(self):
+        """Test that conversion is refused without PostgreSQL"""
+        with self.assertRaises(CommandError):
+            call_command('partition_applications', 'convert', stdout=StringIO())
+        with self.assertRaises(NotImplementedError):
+            partitions.convert_to_partitioned(3)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Application partitioning requires PostgreSQL')
+class PostgreSQLApplicationPartitionTests(BaseAPITestCase):
+    """Test converting, guarding and maintaining the partitioned applications table"""
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.this_month = partitions.month_start(self.now)
+        self.job = self.create_test_job()
+        self.other_seeker = self.create_user(email='other@test.com')
+        self.old = self.create_test_application(job=self.job)
+        self.recent = self.create_test_application(job=self.job, applicant=self.other_seeker)
+        self.old_month = partitions.add_months(self.this_month, -3)
+        Application.objects.filter(pk=self.old.pk).update(applied_date=self.old_month + timedelta(days=1))
+
+    def convert(self, months_ahead=1):
+        self.assertTrue(partitions.convert_to_partitioned(months_ahead, now=self.now))
+
+    def foreign_keys(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname",
+                [partitions.TABLE]
+            )
+            return cursor.fetchall()
+
+    def guard_keys(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT job_id, applicant_id FROM {partitions.KEY_TABLE}')
+            return set(cursor.fetchall())
+
+    def application_keys(self):
+        return set(Application.objects.values_list('job_id', 'applicant_id'))
+
+    def rows_in(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {table}')
+            return cursor.fetchone()[0]
+
+    def assertDuplicateRejected(self, job, applicant):
+        with self.assertRaisesMessage(IntegrityError, 'unique_job_applicant'), transaction.atomic():
+            self.create_test_application(job=job, applicant=applicant)
+
+    def test_conversion_keeps_rows_ids_and_foreign_keys(self):
+        """Test that the rebuilt table holds the same rows, ids and constraints and keeps numbering"""
+        foreign_keys = self.foreign_keys()
+        self.convert()
+
+        self.assertTrue(partitions.is_partitioned())
+        self.assertFalse(partitions.convert_to_partitioned(1, now=self.now))
+        self.assertEqual(self.foreign_keys(), foreign_keys)
+        old = Application.objects.get(pk=self.old.pk)
+        self.assertEqual((old.job_id, old.applicant_id), (self.job.pk, self.job_seeker_user.pk))
+        self.assertEqual(Application.objects.get(pk=self.recent.pk).applicant_id, self.other_seeker.pk)
+        names = [name for name, _ in partitions.partitions()]
+        self.assertIn(partitions.partition_name(self.old_month), names)
+        self.assertIn(partitions.partition_name(partitions.add_months(self.this_month, 1)), names)
+        self.assertEqual(names[-1], partitions.DEFAULT_PARTITION)
+        self.assertEqual(self.rows_in(partitions.partition_name(self.old_month)), 1)
+
+        third = self.create_test_application(job=self.job, applicant=self.create_user(email='third@test.com'))
+        self.assertGreater(third.pk, self.recent.pk)
+
+    def test_duplicate_application_rejected(self):
+        """Test that the guard table still rejects a second application to the same job"""
+        self.convert()
+        self.assertDuplicateRejected(self.job, self.job_seeker_user)
+        self.assertDuplicateRejected(self.job, self.other_seeker)
+        self.assertEqual(self.guard_keys(), self.application_keys())
+
+    def test_guard_table_follows_updates_and_deletes(self):
+        """Test that changed and deleted applications release their old job/applicant pair"""
+        self.convert()
+        other_job = self.create_test_job()
+        Application.objects.filter(pk=self.old.pk).update(job=other_job)
+        self.assertEqual(self.guard_keys(), self.application_keys())
+        self.create_test_application(job=self.job)
+        self.assertDuplicateRejected(other_job, self.job_seeker_user)
+
+        Application.objects.filter(pk=self.recent.pk).delete()
+        self.assertEqual(self.guard_keys(), self.application_keys())
+        self.create_test_application(job=self.job, applicant=self.other_seeker)
+
+    def test_new_partition_moves_rows_out_of_default(self):
+        """Test that creating a month's partition takes over the rows the default partition caught"""
+        self.convert(months_ahead=0)
+        future_month = partitions.add_months(self.this_month, 2)
+        Application.objects.filter(pk=self.recent.pk).update(applied_date=future_month + timedelta(days=1))
+        self.assertEqual(self.rows_in(partitions.DEFAULT_PARTITION), 1)
+
+        created = partitions.ensure_partitions(2, now=self.now)
+
+        self.assertIn(partitions.partition_name(future_month), created)
+        self.assertEqual(self.rows_in(partitions.DEFAULT_PARTITION), 0)
+        self.assertEqual(self.rows_in(partitions.partition_name(future_month)), 1)
+        self.assertEqual(self.guard_keys(), self.application_keys())
+        self.assertDuplicateRejected(self.job, self.other_seeker)
+        self.assertEqual(partitions.ensure_partitions(2, now=self.now), [])
+
+    def test_maintenance_creates_and_detaches_partitions(self):
+        """Test that maintenance creates months ahead, detaches expired ones and releases their keys"""
+        self.convert(months_ahead=0)
+        old_partition = partitions.partition_name(self.old_month)
+        options = {'MONTHS_AHEAD': 2, 'RETAIN_MONTHS': 1, 'DROP_DETACHED': False}
+
+        with self.settings(APPLICATION_PARTITIONS=options):
+            result = maintain_application_partitions.delay().get()
+
+        self.assertEqual(result['created'], [
+            partitions.partition_name(partitions.add_months(self.this_month, months)) for months in (1, 2)
+        ])
+        self.assertIn(old_partition, result['detached'])
+        self.assertNotIn(old_partition, [name for name, _ in partitions.partitions()])
+        self.assertFalse(Application.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(self.rows_in(f'{partitions.ARCHIVED_PREFIX}{self.old_month:%Y%m}'), 1)
+        self.assertEqual(self.guard_keys(), self.application_keys())
+        # The detached application no longer blocks applying again
+        self.create_test_application(job=self.job)
+
+        with self.settings(APPLICATION_PARTITIONS=options):
+            self.assertEqual(maintain_application_partitions.delay().get(), {'created': [], 'detached': []})
@@ -7,7 +7,11 @@ from .views import (
     JobApplicationCountView,
     ApplicationAdminListView,
     ApplicationStatusUpdateView,
-    CompanyApplicationsView
+    ApplicationBulkStatusView,
+    JobRejectRemainingView,
+    CompanyApplicationsView,
+    JobFunnelView,
+    CompanyFunnelView
 )
 
 urlpatterns = [
@@ -21,12 +25,16 @@ urlpatterns = [
     # Job-specific applications
     path('job/<int:job_id>/', JobApplicationsView.as_view(), name='job-applications'),
     path('job/<int:job_id>/count/', JobApplicationCountView.as_view(), name='job-application-count'),
+    path('job/<int:job_id>/funnel/', JobFunnelView.as_view(), name='job-application-funnel'),
+    path('job/<int:job_id>/reject-remaining/', JobRejectRemainingView.as_view(), name='job-reject-remaining'),
     
     # Company-specific applications
     path('company/<int:company_id>/', CompanyApplicationsView.as_view(), name='company-applications'),
+    path('company/<int:company_id>/funnel/', CompanyFunnelView.as_view(), name='company-application-funnel'),
     
     # Application management
     path('<int:pk>/status/', ApplicationStatusUpdateView.as_view(), name='application-status-update'),
+    path('bulk-status/', ApplicationBulkStatusView.as_view(), name='application-bulk-status'),
     
     # Admin endpoints
     path('admin/all/', ApplicationAdminListView.as_view(), name='admin-application-list'),
@@ -2,15 +2,37 @@ from django.shortcuts import render
 from rest_framework import generics, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from .models import Application
-from .serializers import ApplicationSerializer, ApplicationCreateSerializer, ApplicationSummarySerializer, ApplicationStatusSerializer
+from jobboard.pagination import KeysetPagination
+from .filters import ApplicationFilter
+from .models import Application, ArchivedApplication, FunnelStageRollup
+from .pipeline import histogram_median, transition_applications
+from .serializers import (
+    ApplicationSerializer, ApplicationCreateSerializer, ApplicationSummarySerializer, ApplicationStatusSerializer,
+    ApplicationBulkStatusSerializer, ApplicationBulkStatusResponseSerializer, RejectRemainingSerializer,
+    RejectRemainingResponseSerializer, FunnelSerializer
+)
 from users.permissions import IsAdminUserRole, IsCompanyManager, IsJobOwnerOrManager
+from jobs.archive import ArchiveReadThroughMixin, archived_requested, filter_archive
 from jobs.models import Job
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
+from companies.models import Company
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample, OpenApiResponse
 
 # Create your views here.
+class ApplicationInboxPagination(KeysetPagination):
+    # Served by the (scope[, status], -applied_date, -id) indexes on Application
+    ordering = ('-applied_date', '-id')
+
+def with_serializer_relations(queryset):
+    """Load everything ApplicationSerializer nests: the job summary with its M2Ms and the applicant's company."""
+    return queryset.select_related(
+        'job', 'job__company', 'applicant', 'applicant__company'
+    ).prefetch_related(
+        'job__categories', 'job__required_skills'
+    )
+
 @extend_schema(
     tags=['applications'],
     summary='List and create applications',
@@ -31,9 +53,7 @@ class ApplicationListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        queryset = Application.objects.select_related(
-            'job', 'applicant', 'job__company'
-        ) 
+        queryset = with_serializer_relations(Application.objects.all())
         
         # Non-admin users only see their own applications
         if not self.request.user.is_admin_user():
@@ -59,8 +79,8 @@ class ApplicationRetrieveView(generics.RetrieveAPIView):
     serializer_class = ApplicationSerializer 
     permission_classes = [permissions.IsAuthenticated] 
     
-    def get_queryset(self):
-        queryset = Application.objects.select_related('job', 'applicant', 'job__company')
+    def get_queryset(self, model=Application):
+        queryset = with_serializer_relations(model.objects.all())
         
         # Non-admin users only see their own applications
         if not self.request.user.is_admin_user():
@@ -68,40 +88,53 @@ class ApplicationRetrieveView(generics.RetrieveAPIView):
             
         return queryset
 
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # Applications of archived jobs are read from the archive table
+            return get_object_or_404(self.get_queryset(ArchivedApplication), pk=self.kwargs['pk'])
+
 @extend_schema(
     tags=['applications'],
     summary="Get user's applications",
-    description='Retrieve all job applications for the currently authenticated user',
-    parameters=[
-        OpenApiParameter(
-            name='status', 
-            description='Filter applications by status',
-            required=False,
-            enum=['applied', 'reviewed', 'interview', 'rejected', 'accepted']
-        ),
-    ],
+    description=(
+        'Retrieve job applications for the currently authenticated user, newest first, '
+        'including applications to archived jobs. '
+        'Filter by status (repeatable) and applied date range; paginated with a cursor.'
+    ),
     responses={200: ApplicationSummarySerializer(many=True)}
 )
 class UserApplicationsView(generics.ListAPIView):
     serializer_class = ApplicationSummarySerializer 
     permission_classes = [permissions.IsAuthenticated]
+    filterset_class = ApplicationFilter
+    pagination_class = ApplicationInboxPagination
     
     def get_queryset(self):
         return Application.objects.filter(
             applicant=self.request.user
-        ).select_related('job', 'job__company')
+        ).select_related('job', 'job__company', 'applicant')
+
+    def get_archive_queryset(self):
+        queryset = ArchivedApplication.objects.filter(
+            applicant=self.request.user
+        ).select_related('job', 'job__company', 'applicant')
+        return filter_archive(ApplicationFilter, self.request, queryset)
 
 @extend_schema(
     tags=['applications'],
     summary='Get job applications',
-    description='Job owners and company managers can view applications for their jobs',
-    parameters=[
-        OpenApiParameter(name='status', description='Filter by application status', required=False),
-    ]
+    description=(
+        'Job owners and company managers can view applications for their jobs, newest first. '
+        'Filter by status (repeatable) and applied date range; paginated with a cursor.'
+    )
 )
 class JobApplicationsView(generics.ListAPIView):
     serializer_class = ApplicationSummarySerializer 
     permission_classes = [IsJobOwnerOrManager | IsAdminUserRole]
+    filterset_class = ApplicationFilter
+    pagination_class = ApplicationInboxPagination
     
     def get_queryset(self):
         job_id = self.kwargs['job_id'] 
@@ -137,22 +170,35 @@ class JobApplicationCountView(APIView):
 @extend_schema(
     tags=['applications', 'admin'],
     summary='Admin: List all applications',
-    description='Admins can view all job applications in the system',
+    description=(
+        'Admins can view all job applications in the system, including those of archived jobs, newest first. '
+        'archived=true lists only applications of archived jobs, archived=false only live ones.'
+    ),
+    parameters=[
+        OpenApiParameter(name='archived', type=bool, description='Only archived (true) or only live (false) applications', required=False),
+    ],
     responses={200: ApplicationSerializer}
 )
-class ApplicationAdminListView(generics.ListAPIView):
+class ApplicationAdminListView(ArchiveReadThroughMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAdminUserRole]
     
     def get_queryset(self):
-        return Application.objects.select_related(
-            'job', 'applicant', 'job__company'
-        )
+        model = ArchivedApplication if archived_requested(self.request) else Application
+        return with_serializer_relations(model.objects.all())
+
+    def get_archive_queryset(self):
+        if archived_requested(self.request) is not None:
+            return None
+        return with_serializer_relations(ArchivedApplication.objects.all())
 
 @extend_schema(
     tags=['applications'],
     summary='Update application status',
-    description='Job owners and company managers can update the status of applications',
+    description=(
+        'Job owners and company managers can update the status of applications. The update only '
+        'applies if the status has not changed since it was read; otherwise 409 is returned.'
+    ),
     request=ApplicationStatusSerializer,
     examples=[
         OpenApiExample(
@@ -163,7 +209,7 @@ class ApplicationAdminListView(generics.ListAPIView):
             }
         )
     ],
-    responses={200: ApplicationSerializer}
+    responses={200: ApplicationSerializer, 409: OpenApiResponse(description='Status changed concurrently')}
 )
 class ApplicationStatusUpdateView(generics.UpdateAPIView):
     serializer_class = ApplicationStatusSerializer
@@ -171,30 +217,191 @@ class ApplicationStatusUpdateView(generics.UpdateAPIView):
     
     def get_queryset(self):
         return Application.objects.select_related('job', 'job__company')
+
+    def perform_update(self, serializer):
+        # Attributed in the status event log
+        serializer.save(changed_by=self.request.user)
+    
+def annotate_can_manage(queryset, user):
+    """Flag each application the user may manage: job owner, company manager or admin."""
+    if user.is_admin_user():
+        return queryset.annotate(can_manage=Q(pk__isnull=False))
+    managers = Company.managers.through.objects.filter(company_id=OuterRef('job__company_id'), user_id=user.pk)
+    return queryset.annotate(can_manage=Q(job__posted_by=user) | Exists(managers))
+
+@extend_schema(
+    tags=['applications'],
+    summary='Bulk update application status',
+    description=(
+        'Move many applications to a new status in one request. Permissions are checked for all '
+        'affected jobs in a single query and the transition is applied as one conditional update. '
+        'Each ID gets its own outcome: updated, not_found, forbidden, invalid_transition or conflict.'
+    ),
+    request=ApplicationBulkStatusSerializer,
+    examples=[
+        OpenApiExample(
+            'Bulk Status Update Example',
+            value={
+                'application_ids': [12, 15, 18],
+                'status': 'reviewed',
+                'notes': 'Shortlisted after first screening'
+            }
+        )
+    ],
+    responses={200: ApplicationBulkStatusResponseSerializer}
+)
+class ApplicationBulkStatusView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['application_ids']
+        status = serializer.validated_data['status']
+        predecessors = Application.allowed_predecessors(status)
+
+        found = {
+            pk: (current, can_manage)
+            for pk, current, can_manage in annotate_can_manage(
+                Application.objects.filter(pk__in=ids), request.user
+            ).values_list('pk', 'status', 'can_manage')
+        }
+        allowed = [pk for pk, (current, can_manage) in found.items() if can_manage and current in predecessors]
+
+        moved = transition_applications(
+            Application.objects.filter(pk__in=allowed), status,
+            changed_by=request.user, notes=serializer.validated_data.get('notes'),
+        ) if allowed else {}
+
+        results = []
+        for pk in ids:
+            current, can_manage = found.get(pk, (None, False))
+            if pk in moved:
+                result = {'id': pk, 'result': 'updated', 'from_status': moved[pk], 'status': status}
+            elif pk not in found:
+                result = {'id': pk, 'result': 'not_found', 'from_status': None, 'status': None}
+            elif not can_manage:
+                # Do not leak the status of applications the user cannot manage
+                result = {'id': pk, 'result': 'forbidden', 'from_status': None, 'status': None}
+            elif current not in predecessors:
+                result = {'id': pk, 'result': 'invalid_transition', 'from_status': current, 'status': current}
+            else:
+                # Changed by someone else between the permission check and the update
+                result = {'id': pk, 'result': 'conflict', 'from_status': current, 'status': None}
+            results.append(result)
+
+        return Response(ApplicationBulkStatusResponseSerializer({'updated': len(moved), 'results': results}).data)
+
+@extend_schema(
+    tags=['applications'],
+    summary='Reject all remaining applicants',
+    description=(
+        'Reject every application for the job that has not yet been accepted or rejected, '
+        'e.g. once the position is filled. Runs as a single conditional update.'
+    ),
+    request=RejectRemainingSerializer,
+    responses={200: RejectRemainingResponseSerializer}
+)
+class JobRejectRemainingView(APIView):
+    permission_classes = [IsJobOwnerOrManager | IsAdminUserRole]
+
+    def post(self, request, job_id):
+        job = get_object_or_404(Job, id=job_id)
+        serializer = RejectRemainingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        moved = transition_applications(
+            Application.objects.filter(job_id=job.id), 'rejected',
+            changed_by=request.user, notes=serializer.validated_data.get('notes'),
+        )
+        return Response(RejectRemainingResponseSerializer({'job_id': job.id, 'rejected': len(moved)}).data)
     
 # Company manager endpoints
 @extend_schema(
     tags=['applications'],
     summary='Get company applications',
-    description='Company managers can view all applications for jobs posted by their company',
+    description=(
+        'Company managers can view all applications for jobs posted by their company, newest first. '
+        'Filter by status (repeatable) and applied date range; paginated with a cursor.'
+    ),
     parameters=[
-        OpenApiParameter(name='company_id', description='Company ID', required=True, type=int),
-        OpenApiParameter(
-            name='status', 
-            description='Filter by application status',
-            required=False,
-            enum=['applied', 'reviewed', 'interview', 'rejected', 'accepted']
-        ),
+        OpenApiParameter(name='company_id', description='Company ID', required=True, type=int, location=OpenApiParameter.PATH),
     ],
     responses={200: ApplicationSummarySerializer(many=True)}
 )
 class CompanyApplicationsView(generics.ListAPIView):
     serializer_class = ApplicationSummarySerializer
     permission_classes = [IsJobOwnerOrManager | IsAdminUserRole]
+    filterset_class = ApplicationFilter
+    pagination_class = ApplicationInboxPagination
     
     def get_queryset(self):
         company_id = self.kwargs['company_id']
+        # Filter on the denormalized company column rather than joining through jobs
         return Application.objects.filter(
-            job__company_id=company_id
+            company_id=company_id
         ).select_related('applicant', 'job', 'job__company')
 
+
+# Funnel analytics endpoints
+def build_funnel(rollups, company_id, job_id=None):
+    """Shape pre-aggregated FunnelStageRollup rows; never touches raw applications."""
+    by_stage = {rollup.stage: rollup for rollup in rollups}
+    applied = by_stage['applied'].entered if 'applied' in by_stage else 0
+
+    stages = []
+    for stage, _ in Application.STATUS_CHOICES:
+        rollup = by_stage.get(stage)
+        entered = rollup.entered if rollup else 0
+        exited = rollup.exited if rollup else 0
+        timed_exits = sum(rollup.duration_histogram) if rollup else 0
+        stages.append({
+            'stage': stage,
+            'entered': entered,
+            'exited': exited,
+            'current': entered - exited,
+            'conversion_rate': round(entered / applied, 4) if applied else None,
+            'median_seconds_in_stage': histogram_median(rollup.duration_histogram) if rollup else None,
+            'mean_seconds_in_stage': rollup.total_seconds_in_stage / timed_exits if timed_exits else None,
+        })
+
+    return {
+        'company_id': company_id,
+        'job_id': job_id,
+        'total_applications': applied,
+        'stages': stages,
+    }
+
+@extend_schema(
+    tags=['applications'],
+    summary='Get hiring funnel for a job',
+    description=(
+        'Stage counts, conversion rates and time-in-stage for a job, read from '
+        'incrementally maintained funnel rollups'
+    ),
+    responses={200: FunnelSerializer}
+)
+class JobFunnelView(APIView):
+    permission_classes = [IsJobOwnerOrManager | IsAdminUserRole]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(Job, id=job_id)
+        rollups = FunnelStageRollup.objects.filter(job_id=job.id)
+        return Response(FunnelSerializer(build_funnel(rollups, job.company_id, job.id)).data)
+
+@extend_schema(
+    tags=['applications'],
+    summary='Get hiring funnel for a company',
+    description=(
+        'Stage counts, conversion rates and time-in-stage across all jobs of a company, '
+        'read from incrementally maintained funnel rollups'
+    ),
+    responses={200: FunnelSerializer}
+)
+class CompanyFunnelView(APIView):
+    permission_classes = [IsJobOwnerOrManager | IsAdminUserRole]
+
+    def get(self, request, company_id):
+        company = get_object_or_404(Company, id=company_id)
+        rollups = FunnelStageRollup.objects.filter(company_id=company.id, job__isnull=True)
+        return Response(FunnelSerializer(build_funnel(rollups, company.id)).data)
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from jobboard.counts import EstimatedCountPaginator, count_subquery
+from users.models import User
 from .models import Company
 
 # Register your models here.
@@ -9,6 +11,9 @@ class CompanyAdmin(admin.ModelAdmin):
     list_filter = ('created_at', 'updated_at')
     search_fields = ('name', 'description', 'location', 'contact_email')
     ordering = ('-created_at',)
+    list_select_related = ('created_by',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Company Information', {
@@ -27,7 +32,8 @@ class CompanyAdmin(admin.ModelAdmin):
     )
 
     readonly_fields = ('created_at', 'updated_at')
-    filter_horizontal = ('managers',)
+    # Searchable widgets instead of <select>s listing every user
+    autocomplete_fields = ('created_by', 'managers')
 
     def get_readonly_fields(self, request, obj=None):
         if obj:  # editing an existing object
@@ -39,7 +45,12 @@ class CompanyAdmin(admin.ModelAdmin):
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.annotate(_employee_count=count_subquery(User, 'company'))
+
     def employee_count(self, obj):
-        return obj.employees.count()
+        return obj._employee_count
+    employee_count.admin_order_field = '_employee_count'
     employee_count.short_description = "Employees"
 
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from applications.models import Application
+from jobs.models import Job
+
+# Application statuses that still await a first look from the employer
+UNREAD_STATUSES = ('applied',)
+
+# Dashboards live in the default cache, shared by all processes once CACHE_URL
+# is set, so an invalidation in one worker reaches readers in every other
+def dashboard_cache_key(company_id):
+    return f'companies:dashboard:{company_id}'
+
+def build_company_dashboard(company):
+    """
+    Per-job application counts by status, newest application and unread
+    counts, plus company totals, from a single grouped query over the
+    company's jobs.
+    """
+    statuses = [status for status, _ in Application.STATUS_CHOICES]
+    rows = Job.objects.filter(company_id=company.pk).values(
+        'id', 'title', 'is_active', 'created_at'
+    ).annotate(
+        total=Count('applications'),
+        unread=Count('applications', filter=Q(applications__status__in=UNREAD_STATUSES)),
+        newest_application_at=Max('applications__applied_date'),
+        **{
+            f'status_{status}': Count('applications', filter=Q(applications__status=status))
+            for status in statuses
+        }
+    ).order_by('-created_at', '-id')
+
+    jobs = []
+    totals = {'jobs': 0, 'active_jobs': 0, 'applications': 0, 'unread': 0, 'newest_application_at': None}
+    totals_by_status = dict.fromkeys(statuses, 0)
+    for row in rows:
+        by_status = {status: row[f'status_{status}'] for status in statuses}
+        totals['jobs'] += 1
+        totals['applications'] += row['total']
+        totals['unread'] += row['unread']
+        for status, count in by_status.items():
+            totals_by_status[status] += count
+        newest = row['newest_application_at']
+        if newest and (totals['newest_application_at'] is None or newest > totals['newest_application_at']):
+            totals['newest_application_at'] = newest
+        if not row['is_active']:
+            continue
+        totals['active_jobs'] += 1
+        jobs.append({
+            'job_id': row['id'],
+            'title': row['title'],
+            'created_at': row['created_at'],
+            'applications': row['total'],
+            'unread': row['unread'],
+            'newest_application_at': newest,
+            'by_status': by_status,
+        })
+
+    totals['by_status'] = totals_by_status
+    return {'company_id': company.pk, 'company_name': company.name, 'totals': totals, 'jobs': jobs}
+
+def get_company_dashboard(company):
+    key = dashboard_cache_key(company.pk)
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_company_dashboard(company)
+        cache.set(key, dashboard, settings.COMPANY_DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
+
+def invalidate_company_dashboard(company_id):
+    if company_id is None:
+        return
+    key = dashboard_cache_key(company_id)
+    cache.delete(key)
+    # A concurrent reader may cache pre-commit data in between; drop it again once committed
+    transaction.on_commit(lambda: cache.delete(key))
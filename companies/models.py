@@ -1,6 +1,12 @@
 from django.db import models
 from users.models import User
 
+class VisibleCompanyManager(models.Manager):
+    """Hides companies whose deletion is in progress (see users.purge)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 # Create your models here.
 class Company(models.Model):
     name = models.CharField(max_length=200, unique=True)
@@ -13,6 +19,11 @@ class Company(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='companies')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the company is deleted; its rows are purged in the background
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = VisibleCompanyManager()
+    all_objects = models.Manager()
 
     class Meta:
         indexes = [
@@ -23,7 +23,8 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'description', 'location', 'website', 'logo', 'contact_email']
     
     def validate_name(self, value):
-        if Company.objects.filter(name__iexact=value).exists():
+        # Companies still being purged keep their name until the row is gone
+        if Company.all_objects.filter(name__iexact=value).exists():
             raise serializers.ValidationError("A company with this name already exists.")
         return value
 
@@ -47,3 +48,33 @@ class RemoveManagerSerializer(serializers.Serializer):
 class ManagerResponseSerializer(serializers.Serializer):
     message = serializers.CharField()
 
+
+class StatusCountsSerializer(serializers.Serializer):
+    applied = serializers.IntegerField()
+    reviewed = serializers.IntegerField()
+    interview = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+    accepted = serializers.IntegerField()
+
+class DashboardJobSerializer(serializers.Serializer):
+    job_id = serializers.IntegerField()
+    title = serializers.CharField()
+    created_at = serializers.DateTimeField()
+    applications = serializers.IntegerField()
+    unread = serializers.IntegerField(help_text="Applications not yet reviewed")
+    newest_application_at = serializers.DateTimeField(allow_null=True)
+    by_status = StatusCountsSerializer()
+
+class DashboardTotalsSerializer(serializers.Serializer):
+    jobs = serializers.IntegerField()
+    active_jobs = serializers.IntegerField()
+    applications = serializers.IntegerField()
+    unread = serializers.IntegerField()
+    newest_application_at = serializers.DateTimeField(allow_null=True)
+    by_status = StatusCountsSerializer()
+
+class CompanyDashboardSerializer(serializers.Serializer):
+    company_id = serializers.IntegerField()
+    company_name = serializers.CharField()
+    totals = DashboardTotalsSerializer()
+    jobs = DashboardJobSerializer(many=True)
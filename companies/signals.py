@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from applications.models import Application
+from applications.pipeline import applications_transitioned
+from jobs.models import Job
+from .dashboard import invalidate_company_dashboard
+
+# Cached company dashboards are dropped on every write that can change them.
+# Set-based status updates arrive through the pipeline's transition signal;
+# other QuerySet.update() paths must call invalidate_company_dashboard themselves.
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_on_application_write(sender, instance, **kwargs):
+    invalidate_company_dashboard(instance.company_id)
+
+@receiver(applications_transitioned)
+def invalidate_on_transitions(sender, transitions, **kwargs):
+    for company_id in {t.company_id for t in transitions}:
+        invalidate_company_dashboard(company_id)
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_on_job_write(sender, instance, **kwargs):
+    invalidate_company_dashboard(instance.company_id)
@@ -0,0 +1,15 @@
+from celery import shared_task
+from django.core.files.storage import default_storage
+from jobboard.tasks import RetryingTask
+
+@shared_task(base=RetryingTask, autoretry_for=(OSError,))
+def cleanup_deleted_company(company_id, file_names):
+    """
+    Remove the stored files (logo, applicant resumes) that the database
+    cascade leaves behind for a deleted company, or for a deleted user's
+    applications (``company_id`` None). Deleting an already-missing file is
+    a no-op, so retries are safe.
+    """
+    for name in file_names:
+        default_storage.delete(name)
+    return len(file_names)
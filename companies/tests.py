@@ -2,7 +2,14 @@ from django.test import TestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from jobboard.test_utils import BaseAPITestCase
+import shutil
+import tempfile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from jobboard.test_utils import BaseAPITestCase, QueryBudget
 from .models import Company 
 
 # Create your tests here.
@@ -264,9 +271,10 @@ class CompanyDeleteTests(BaseAPITestCase):
         response = self.client.delete(
             reverse('company-delete', args=[self.company.id])
         )
-        self.assertResponseSuccess(response, status.HTTP_204_NO_CONTENT)
+        self.assertResponseSuccess(response, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['target'], 'company')
         
-        # Verify company was deleted
+        # Verify company was hidden at once
         self.assertFalse(Company.objects.filter(id=self.company.id).exists())
     
     def test_delete_company_as_admin(self):
@@ -276,9 +284,31 @@ class CompanyDeleteTests(BaseAPITestCase):
         response = self.client.delete(
             reverse('company-delete', args=[self.company.id])
         )
-        self.assertResponseSuccess(response, status.HTTP_204_NO_CONTENT)
+        self.assertResponseSuccess(response, status.HTTP_202_ACCEPTED)
         self.assertFalse(Company.objects.filter(id=self.company.id).exists())
     
+    def test_delete_company_cleans_up_stored_files(self):
+        """Test that the logo and applicant resumes are removed by the cleanup task"""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media_root):
+            self.company.logo = SimpleUploadedFile('logo.gif', b'GIF89a', content_type='image/gif')
+            self.company.save()
+            application = self.create_test_application(
+                job=self.create_test_job(company=self.company),
+                resume=SimpleUploadedFile('cv.pdf', b'%PDF-1.4', content_type='application/pdf')
+            )
+            stored = [self.company.logo.name, application.resume.name]
+            self.assertTrue(all(default_storage.exists(name) for name in stored))
+
+            self.authenticate_user(self.employer_user)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(reverse('company-delete', args=[self.company.id]))
+
+            self.assertResponseSuccess(response, status.HTTP_202_ACCEPTED)
+            self.assertFalse(Company.all_objects.filter(id=self.company.id).exists())
+            self.assertFalse(any(default_storage.exists(name) for name in stored))
+
     def test_delete_company_unauthorized(self):
         """Test that non-owners cannot delete companies"""
         # Try as job seeker (not owner)
@@ -553,3 +583,82 @@ class CompanyJobRelationshipTests(BaseAPITestCase):
         self.assertIn('Junior Developer', job_titles)
         self.assertNotIn('Inactive Job', job_titles)
 
+
+class CompanyDashboardTests(BaseAPITestCase):
+    """Test the cached company dashboard"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company(name='Dashboard Company')
+        self.job = self.create_test_job(company=self.company, title='Backend Engineer')
+        self.other_job = self.create_test_job(company=self.company, title='Designer')
+        self.closed_job = self.create_test_job(company=self.company, title='Closed Role', is_active=False)
+        self.create_test_application(job=self.job, applicant=self.create_user())
+        self.create_test_application(job=self.job, applicant=self.create_user(), status='reviewed')
+        self.create_test_application(job=self.closed_job, applicant=self.create_user(), status='rejected')
+
+    def test_dashboard_counts(self):
+        """Test per-job and company-wide counts in one grouped query"""
+        self.authenticate_user(self.employer_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('company-dashboard', args=[self.company.id]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(
+            sum('"applications_application"' in query['sql'] for query in queries.captured_queries), 1
+        )
+
+        jobs = {job['title']: job for job in response.data['jobs']}
+        self.assertEqual(set(jobs), {'Backend Engineer', 'Designer'})
+        self.assertEqual(jobs['Backend Engineer']['applications'], 2)
+        self.assertEqual(jobs['Backend Engineer']['unread'], 1)
+        self.assertEqual(jobs['Backend Engineer']['by_status']['reviewed'], 1)
+        self.assertIsNotNone(jobs['Backend Engineer']['newest_application_at'])
+        self.assertEqual(jobs['Designer']['applications'], 0)
+        self.assertIsNone(jobs['Designer']['newest_application_at'])
+
+        totals = response.data['totals']
+        self.assertEqual((totals['jobs'], totals['active_jobs']), (3, 2))
+        self.assertEqual(totals['applications'], 3)
+        self.assertEqual(totals['by_status']['rejected'], 1)
+
+    def test_dashboard_is_cached_and_invalidated(self):
+        """Test that repeat reads hit the cache and application writes refresh it"""
+        self.authenticate_user(self.employer_user)
+        url = reverse('company-dashboard', args=[self.company.id])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse(any('"applications_application"' in query['sql'] for query in queries.captured_queries))
+
+        self.create_test_application(job=self.other_job, applicant=self.create_user())
+        response = self.client.get(url)
+        jobs = {job['title']: job for job in response.data['jobs']}
+        self.assertEqual(jobs['Designer']['unread'], 1)
+
+        self.client.patch(reverse('job-activation', args=[self.other_job.id]))
+        response = self.client.get(url)
+        self.assertEqual([job['title'] for job in response.data['jobs']], ['Backend Engineer'])
+
+    def test_dashboard_permissions(self):
+        """Test that only company managers and admins can view the dashboard"""
+        self.authenticate_user(self.job_seeker_user)
+        response = self.client.get(reverse('company-dashboard', args=[self.company.id]))
+        self.assertResponsePermissionDenied(response)
+
+        self.authenticate_user(self.admin_user)
+        response = self.client.get(reverse('company-dashboard', args=[self.company.id]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+
+
+class CompanyQueryBudgetTests(BaseAPITestCase):
+    """Company list endpoints must not run a query per listed company"""
+    query_budgets = [
+        QueryBudget('company-list-create', max_queries=2, populate='add_companies'),
+        QueryBudget('company-summary', max_queries=1, populate='add_companies'),
+        QueryBudget('admin-company-list', max_queries=3, populate='add_companies', user='admin_user'),
+    ]
+
+    def add_companies(self, count):
+        for _ in range(count):
+            self.create_test_company()
+        return {}
@@ -2,7 +2,7 @@ from django.urls import path
 from .views import (
     CompanyListCreateView, CompanyRetrieveView, CompanyListView,
     CompanyUpdateView, CompanyDeleteView, CompanyAdminListView,
-    CompanyAddManagerView, CompanyRemoveManagerView
+    CompanyAddManagerView, CompanyRemoveManagerView, CompanyDashboardView
 )
 
 urlpatterns = [
@@ -14,6 +14,7 @@ urlpatterns = [
     # Management endpoints
     path('<int:pk>/update/', CompanyUpdateView.as_view(), name='company-update'),
     path('<int:pk>/delete/', CompanyDeleteView.as_view(), name='company-delete'),
+    path('<int:pk>/dashboard/', CompanyDashboardView.as_view(), name='company-dashboard'),
     
     # Manager management
     path('<int:pk>/managers/add/', CompanyAddManagerView.as_view(), name='company-add-manager'),
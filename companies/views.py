@@ -8,8 +8,11 @@ from .models import Company
 from .serializers import (
     CompanySerializer, CompanyCreateSerializer, CompanySummarySerializer,
     DeleteResponseSerializer, AddManagerSerializer, RemoveManagerSerializer,
-    ManagerResponseSerializer
+    ManagerResponseSerializer, CompanyDashboardSerializer
 )
+from .dashboard import get_company_dashboard
+from users.purge import request_deletion
+from users.serializers import DeletionSerializer
 from users.permissions import IsAdminUserRole, IsCompanyManager, IsOwnerOrAdmin, IsCompanyOwnerOrAdmin
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 
@@ -96,10 +99,13 @@ class CompanyUpdateView(generics.UpdateAPIView):
 @extend_schema(
     tags=['companies'],
     summary='Delete company',
-    description='Only company owners or admins can delete a company profile',
+    description=(
+        'Only company owners or admins can delete a company profile. The company is hidden '
+        'and its postings deactivated at once; jobs, applications and stored files are purged '
+        'in the background. Returns 202 with the deletion, pollable at /api/auth/deletions/<id>/.'
+    ),
     responses={
-        204: None,
-        200: DeleteResponseSerializer,  
+        202: DeletionSerializer,
         403: DeleteResponseSerializer,
         404: DeleteResponseSerializer,
     }
@@ -109,7 +115,12 @@ class CompanyDeleteView(generics.DestroyAPIView):
     permission_classes = [IsCompanyOwnerOrAdmin]
 
     def get_queryset(self):
-        return Company.objects.all()
+        # Hidden companies included: deleting again reports the purge in progress
+        return Company.all_objects.all()
+
+    def destroy(self, request, *args, **kwargs):
+        deletion = request_deletion(self.get_object(), requested_by=request.user)
+        return Response(DeletionSerializer(deletion).data, status=status.HTTP_202_ACCEPTED)
 
 @extend_schema(
     tags=['companies'],
@@ -252,3 +263,20 @@ class CompanyRemoveManagerView(APIView):
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
+@extend_schema(
+    tags=['companies'],
+    summary='Company hiring dashboard',
+    description=(
+        'Per active job: application counts by status, newest application time and unread '
+        '(not yet reviewed) counts, plus company-wide totals. Computed in one grouped query '
+        'and cached per company until the next application or job write.'
+    ),
+    responses={200: CompanyDashboardSerializer}
+)
+class CompanyDashboardView(APIView):
+    permission_classes = [IsCompanyManager | IsAdminUserRole]
+
+    def get(self, request, pk):
+        company = get_object_or_404(Company, pk=pk)
+        self.check_object_permissions(request, company)
+        return Response(CompanyDashboardSerializer(get_company_dashboard(company)).data)
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
+# Settings disable persistent (unpooled) connections under ASGI
+os.environ.setdefault('JOBBOARD_ASGI', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,168 @@
+"""
+Batched GETs: one HTTP round trip for the several reads a client screen needs.
+
+Each sub-request is resolved and dispatched in-process, straight to its view:
+middleware does not run again, the batch's authenticated user is reused
+instead of re-checking the token per request, and identical paths in one
+batch are served once. Sub-requests are instrumented as requests of their
+own views (metrics, N+1 detection), and their queries also count towards
+the batch request.
+"""
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema, OpenApiExample
+from .instrumentation import RequestStats, current_request_stats, observe_request, report_n_plus_one
+from .middleware import ReplicaRoutingMiddleware
+from .routers import current_route
+
+logger = logging.getLogger(__name__)
+
+
+def build_subrequest(request, path, query_string, match):
+    """A GET for ``path`` carrying the batch request's headers and authenticated user."""
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {
+        **request.META,
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query_string,
+        'HTTP_ACCEPT': 'application/json',
+    }
+    sub.META.pop('CONTENT_TYPE', None)
+    sub.META.pop('CONTENT_LENGTH', None)
+    sub.GET = QueryDict(query_string)
+    sub.COOKIES = request.COOKIES
+    sub.resolver_match = match
+    sub.user = request.user
+    if request.user.is_authenticated:
+        # Picked up by DRF's Request in place of the authenticators
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+    return sub
+
+
+def response_body(response):
+    if not response.content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(response.content)
+    return response.content.decode(response.charset or 'utf-8', errors='replace')
+
+
+def dispatch(request, path, query_string, match):
+    """Run one sub-request through its view; returns ``(status, body)``."""
+    sub = build_subrequest(request, path, query_string, match)
+    view = async_to_sync(match.func) if iscoroutinefunction(match.func) else match.func
+    stats = RequestStats(sub)
+    token = current_request_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = view(sub, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        observe_request(sub, response, stats, time.perf_counter() - started)
+        report_n_plus_one(sub, response, stats)
+        return response.status_code, response_body(response)
+    except Exception:
+        logger.exception(f'Batch sub-request GET {path} failed')
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {'error': 'Internal server error.'}
+    finally:
+        current_request_stats.reset(token)
+        outer = current_request_stats.get()
+        if outer is not None:
+            outer.queries += stats.queries
+            outer.db_seconds += stats.db_seconds
+
+
+def run_batch(request, paths):
+    limits = settings.BATCH_REQUESTS
+    deadline = time.monotonic() + limits['TIMEOUT']
+    served = {}
+    results = []
+    for path in paths:
+        if path not in served:
+            served[path] = run_one(request, path, deadline)
+        code, body = served[path]
+        results.append({'path': path, 'status': code, 'body': body})
+    return results
+
+
+def run_one(request, path, deadline):
+    url = urlsplit(path)
+    if url.scheme or url.netloc or not url.path.startswith('/api/'):
+        return status.HTTP_400_BAD_REQUEST, {'error': 'Only relative /api/ paths can be batched.'}
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {'error': 'Not found.'}
+    if getattr(match.func, 'view_class', None) is BatchView:
+        return status.HTTP_400_BAD_REQUEST, {'error': 'Batches cannot be nested.'}
+    # A running view cannot be interrupted: the limit stops the ones left
+    if time.monotonic() > deadline:
+        return status.HTTP_504_GATEWAY_TIMEOUT, {'error': 'Batch time limit exceeded.'}
+    return dispatch(request, url.path, url.query, match)
+
+
+@extend_schema(
+    tags=['batch'],
+    summary='Batch GET requests',
+    description=(
+        'Runs up to BATCH_REQUESTS["MAX_REQUESTS"] relative GET requests (e.g. "/api/jobs/1/") in one round trip '
+        'and returns their statuses and bodies in order. The batch is authenticated once and every request '
+        'runs as that user; identical paths are served once. Requests still waiting when the time limit '
+        'is reached are answered with 504 without running.'
+    ),
+    request={
+        'application/json': {
+            'type': 'object',
+            'properties': {'requests': {'type': 'array', 'items': {'type': 'string'}}},
+            'required': ['requests'],
+        }
+    },
+    examples=[
+        OpenApiExample(
+            'Job Screen Example',
+            value={'requests': ['/api/jobs/1/', '/api/jobs/company/1/', '/api/applications/job/1/count/', '/api/categories/']},
+            request_only=True,
+        ),
+    ],
+    responses={
+        200: OpenApiExample(
+            'Batch Response Example',
+            value={'responses': [
+                {'path': '/api/applications/job/1/count/', 'status': 200, 'body': {'job_id': 1, 'application_count': 3}},
+            ]},
+        ),
+    },
+)
+class BatchView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        paths = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(paths, list) or not paths or not all(isinstance(path, str) for path in paths):
+            return Response(
+                {'error': 'requests must be a non-empty list of relative GET paths.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_requests = settings.BATCH_REQUESTS['MAX_REQUESTS']
+        if len(paths) > max_requests:
+            return Response(
+                {'error': f'A batch can hold at most {max_requests} requests.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Only GETs run, so the batch may read from a replica like a GET would
+        route = current_route.get()
+        if route is not None and settings.DATABASE_REPLICAS:
+            route.use_replica = not ReplicaRoutingMiddleware.pinned_by_cookie(request)
+        return Response({'responses': run_batch(request, paths)})
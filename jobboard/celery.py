@@ -0,0 +1,18 @@
+import os
+from celery import Celery
+from celery.signals import worker_process_init
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
+
+app = Celery('jobboard')
+
+# All Celery settings live in Django settings under the CELERY_ prefix
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def reset_database_pools(**kwargs):
+    # Prefork children must not share the parent's pooled connections
+    from .dbpool import forget_inherited_pools
+    forget_inherited_pools()
@@ -0,0 +1,91 @@
+import json
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+# Planner row estimate of a table; partitioned tables hold no rows themselves,
+# so theirs is the sum over the partitions. -1 means never analyzed.
+TABLE_ESTIMATE_SQL = (
+    "SELECT CASE WHEN p.relkind = 'p' THEN ("
+    'SELECT SUM(GREATEST(c.reltuples, 0)) FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+    'WHERE i.inhparent = p.oid) ELSE p.reltuples END FROM pg_class p WHERE p.oid = to_regclass(%s)'
+)
+
+
+def count_subquery(model, fk_field):
+    """Correlated COUNT(*) of ``model`` rows per outer row, avoiding the fan-out of joining two relations."""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk_field: OuterRef('pk')})
+            .order_by()
+            .values(fk_field)
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def table_estimate(model, using):
+    """``pg_class.reltuples`` of ``model``'s table, or None before the first ANALYZE."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(TABLE_ESTIMATE_SQL, [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def plan_estimate(queryset):
+    """Rows the PostgreSQL planner expects ``queryset`` to return, from ``EXPLAIN``."""
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset, threshold=None):
+    """
+    ``(count, approximate)`` for ``queryset``. Counting stops at ``threshold``
+    rows, so small results stay exact at bounded cost; past it PostgreSQL's
+    statistics stand in: ``reltuples`` for a whole table, the planner's row
+    estimate for a filtered queryset. Other databases always count exactly.
+    """
+    threshold = settings.COUNT_ESTIMATE_THRESHOLD if threshold is None else threshold
+    if connections[queryset.db].vendor != 'postgresql' or threshold <= 0:
+        return queryset.count(), False
+    # COUNT(*) over a LIMITed subquery reads at most ``threshold`` rows
+    bounded = queryset.order_by()[:threshold].count()
+    if bounded < threshold:
+        return bounded, False
+    query = queryset.query
+    if not query.where and not query.distinct and not query.group_by and not query.combinator:
+        estimate = table_estimate(queryset.model, queryset.db)
+    else:
+        estimate = plan_estimate(queryset.order_by())
+    # The statistics may lag behind a table that just grew
+    return max(estimate or 0, threshold), True
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose ``count`` comes from ``estimated_count``, so admin
+    changelists over large tables skip the exact ``COUNT(*)``. When the
+    estimate falls short, the last pages are reached by narrowing the filter.
+    """
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        count, self.approximate = estimated_count(self.object_list)
+        return count
+
+    approximate = False
@@ -0,0 +1,74 @@
+from django.db import connections
+from prometheus_client import REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# psycopg_pool.ConnectionPool.get_stats() keys exported as gauges: (key, metric, help)
+POOL_GAUGES = (
+    ('pool_min', 'jobboard_db_pool_min_size', 'Configured minimum pool size'),
+    ('pool_max', 'jobboard_db_pool_max_size', 'Configured maximum pool size'),
+    ('pool_size', 'jobboard_db_pool_size', 'Connections currently managed by the pool'),
+    ('pool_available', 'jobboard_db_pool_available', 'Idle connections ready to be handed out'),
+    ('requests_waiting', 'jobboard_db_pool_requests_waiting', 'Requests currently queued for a connection'),
+)
+# Cumulative counters: (key, metric, help, scale); psycopg reports durations in milliseconds
+POOL_COUNTERS = (
+    ('requests_num', 'jobboard_db_pool_requests', 'Connections requested from the pool', 1),
+    ('requests_queued', 'jobboard_db_pool_requests_queued', 'Requests that had to wait for a connection', 1),
+    ('requests_wait_ms', 'jobboard_db_pool_wait_seconds', 'Time spent waiting for a connection', 1000),
+    ('requests_errors', 'jobboard_db_pool_timeouts', 'Requests that timed out or failed waiting', 1),
+    ('connections_errors', 'jobboard_db_pool_connect_errors', 'Failed attempts to open a connection', 1),
+    ('connections_lost', 'jobboard_db_pool_connections_lost', 'Connections found broken by the health check', 1),
+    ('returns_bad', 'jobboard_db_pool_returns_bad', 'Connections returned in a bad state and discarded', 1),
+)
+
+
+def connection_pool(alias):
+    """The psycopg pool already opened for ``alias`` in this process, or None. Never opens one."""
+    wrapper = connections[alias]
+    if wrapper.vendor != 'postgresql' or not wrapper.settings_dict.get('OPTIONS', {}).get('pool'):
+        return None
+    return getattr(wrapper, '_connection_pools', {}).get(alias)
+
+
+def forget_inherited_pools():
+    """
+    Drop pools copied from a parent process by fork. Their worker threads did
+    not survive the fork and their sockets are shared with the parent, so they
+    are discarded without closing them; each child opens its own on first use.
+    """
+    for wrapper in connections.all(initialized_only=True):
+        pools = getattr(wrapper, '_connection_pools', None)
+        if pools:
+            pools.clear()
+            wrapper.connection = None
+
+
+class ConnectionPoolCollector:
+    """
+    Prometheus collector reading ``get_stats()`` of this process's connection
+    pools at scrape time, labelled by database alias.
+    """
+
+    def collect(self):
+        gauges = {key: GaugeMetricFamily(name, text, labels=['alias']) for key, name, text in POOL_GAUGES}
+        counters = {
+            key: CounterMetricFamily(name, text, labels=['alias'])
+            for key, name, text, _ in POOL_COUNTERS
+        }
+        for alias in connections:
+            pool = connection_pool(alias)
+            if pool is None:
+                continue
+            # Counters that never moved are left out of get_stats()
+            stats = pool.get_stats()
+            for key, _, _ in POOL_GAUGES:
+                gauges[key].add_metric([alias], stats.get(key, 0))
+            for key, _, _, scale in POOL_COUNTERS:
+                counters[key].add_metric([alias], stats.get(key, 0) / scale)
+        yield from gauges.values()
+        yield from counters.values()
+
+
+pool_collector = ConnectionPoolCollector()
+
+REGISTRY.register(pool_collector)
@@ -0,0 +1,8 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+class Conflict(APIException):
+    """The resource changed between reading it and writing it; the client should reload and retry."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The resource was modified by another request.'
+    default_code = 'conflict'
@@ -0,0 +1,72 @@
+"""
+Validation rules bounding how much database work one GraphQL query may ask for.
+
+Depth uses graphene's ``depth_limit_validator``. Complexity charges every
+selected field once per object it is resolved on: a field inside
+``jobs(first: 50)`` costs 50, inside ``categories`` of those jobs 50 times the
+assumed list size. Page sizes given through variables are charged at the
+maximum, since variables are not known while validating.
+"""
+from graphql import GraphQLError, get_named_type, get_nullable_type, is_list_type
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode, IntValueNode, OperationDefinitionNode
+from graphql.validation import ValidationRule
+
+
+def list_multiplier(field_node, field_def, list_size, max_page_size):
+    """How many items a list field is assumed to return."""
+    if 'first' not in field_def.args:
+        return list_size
+    for argument in field_node.arguments:
+        if argument.name.value == 'first':
+            if isinstance(argument.value, IntValueNode):
+                return min(int(argument.value.value), max_page_size)
+            return max_page_size
+    default = field_def.args['first'].default_value
+    return default if isinstance(default, int) else max_page_size
+
+
+def complexity_limit_validator(max_complexity, list_size, max_page_size):
+    class ComplexityLimitValidator(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *args):
+            schema = self.context.schema
+            root = schema.get_root_type(node.operation)
+            cost = self.selection_cost(node.selection_set, root, 1, set())
+            if cost > max_complexity:
+                name = node.name.value if node.name else 'anonymous'
+                self.report_error(GraphQLError(
+                    f"'{name}' exceeds maximum operation complexity of {max_complexity} (estimated {cost}).",
+                    [node],
+                ))
+
+        def selection_cost(self, selection_set, parent_type, multiplier, fragments):
+            cost = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    name = selection.name.value
+                    if name.startswith('__') or name not in getattr(parent_type, 'fields', {}):
+                        continue
+                    field_def = parent_type.fields[name]
+                    cost += multiplier
+                    if selection.selection_set is None:
+                        continue
+                    inner = multiplier
+                    if is_list_type(get_nullable_type(field_def.type)):
+                        inner *= list_multiplier(selection, field_def, list_size, max_page_size)
+                    cost += self.selection_cost(
+                        selection.selection_set, get_named_type(field_def.type), inner, fragments
+                    )
+                elif isinstance(selection, InlineFragmentNode):
+                    condition = selection.type_condition
+                    fragment_type = self.context.schema.get_type(condition.name.value) if condition else parent_type
+                    cost += self.selection_cost(selection.selection_set, fragment_type, multiplier, fragments)
+                elif isinstance(selection, FragmentSpreadNode):
+                    name = selection.name.value
+                    fragment = self.context.get_fragment(name)
+                    # Cycles are reported by NoFragmentCyclesRule
+                    if fragment is None or name in fragments:
+                        continue
+                    fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+                    cost += self.selection_cost(fragment.selection_set, fragment_type, multiplier, fragments | {name})
+            return cost
+
+    return ComplexityLimitValidator
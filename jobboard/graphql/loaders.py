@@ -0,0 +1,150 @@
+"""
+Per-request DataLoaders for the GraphQL API.
+
+Resolvers ask a loader for one key; every key requested while the current
+level of the query resolves is collected into one batch and fetched with a
+single query, so a list of N jobs with their company, categories and skills
+costs a constant number of statements instead of N per relation. Loaders
+cache per request, and the ORM runs in the request thread (sync_to_async),
+where its connection and transaction live.
+"""
+from collections import defaultdict
+from asgiref.sync import sync_to_async
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from graphene.utils.dataloader import DataLoader
+from applications.models import Application
+from companies.models import Company
+from jobs.models import Job
+from users.models import User
+
+
+class ModelLoader(DataLoader):
+    """Rows of ``queryset`` by primary key; keys it does not hold load as None."""
+
+    def __init__(self, queryset):
+        super().__init__()
+        self.queryset = queryset
+
+    async def batch_load_fn(self, keys):
+        rows = await sync_to_async(self.queryset.in_bulk)(keys)
+        return [rows.get(key) for key in keys]
+
+
+class RelatedLoader(DataLoader):
+    """
+    Rows of ``queryset`` per value of ``key_field`` (a foreign key), in the
+    queryset's order. With ``limit``, only the first ``limit`` rows of each
+    key are fetched, ranked by a window function in the same query.
+    """
+
+    def __init__(self, queryset, key_field, limit=None):
+        super().__init__()
+        self.queryset = queryset
+        self.key_field = key_field
+        self.limit = limit
+
+    def fetch(self, keys):
+        queryset = self.queryset.filter(**{f'{self.key_field}__in': keys})
+        if self.limit is not None:
+            queryset = queryset.annotate(
+                _rank=Window(RowNumber(), partition_by=[F(self.key_field)], order_by=queryset.query.order_by or ['pk'])
+            ).filter(_rank__lte=self.limit)
+        grouped = defaultdict(list)
+        attname = self.queryset.model._meta.get_field(self.key_field).attname
+        for row in queryset:
+            grouped[getattr(row, attname)].append(row)
+        return grouped
+
+    async def batch_load_fn(self, keys):
+        grouped = await sync_to_async(self.fetch)(keys)
+        return [grouped.get(key, []) for key in keys]
+
+
+class ManyToManyLoader(DataLoader):
+    """Targets of a many-to-many ``field`` per source id, read through the link table in one query."""
+
+    def __init__(self, field, ordering):
+        super().__init__()
+        self.through = field.remote_field.through
+        self.source = field.m2m_field_name()
+        self.target = field.m2m_reverse_field_name()
+        self.ordering = ordering
+
+    def fetch(self, keys):
+        links = (
+            self.through.objects.filter(**{f'{self.source}_id__in': keys})
+            .select_related(self.target).order_by(f'{self.target}__{self.ordering}')
+        )
+        grouped = defaultdict(list)
+        for link in links:
+            grouped[getattr(link, f'{self.source}_id')].append(getattr(link, self.target))
+        return grouped
+
+    async def batch_load_fn(self, keys):
+        grouped = await sync_to_async(self.fetch)(keys)
+        return [grouped.get(key, []) for key in keys]
+
+
+class CountLoader(DataLoader):
+    """Number of ``model`` rows per value of ``key_field``, with one grouped COUNT."""
+
+    def __init__(self, model, key_field):
+        super().__init__()
+        self.model = model
+        self.key_field = key_field
+
+    def fetch(self, keys):
+        return dict(
+            self.model.objects.filter(**{f'{self.key_field}__in': keys}).order_by()
+            .values_list(self.key_field).annotate(total=Count('pk'))
+        )
+
+    async def batch_load_fn(self, keys):
+        counts = await sync_to_async(self.fetch)(keys)
+        return [counts.get(key, 0) for key in keys]
+
+
+class ManageableJobLoader(DataLoader):
+    """
+    Whether the user may manage each job (and see its applications): the
+    job's poster, a manager of its company or an admin, as IsJobOwnerOrManager.
+    """
+
+    def __init__(self, user):
+        super().__init__()
+        self.user = user
+
+    def fetch(self, keys):
+        if not self.user.is_authenticated:
+            return set()
+        if self.user.is_admin_user():
+            return set(keys)
+        return set(
+            Job.objects.filter(pk__in=keys)
+            .filter(Q(posted_by=self.user) | Q(company__managers=self.user))
+            .values_list('pk', flat=True)
+        )
+
+    async def batch_load_fn(self, keys):
+        manageable = await sync_to_async(self.fetch)(keys)
+        return [key in manageable for key in keys]
+
+
+class Loaders:
+    """The loaders of one GraphQL request; create inside the executing event loop."""
+
+    def __init__(self, user, page_size):
+        self.job = ModelLoader(Job.objects.all())
+        self.company = ModelLoader(Company.objects.all())
+        self.user = ModelLoader(User.objects.all())
+        self.job_categories = ManyToManyLoader(Job._meta.get_field('categories'), 'name')
+        self.job_skills = ManyToManyLoader(Job._meta.get_field('required_skills'), 'name')
+        self.job_application_count = CountLoader(Application, 'job')
+        self.company_jobs = RelatedLoader(
+            Job.objects.filter(is_active=True).order_by('-created_at', '-id'), 'company', limit=page_size
+        )
+        self.job_applications = RelatedLoader(
+            Application.objects.order_by('-applied_date', '-id'), 'job', limit=page_size
+        )
+        self.manageable_job = ManageableJobLoader(user)
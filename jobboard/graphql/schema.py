@@ -0,0 +1,253 @@
+"""
+GraphQL schema over jobs, companies, categories, skills, applications and users.
+
+Visibility follows the REST endpoints: anyone sees active jobs, visible
+companies and the taxonomy; admins also see inactive jobs. Applications are
+visible to their applicant and to whoever may manage the job (poster,
+company managers, admins), and a user's email only to that user and admins.
+Relations resolve through the request's DataLoaders (see loaders).
+"""
+import graphene
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from graphene_django import DjangoObjectType
+from graphql import GraphQLError
+from applications.models import Application
+from applications.views import annotate_can_manage
+from categories.models import Category, Skill
+from companies.models import Company
+from jobs.filters import JobFilter
+from jobs.models import Job
+from users.models import User
+
+PERMISSION_DENIED = 'You do not have permission to perform this action.'
+
+
+def page_size(first):
+    return max(0, min(first, settings.GRAPHQL['MAX_PAGE_SIZE']))
+
+
+def viewer(info):
+    return info.context.user
+
+
+def is_admin(user):
+    return user.is_authenticated and user.is_admin_user()
+
+
+class UserType(DjangoObjectType):
+    email = graphene.String()
+
+    class Meta:
+        model = User
+        name = 'User'
+        fields = ('id', 'username', 'first_name', 'last_name', 'user_type', 'date_joined')
+        convert_choices_to_enum = False
+
+    @staticmethod
+    def resolve_email(parent, info):
+        user = viewer(info)
+        return parent.email if user.pk == parent.pk or is_admin(user) else None
+
+
+class CategoryType(DjangoObjectType):
+    class Meta:
+        model = Category
+        name = 'Category'
+        fields = ('id', 'name', 'description')
+
+
+class SkillType(DjangoObjectType):
+    class Meta:
+        model = Skill
+        name = 'Skill'
+        fields = ('id', 'name', 'description')
+
+
+class CompanyType(DjangoObjectType):
+    created_by = graphene.Field(UserType)
+    jobs = graphene.List(
+        graphene.NonNull(lambda: JobType), first=graphene.Int(default_value=20),
+        description='Active jobs, newest first'
+    )
+
+    class Meta:
+        model = Company
+        name = 'Company'
+        fields = ('id', 'name', 'description', 'location', 'website', 'logo', 'contact_email', 'created_at')
+
+    @staticmethod
+    async def resolve_created_by(parent, info):
+        return await info.context.loaders.user.load(parent.created_by_id)
+
+    @staticmethod
+    async def resolve_jobs(parent, info, first):
+        return (await info.context.loaders.company_jobs.load(parent.pk))[:page_size(first)]
+
+
+class ApplicationType(DjangoObjectType):
+    job = graphene.Field(lambda: JobType)
+    applicant = graphene.Field(UserType)
+
+    class Meta:
+        model = Application
+        name = 'Application'
+        fields = ('id', 'cover_letter', 'resume', 'status', 'notes', 'applied_date', 'updated_date')
+        convert_choices_to_enum = False
+
+    @staticmethod
+    async def resolve_job(parent, info):
+        return await info.context.loaders.job.load(parent.job_id)
+
+    @staticmethod
+    async def resolve_applicant(parent, info):
+        return await info.context.loaders.user.load(parent.applicant_id)
+
+
+class JobType(DjangoObjectType):
+    company = graphene.Field(CompanyType)
+    posted_by = graphene.Field(UserType)
+    categories = graphene.List(graphene.NonNull(CategoryType))
+    required_skills = graphene.List(graphene.NonNull(SkillType))
+    application_count = graphene.Int()
+    applications = graphene.List(
+        graphene.NonNull(ApplicationType), first=graphene.Int(default_value=20),
+        description='Newest first; for the job poster, company managers and admins'
+    )
+
+    class Meta:
+        model = Job
+        name = 'Job'
+        fields = (
+            'id', 'title', 'description', 'location', 'job_type', 'salary_range',
+            'is_active', 'expires_at', 'created_at', 'updated_at'
+        )
+        convert_choices_to_enum = False
+
+    @staticmethod
+    async def resolve_company(parent, info):
+        return await info.context.loaders.company.load(parent.company_id)
+
+    @staticmethod
+    async def resolve_posted_by(parent, info):
+        return await info.context.loaders.user.load(parent.posted_by_id)
+
+    @staticmethod
+    async def resolve_categories(parent, info):
+        return await info.context.loaders.job_categories.load(parent.pk)
+
+    @staticmethod
+    async def resolve_required_skills(parent, info):
+        return await info.context.loaders.job_skills.load(parent.pk)
+
+    @staticmethod
+    async def resolve_application_count(parent, info):
+        return await info.context.loaders.job_application_count.load(parent.pk)
+
+    @staticmethod
+    async def resolve_applications(parent, info, first):
+        if not await info.context.loaders.manageable_job.load(parent.pk):
+            raise GraphQLError(PERMISSION_DENIED)
+        return (await info.context.loaders.job_applications.load(parent.pk))[:page_size(first)]
+
+
+def visible_jobs(user):
+    return Job.objects.all() if is_admin(user) else Job.objects.filter(is_active=True)
+
+
+def visible_applications(user):
+    if not user.is_authenticated:
+        return Application.objects.none()
+    return annotate_can_manage(Application.objects.all(), user).filter(Q(applicant=user) | Q(can_manage=True))
+
+
+def search_jobs(user, first, offset, search=None, **filters):
+    queryset = visible_jobs(user).order_by('-created_at', '-id')
+    if search:
+        queryset = queryset.filter(
+            Q(title__icontains=search) | Q(description__icontains=search)
+            | Q(location__icontains=search) | Q(company__name__icontains=search)
+        )
+    data = {key: value for key, value in filters.items() if value not in (None, [])}
+    filterset = JobFilter(data, queryset=queryset)
+    if not filterset.is_valid():
+        raise GraphQLError(str(dict(filterset.errors)))
+    offset = max(offset, 0)
+    return list(filterset.qs[offset:offset + page_size(first)])
+
+
+class Query(graphene.ObjectType):
+    jobs = graphene.List(
+        graphene.NonNull(JobType),
+        first=graphene.Int(default_value=20), offset=graphene.Int(default_value=0),
+        search=graphene.String(), title=graphene.String(), location=graphene.String(),
+        company=graphene.String(description='Company name contains'), job_type=graphene.String(),
+        categories=graphene.List(graphene.NonNull(graphene.ID)), skills=graphene.List(graphene.NonNull(graphene.ID)),
+        description='Active jobs (all jobs for admins), newest first',
+    )
+    job = graphene.Field(JobType, id=graphene.ID(required=True))
+    companies = graphene.List(
+        graphene.NonNull(CompanyType),
+        first=graphene.Int(default_value=20), offset=graphene.Int(default_value=0), search=graphene.String(),
+    )
+    company = graphene.Field(CompanyType, id=graphene.ID(required=True))
+    categories = graphene.List(graphene.NonNull(CategoryType))
+    skills = graphene.List(graphene.NonNull(SkillType))
+    me = graphene.Field(UserType)
+    my_applications = graphene.List(
+        graphene.NonNull(ApplicationType),
+        first=graphene.Int(default_value=20), offset=graphene.Int(default_value=0),
+    )
+    application = graphene.Field(ApplicationType, id=graphene.ID(required=True))
+
+    @staticmethod
+    async def resolve_jobs(root, info, first, offset, job_type=None, **filters):
+        return await sync_to_async(search_jobs)(viewer(info), first, offset, job_type=job_type, **filters)
+
+    @staticmethod
+    async def resolve_job(root, info, id):
+        return await sync_to_async(visible_jobs(viewer(info)).filter(pk=id).first)()
+
+    @staticmethod
+    async def resolve_companies(root, info, first, offset, search=None):
+        queryset = Company.objects.order_by('-created_at', '-id')
+        if search:
+            queryset = queryset.filter(
+                Q(name__icontains=search) | Q(location__icontains=search) | Q(description__icontains=search)
+            )
+        offset = max(offset, 0)
+        return await sync_to_async(list)(queryset[offset:offset + page_size(first)])
+
+    @staticmethod
+    async def resolve_company(root, info, id):
+        return await info.context.loaders.company.load(int(id))
+
+    @staticmethod
+    async def resolve_categories(root, info):
+        return await sync_to_async(list)(Category.objects.order_by('name'))
+
+    @staticmethod
+    async def resolve_skills(root, info):
+        return await sync_to_async(list)(Skill.objects.order_by('name'))
+
+    @staticmethod
+    def resolve_me(root, info):
+        user = viewer(info)
+        return user if user.is_authenticated else None
+
+    @staticmethod
+    async def resolve_my_applications(root, info, first, offset):
+        user = viewer(info)
+        if not user.is_authenticated:
+            raise GraphQLError(PERMISSION_DENIED)
+        offset = max(offset, 0)
+        queryset = Application.objects.filter(applicant=user).order_by('-applied_date', '-id')
+        return await sync_to_async(list)(queryset[offset:offset + page_size(first)])
+
+    @staticmethod
+    async def resolve_application(root, info, id):
+        return await sync_to_async(visible_applications(viewer(info)).filter(pk=id).first)()
+
+
+schema = graphene.Schema(query=Query, auto_camelcase=True)
@@ -0,0 +1,113 @@
+import json
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from graphene.validation import depth_limit_validator
+from graphql import GraphQLError, execute, parse, specified_rules, validate
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
+from .limits import complexity_limit_validator
+from .loaders import Loaders
+from .schema import schema
+
+
+def validation_rules():
+    limits = settings.GRAPHQL
+    return [
+        *specified_rules,
+        depth_limit_validator(max_depth=limits['MAX_DEPTH']),
+        complexity_limit_validator(limits['MAX_COMPLEXITY'], limits['LIST_SIZE'], limits['MAX_PAGE_SIZE']),
+    ]
+
+
+async def _execute(request, document, variables, operation_name):
+    # DataLoaders bind to the running event loop, so they are created inside it
+    context = SimpleNamespace(
+        request=request, user=request.user,
+        loaders=Loaders(request.user, settings.GRAPHQL['MAX_PAGE_SIZE']),
+    )
+    result = execute(
+        schema.graphql_schema, document, context_value=context,
+        variable_values=variables, operation_name=operation_name,
+    )
+    if hasattr(result, '__await__'):
+        result = await result
+    return result
+
+
+def execute_query(request, query, variables=None, operation_name=None):
+    """Parse, validate (including the depth and complexity limits) and run ``query``; returns (data, errors)."""
+    try:
+        document = parse(query)
+    except GraphQLError as error:
+        return None, [error]
+    errors = validate(schema.graphql_schema, document, validation_rules())
+    if errors:
+        return None, errors
+    result = async_to_sync(_execute)(request, document, variables, operation_name)
+    return result.data, result.errors or []
+
+
+@extend_schema(
+    tags=['graphql'],
+    summary='GraphQL endpoint',
+    description=(
+        'GraphQL queries over jobs, companies, categories, skills, applications and users, '
+        'with the same visibility rules as the REST endpoints. Relations are batched per request, '
+        'so the number of SQL statements does not grow with the number of items returned. '
+        'Queries deeper or more expensive than the configured limits are rejected before they run.'
+    ),
+    parameters=[
+        OpenApiParameter(name='query', description='GraphQL document (GET)', required=False, type=str),
+    ],
+    request={
+        'application/json': {
+            'type': 'object',
+            'properties': {
+                'query': {'type': 'string'},
+                'variables': {'type': 'object', 'nullable': True},
+                'operationName': {'type': 'string', 'nullable': True},
+            },
+            'required': ['query'],
+        }
+    },
+    responses={
+        200: OpenApiExample(
+            'GraphQL Result Example',
+            value={'data': {'jobs': [{'id': '1', 'title': 'Backend Engineer', 'company': {'name': 'Acme'}}]}},
+        ),
+        400: OpenApiExample(
+            'Rejected Query Example',
+            value={'data': None, 'errors': [{'message': "'anonymous' exceeds maximum operation depth of 6."}]},
+        ),
+    },
+)
+class GraphQLView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return self.run(request, request.query_params)
+
+    def post(self, request):
+        return self.run(request, request.data)
+
+    def run(self, request, params):
+        query = params.get('query')
+        if not query or not isinstance(query, str):
+            return Response({'error': 'A GraphQL query is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        variables = params.get('variables') or None
+        if isinstance(variables, str):
+            try:
+                variables = json.loads(variables)
+            except ValueError:
+                variables = ''
+        if variables is not None and not isinstance(variables, dict):
+            return Response({'error': 'variables must be an object.'}, status=status.HTTP_400_BAD_REQUEST)
+        data, errors = execute_query(request, query, variables, params.get('operationName') or None)
+        body = {'data': data}
+        if errors:
+            body['errors'] = [error.formatted for error in errors]
+        return Response(body, status=status.HTTP_400_BAD_REQUEST if data is None and errors else status.HTTP_200_OK)
@@ -0,0 +1,173 @@
+import logging
+import time
+from collections import Counter as TallyCounter
+from contextvars import ContextVar
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from prometheus_client import Counter, Histogram
+from .sqlstats import fingerprint, get_sql_stats
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUESTS = Counter(
+    'jobboard_http_requests', 'HTTP requests by view, method and status', ['view', 'method', 'status']
+)
+REQUEST_LATENCY = Histogram(
+    'jobboard_http_request_duration_seconds', 'Time spent producing the response', ['view', 'method'],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    'jobboard_http_request_db_queries', 'Database queries executed per request', ['view'],
+    buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    'jobboard_http_request_db_duration_seconds', 'Database time per request', ['view'],
+    buckets=LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    'jobboard_http_response_size_bytes', 'Response body size', ['view'], buckets=SIZE_BUCKETS
+)
+QUEUE_TIME = Histogram(
+    'jobboard_http_request_queue_seconds', 'Time between the proxy accepting a request and Django starting it',
+    buckets=LATENCY_BUCKETS
+)
+DB_QUERIES = Counter('jobboard_db_queries', 'Database queries executed', ['alias'])
+DB_QUERY_TIME = Histogram(
+    'jobboard_db_query_duration_seconds', 'Database query execution time', ['alias'], buckets=LATENCY_BUCKETS
+)
+
+
+N_PLUS_ONE_MODES = ('off', 'log', 'header', 'raise')
+
+
+class NPlusOneDetected(Exception):
+    """Raised in ``raise`` mode when one SELECT template repeats too often in a request."""
+
+
+class RequestStats:
+    """Per-request database counters, filled in by the connection execute wrapper."""
+    __slots__ = ('request', 'queries', 'db_seconds', 'templates')
+
+    def __init__(self, request=None):
+        self.request = request
+        self.queries = 0
+        self.db_seconds = 0.0
+        # Executions per normalized SELECT, for N+1 detection
+        self.templates = TallyCounter()
+
+    def repeated_templates(self, threshold):
+        """``[(normalized_sql, count)]`` for SELECT templates run at least ``threshold`` times."""
+        return [(sql, count) for sql, count in self.templates.most_common() if count >= threshold]
+
+
+# Context variables follow the request across threads (WSGI) and tasks (ASGI),
+# including sync_to_async hops, unlike thread-locals
+current_request_stats = ContextVar('current_request_stats', default=None)
+
+
+def query_instrumentation(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook timing every query; works with DEBUG off."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        alias = context['connection'].alias
+        DB_QUERIES.labels(alias).inc()
+        DB_QUERY_TIME.labels(alias).observe(elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            track_template(stats, sql)
+        collector = get_sql_stats()
+        if collector.enabled:
+            cursor = context.get('cursor')
+            collector.record(
+                sql, None if many else params, elapsed,
+                rows=getattr(cursor, 'rowcount', None),
+                alias=alias,
+                view=view_label(stats.request) if stats is not None and stats.request is not None else 'background',
+            )
+        if getattr(settings, 'LOG_SQL_QUERIES', False):
+            logger.debug(f"SQL: {sql} ({elapsed:.4f}s)")
+
+
+def track_template(stats, sql):
+    detector = settings.N_PLUS_ONE
+    if detector['MODE'] == 'off' or not sql.lstrip()[:6].upper() == 'SELECT':
+        return
+    normalized = fingerprint(sql)[1]
+    stats.templates[normalized] += 1
+    if detector['MODE'] == 'raise' and stats.templates[normalized] == detector['THRESHOLD']:
+        raise NPlusOneDetected(
+            f"{detector['THRESHOLD']} executions of one query in {view_label(stats.request)}: {normalized}"
+        )
+
+
+def report_n_plus_one(request, response, stats):
+    """Log or expose (``X-N-Plus-One: <count>x<fingerprint>, ...``) repeated templates."""
+    detector = settings.N_PLUS_ONE
+    if detector['MODE'] not in ('log', 'header'):
+        return
+    repeated = stats.repeated_templates(detector['THRESHOLD'])
+    if not repeated:
+        return
+    if detector['MODE'] == 'header':
+        response['X-N-Plus-One'] = ', '.join(f'{count}x{fingerprint(sql)[0]}' for sql, count in repeated)
+    else:
+        for sql, count in repeated:
+            logger.warning(f"N+1 QUERY: {request.method} {request.path} ran {count}x: {sql}")
+
+
+def install_instrumentation(connection):
+    # Wrappers persist on the DatabaseWrapper across reconnects; add ours once
+    if query_instrumentation not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_instrumentation)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    install_instrumentation(connection)
+
+
+def parse_request_start(value, now=None):
+    """
+    Seconds spent queued upstream, from an ``X-Request-Start`` header such as
+    ``t=1700000000.123`` (seconds), milliseconds or nginx-style microseconds.
+    """
+    if not value:
+        return None
+    try:
+        started = float(value.strip().removeprefix('t='))
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    queued = (now or time.time()) - started
+    return queued if queued >= 0 else 0.0
+
+
+def view_label(request):
+    """A bounded-cardinality label: the URL name (or view path), never the raw path."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match._func_path
+
+
+def observe_request(request, response, stats, duration):
+    view = view_label(request)
+    REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+    REQUEST_LATENCY.labels(view, request.method).observe(duration)
+    REQUEST_QUERIES.labels(view).observe(stats.queries)
+    REQUEST_DB_TIME.labels(view).observe(stats.db_seconds)
+    if not getattr(response, 'streaming', False):
+        RESPONSE_SIZE.labels(view).observe(len(response.content))
@@ -1,45 +1,150 @@
 import time
 import logging
-from django.db import connection
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.db import connections
 from django.conf import settings
+from .instrumentation import (
+    QUEUE_TIME, RequestStats, current_request_stats, install_instrumentation, observe_request, parse_request_start,
+    report_n_plus_one,
+)
+from .routers import RouteState, current_route, user_pin_key
 
 logger = logging.getLogger(__name__)
 
-class QueryPerformanceMiddleware:
+class RequestMetricsMiddleware:
+    """
+    Records per-view latency, query count, DB time, response size and upstream
+    queue time for every API request, in production as well as DEBUG. Queries
+    are counted by a ``connection.execute_wrapper`` rather than
+    ``connection.queries``. Works under both WSGI and ASGI.
+
+    SELECT templates repeated ``N_PLUS_ONE['THRESHOLD']`` times in one request
+    are logged, reported in an ``X-N-Plus-One`` header or raised, depending on
+    ``N_PLUS_ONE['MODE']``.
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        # Connections opened before this middleware loaded miss connection_created
+        for connection in connections.all(initialized_only=True):
+            install_instrumentation(connection)
 
     def __call__(self, request):
-        # Only monitor API calls
-        if not request.path.startswith('/api/') or not settings.DEBUG:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith('/api/'):
             return self.get_response(request)
-            
-        # Reset query count and start timer
-        start_time = time.time()
-        initial_queries = len(connection.queries)
-        
-        response = self.get_response(request)
-        
-        # Calculate performance metrics
-        duration = time.time() - start_time
-        query_count = len(connection.queries) - initial_queries
-        
+        stats, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        if not request.path.startswith('/api/'):
+            return await self.get_response(request)
+        stats, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    def start(self, request):
+        queued = parse_request_start(request.META.get('HTTP_X_REQUEST_START'))
+        if queued is not None:
+            QUEUE_TIME.observe(queued)
+        stats = RequestStats(request)
+        return stats, current_request_stats.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, started):
+        duration = time.perf_counter() - started
+        observe_request(request, response, stats, duration)
+        report_n_plus_one(request, response, stats)
+
         # Log slow requests
         if duration > getattr(settings, "SLOW_QUERY_WARNING", 1.0):  
             logger.warning(
                 f"SLOW REQUEST: {request.method} {request.path} - "
-                f"{duration:.2f}s, {query_count} queries"
+                f"{duration:.2f}s, {stats.queries} queries ({stats.db_seconds:.2f}s in DB)"
             )
         elif duration > getattr(settings, "SLOW_QUERY_INFO", 0.5):  
             logger.info(
                 f"Request: {request.method} {request.path} - "
-                f"{duration:.3f}s, {query_count} queries"
+                f"{duration:.3f}s, {stats.queries} queries ({stats.db_seconds:.3f}s in DB)"
             )
 
-        # log queries for debugging
-        if getattr(settings, "LOG_SQL_QUERIES", False):
-            for q in connection.queries[-query_count:]:
-                logger.debug(f"SQL: {q['sql']} ({q['time']}s)")           
 
+class ReplicaRoutingMiddleware:
+    """
+    Lets ReplicaRouter serve reads of safe-method requests from a replica.
+
+    A request that writes pins its client to the primary for
+    ``REPLICA_PIN_SECONDS``, through a cookie and, for token clients that
+    keep no cookies, a cache entry keyed by user, so a just-posted job or
+    application is visible on the very next read.
+    """
+    sync_capable = True
+    async_capable = True
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_route.reset(token)
+        self.finish(request, response, state)
         return response
 
+    async def __acall__(self, request):
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_route.reset(token)
+        self.finish(request, response, state)
+        return response
+
+    def start(self, request):
+        use_replica = (
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in self.safe_methods
+            and not self.pinned_by_cookie(request)
+        )
+        state = RouteState(request, use_replica)
+        return state, current_route.set(state)
+
+    @staticmethod
+    def pinned_by_cookie(request):
+        try:
+            return float(request.COOKIES.get(settings.REPLICA_PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def finish(self, request, response, state):
+        if not state.wrote or not settings.DATABASE_REPLICAS:
+            return
+        pin_seconds = settings.REPLICA_PIN_SECONDS
+        response.set_cookie(
+            settings.REPLICA_PIN_COOKIE, str(int(time.time() + pin_seconds) + 1),
+            max_age=pin_seconds, httponly=True, samesite='Lax', secure=request.is_secure()
+        )
+        user = state.request_user()
+        if user is not None:
+            cache.set(user_pin_key(user.pk), True, pin_seconds)
@@ -0,0 +1,334 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import cmp_to_key
+from collections import defaultdict
+from django.db.models import Q, Value
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .counts import estimated_count
+
+def merge_querysets(querysets, offset=0, limit=None):
+    """
+    Rows of querysets over tables sharing an id space and ordering fields (a
+    live table and its archive twin), merged in the first queryset's ordering.
+    One UNION of the ordering keys is sorted and sliced in the database, then
+    the picked rows are loaded from their own queryset, keeping its
+    select_related/prefetch_related and annotations.
+    """
+    ordering = list(querysets[0].query.order_by or querysets[0].model._meta.ordering)
+    if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+        ordering.append('-id')
+    names = [field.lstrip('-') for field in ordering]
+    keys = [
+        queryset.prefetch_related(None).order_by().annotate(merge_source=Value(index)).values_list('pk', 'merge_source', *names)
+        for index, queryset in enumerate(querysets)
+    ]
+    merged = keys[0].union(*keys[1:], all=True).order_by(*ordering)
+    picked = list(merged[offset:offset + limit] if limit is not None else merged[offset:])
+
+    wanted = defaultdict(list)
+    for pk, source, *_ in picked:
+        wanted[source].append(pk)
+    loaded = {
+        (source, row.pk): row
+        for source, pks in wanted.items()
+        for row in querysets[source].filter(pk__in=pks)
+    }
+    return [loaded[source, pk] for pk, source, *_ in picked if (source, pk) in loaded]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset (seek) pagination over a compound ordering.
+
+    Unlike DRF's CursorPagination, every ordering field takes part in the seek
+    predicate, so ties on the leading field (e.g. a similarity rank or a
+    timestamp) never fall back to OFFSET. The last ordering field must be
+    unique. Views can override the ordering with a ``keyset_ordering``
+    attribute; fields may be model fields or annotations.
+
+    Views whose rows may have moved to an archive table define
+    ``get_archive_queryset()`` (already filtered, same field names and id
+    space): both are seeked with the same cursor and merged into one stream.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.page_size = self.get_page_size(request)
+
+        querysets = [queryset]
+        if hasattr(view, 'get_archive_queryset'):
+            querysets.append(view.get_archive_queryset())
+        position = self.decode_cursor(request)
+
+        rows = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(self.seek_filter(position))
+            # Fetch one extra row to know whether another page exists
+            rows.extend(queryset[:self.page_size + 1])
+        if len(querysets) > 1:
+            rows.sort(key=cmp_to_key(self.compare))
+            rows = rows[:self.page_size + 1]
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self.position_for(rows[-1]) if self.has_next else None
+        return rows
+
+    def seek_filter(self, position):
+        """Build ``(a, b, c) > (x, y, z)`` honouring each field's direction."""
+        condition = Q()
+        equal_prefix = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal_prefix, **{f'{name}__{lookup}': value})
+            equal_prefix[name] = value
+        return condition
+
+    def position_for(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if hasattr(value, 'pk'):
+                value = value.pk
+            values.append(value)
+        return values
+
+    def compare(self, first, second):
+        """Order two rows as the ordering would in SQL."""
+        for field, left, right in zip(self.ordering, self.position_for(first), self.position_for(second)):
+            if left != right:
+                result = -1 if left < right else 1
+                return -result if field.startswith('-') else result
+        return 0
+
+    def encode_cursor(self, position):
+        def default(value):
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return str(value)
+            raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+        raw = json.dumps(position, default=default)
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        # Timestamps travel as ISO strings; restore them for the comparison
+        return [self._restore(value) for value in position]
+
+    def _restore(self, value):
+        if not isinstance(value, str):
+            return value
+        try:
+            return parse_datetime(value) or value
+        except ValueError:
+            return value
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor returned in the previous page\'s "next" link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Number of results per page (max {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class EstimatedCountPagination(BasePagination):
+    """
+    Opt-in page-number pagination whose total avoids an exact ``COUNT(*)``
+    over large results (see jobboard.counts.estimated_count).
+
+    Lists stay unpaginated unless the request carries ``page`` or
+    ``page_size``. ``count_approximate`` flags an estimated ``count``;
+    ``count=false`` skips counting altogether (``count`` is then null) and
+    ``next`` is found by fetching one extra row.
+
+    Like KeysetPagination, views whose rows may have moved to an archive table
+    can define ``get_archive_queryset()`` (already filtered, or None to leave
+    it out): both are counted and paged as one list (see merge_querysets).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    page_query_param = 'page'
+    count_query_param = 'count'
+    invalid_page_message = 'Invalid page.'
+
+    def get_page_size(self, request):
+        params = request.query_params
+        if self.page_query_param not in params and self.page_size_query_param not in params:
+            return None
+        try:
+            size = int(params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_page_number(self, request):
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message)
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+        return number
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if page_size is None:
+            return None
+        self.request = request
+        self.page_size = page_size
+        self.page_number = self.get_page_number(request)
+        archive = view.get_archive_queryset() if hasattr(view, 'get_archive_queryset') else None
+        self.count = self.approximate = None
+        if request.query_params.get(self.count_query_param, '').lower() not in ('0', 'false', 'no'):
+            self.count, self.approximate = estimated_count(queryset)
+            if archive is not None:
+                archived, approximate = estimated_count(archive)
+                self.count += archived
+                self.approximate = self.approximate or approximate
+
+        offset = (self.page_number - 1) * page_size
+        # Fetch one extra row to know whether another page exists
+        if archive is None:
+            rows = list(queryset[offset:offset + page_size + 1])
+        else:
+            rows = merge_querysets([queryset, archive], offset, page_size + 1)
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_approximate': self.approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        # Without page/page_size the plain list is returned
+        return {
+            'oneOf': [
+                schema,
+                {
+                    'type': 'object',
+                    'required': ['results'],
+                    'properties': {
+                        'count': {'type': 'integer', 'nullable': True},
+                        'count_approximate': {'type': 'boolean', 'nullable': True},
+                        'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                        'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                        'results': schema,
+                    },
+                },
+            ],
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.page_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Page number; paginates the list when given',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Number of results per page (max {self.max_page_size}); paginates the list when given',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to false to skip counting results',
+                'schema': {'type': 'boolean'},
+            },
+        ]
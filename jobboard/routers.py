@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
+
+# PostgreSQL replay lag in seconds; 0 when fully caught up (an idle primary
+# leaves the last replay timestamp old without any real lag) or not a standby
+REPLICA_LAG_SQL = (
+    'SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() '
+    'THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+
+def user_pin_key(user_id):
+    return f'db-pin:user:{user_id}'
+
+
+class RouteState:
+    """
+    Routing decision for one request, set by ReplicaRoutingMiddleware.
+    Safe-method requests read from a replica unless the client is pinned to
+    the primary; any write during the request sends later reads to the primary.
+    """
+    __slots__ = ('request', 'use_replica', 'replica', 'wrote', 'user_checked')
+
+    def __init__(self, request, use_replica):
+        self.request = request
+        self.use_replica = use_replica
+        self.replica = None
+        self.wrote = False
+        self.user_checked = False
+
+    def request_user(self):
+        # Never evaluate a lazy user here: that would query (and route) re-entrantly
+        user = vars(self.request).get('user')
+        if isinstance(user, LazyObject):
+            user = None if user._wrapped is empty else user._wrapped
+        return user if getattr(user, 'is_authenticated', False) else None
+
+    def pinned_by_user(self):
+        """JWT clients rarely keep cookies; writers are also pinned by user id in the shared cache."""
+        if self.user_checked:
+            return False
+        user = self.request_user()
+        if user is None:
+            return False
+        self.user_checked = True
+        return bool(cache.get(user_pin_key(user.pk)))
+
+
+current_route = ContextVar('current_db_route', default=None)
+
+
+class ReplicaSelector:
+    """
+    Picks a replica whose measured lag is within ``REPLICA_MAX_LAG_SECONDS``.
+    Lag is probed at most every ``REPLICA_LAG_CHECK_INTERVAL`` seconds per
+    replica and process; a replica that fails the probe counts as unavailable
+    until the next check. Returns None (use the primary) when none qualify.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lag = {}
+
+    def measure_lag(self, alias):
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+
+    def lag(self, alias):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._lag.get(alias)
+        if checked is not None and now - checked[0] < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return checked[1]
+        try:
+            lag = self.measure_lag(alias)
+        except DatabaseError:
+            lag = None
+        with self._lock:
+            self._lag[alias] = (now, lag)
+        return lag
+
+    def choose(self):
+        candidates = []
+        for alias in settings.DATABASE_REPLICAS:
+            lag = self.lag(alias)
+            if lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS:
+                candidates.append(alias)
+        return random.choice(candidates) if candidates else None
+
+    def reset(self):
+        with self._lock:
+            self._lag.clear()
+
+
+replica_selector = ReplicaSelector()
+
+@receiver(setting_changed)
+def reset_replica_selector(*, setting, **kwargs):
+    if setting in ('DATABASE_REPLICAS', 'REPLICA_MAX_LAG_SECONDS', 'REPLICA_LAG_CHECK_INTERVAL'):
+        replica_selector.reset()
+
+
+class ReplicaRouter:
+    """
+    Sends reads of safe-method requests to a replica (see RouteState) and
+    everything else to the primary. Outside requests (tasks, commands,
+    migrations) the router has no opinion, so the default database is used.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_route.get()
+        if state is None or not state.use_replica:
+            return None
+        if state.wrote or connections[DEFAULT_DB_ALIAS].in_atomic_block or state.pinned_by_user():
+            # Read-your-writes: this request (or this client, recently) wrote to the primary
+            state.use_replica = False
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            # One replica per request keeps its reads mutually consistent
+            state.replica = replica_selector.choose() or DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_route.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
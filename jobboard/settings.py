@@ -11,7 +11,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
+from celery.schedules import crontab
+from django.core.exceptions import ImproperlyConfigured
 import os
 import sys
 from datetime import timedelta
@@ -48,11 +50,15 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'phonenumber_field',
     'corsheaders',
+    'django_celery_beat',
+    'django_celery_results',
     'users',
     'companies',
     'jobs',
     'applications',
     'categories',
+    'analytics',
+    'alerts',
 ]
 
 MIDDLEWARE = [
@@ -63,7 +69,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'jobboard.middleware.QueryPerformanceMiddleware',
+    'jobboard.middleware.RequestMetricsMiddleware',
+    'jobboard.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'jobboard.urls'
@@ -99,19 +106,60 @@ DATABASES = {
 
 # Check if we're running tests
 IS_TESTING = 'test' in sys.argv
+# Run the tests against PostgreSQL (DB_* settings) instead of SQLite, for the
+# PostgreSQL-only code paths such as application partitioning
+TEST_ON_POSTGRESQL = IS_TESTING and config('TEST_ON_POSTGRESQL', default=False, cast=bool)
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-if IS_TESTING:
+if TEST_ON_POSTGRESQL:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='jobboard'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+        }
+    }
+elif IS_TESTING:
     # Use SQLite only when running tests
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'test_db.sqlite3',
+            # Writers from concurrent request threads wait for the lock instead of failing
+            'OPTIONS': {'timeout': 20, 'transaction_mode': 'IMMEDIATE'},
+            # A file-backed test database gives each thread its own connection
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 else:
-    # Use PostgreSQL in production
+    # Use PostgreSQL in production, through a psycopg 3 connection pool per
+    # process. Connections are checked before being handed out (and re-opened
+    # if broken). Without the pool, persistent connections are used, except
+    # under ASGI where each request may run on another thread and would leak them.
+    DB_POOL_ENABLED = config('DB_POOL_ENABLED', default=True, cast=bool)
+    RUNNING_ASGI = config('JOBBOARD_ASGI', default=False, cast=bool)
+    # Behind PgBouncer in transaction mode a session may change server between
+    # transactions: named cursors and prepared statements cannot be relied on
+    DB_PGBOUNCER_TRANSACTION_MODE = config('DB_PGBOUNCER_TRANSACTION_MODE', default=False, cast=bool)
+
+    database_options = {}
+    if DB_POOL_ENABLED:
+        database_options['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            # Seconds a request waits for a free connection before failing
+            'timeout': config('DB_POOL_TIMEOUT', default=10.0, cast=float),
+            'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800.0, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=300.0, cast=float),
+        }
+    if DB_PGBOUNCER_TRANSACTION_MODE:
+        database_options['prepare_threshold'] = None
+        database_options['server_side_binding'] = False
+
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.postgresql',
@@ -120,8 +168,60 @@ else:
             'PASSWORD': config('DB_PASSWORD'),
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='5432'),
+            # Pooled connections are returned to the pool at the end of each request
+            'CONN_MAX_AGE': 0 if DB_POOL_ENABLED or RUNNING_ASGI else config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER_TRANSACTION_MODE,
+            'OPTIONS': database_options,
+        }
+    }
+
+# Read replicas: each host in DB_REPLICA_HOSTS becomes a 'replica_<n>' alias
+# with the primary's credentials. ReplicaRouter sends reads of GET/HEAD/OPTIONS
+# requests there; clients are pinned to the primary for a few seconds after
+# they write (read-your-writes), and replicas lagging too far are skipped.
+DATABASE_REPLICAS = []
+if not IS_TESTING:
+    for index, host in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv())):
+        alias = f'replica_{index}'
+        # Pool and PgBouncer options carry over; each alias gets its own pool
+        DATABASES[alias] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+        DATABASE_REPLICAS.append(alias)
+elif TEST_ON_POSTGRESQL:
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+else:
+    # Stand-in replica for the routing tests; tests enable it with override_settings
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / 'test_replica.sqlite3',
+        'TEST': {'NAME': BASE_DIR / 'test_replica.sqlite3'},
+    }
+DATABASE_ROUTERS = ['jobboard.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+REPLICA_PIN_COOKIE = 'db_pin'
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=2.0, cast=float)
+REPLICA_LAG_CHECK_INTERVAL = config('REPLICA_LAG_CHECK_INTERVAL', default=5, cast=int)
+
+# Cache
+# Task locks (run_once, single_flight), per-user replica pins and cached
+# dashboards must be shared by every web and worker process, so production
+# points CACHE_URL at Redis. Without it (development, tests) each process
+# falls back to its own in-memory cache, which only excludes within itself.
+CACHE_URL = '' if IS_TESTING else config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': CACHE_URL,
+            'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
         }
     }
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+# Token clients are pinned to the primary by user id in the cache: a pin set by
+# one process must be seen by the others, or reads after a write hit a replica
+if DATABASE_REPLICAS and not CACHE_URL:
+    raise ImproperlyConfigured('DB_REPLICA_HOSTS requires CACHE_URL, where writers are pinned to the primary.')
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -142,6 +242,26 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# The configurable PBKDF2 hasher reads its work factor from settings; hashes
+# stored with another iteration count are upgraded on the next login.
+PASSWORD_HASHERS = [
+    'users.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_HASHER_ITERATIONS = config('PASSWORD_HASHER_ITERATIONS', default=1_000_000, cast=int)
+
+# Bounded worker pool used by the async login/registration views
+PASSWORD_HASHING_POOL = {
+    'MAX_WORKERS': config('PASSWORD_HASHING_WORKERS', default=os.cpu_count() or 2, cast=int),
+    'MAX_PENDING': config('PASSWORD_HASHING_MAX_PENDING', default=32, cast=int),
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -176,8 +296,158 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Opt-in: lists are paginated only when a page or page_size is requested
+    'DEFAULT_PAGINATION_CLASS': 'jobboard.pagination.EstimatedCountPagination',
 }
 
+# Admin user directory search
+USER_SEARCH_MIN_LENGTH = 3
+
+# Celery
+# The in-memory broker needs no Redis or RabbitMQ; it only reaches workers in the
+# same process, so tasks run eagerly unless a real broker is configured.
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='memory://')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='django-db')
+CELERY_TASK_ALWAYS_EAGER = IS_TESTING or config(
+    'CELERY_TASK_ALWAYS_EAGER', default=CELERY_BROKER_URL.startswith('memory://'), cast=bool
+)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'applications.tasks.*': {'queue': 'notifications'},
+    'alerts.tasks.*': {'queue': 'notifications'},
+    'companies.tasks.*': {'queue': 'maintenance'},
+    'jobs.tasks.*': {'queue': 'maintenance'},
+    'analytics.tasks.*': {'queue': 'maintenance'},
+    'users.tasks.*': {'queue': 'maintenance'},
+    'applications.tasks.maintain_application_partitions': {'queue': 'maintenance'},
+}
+CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-platform-counters': {
+        'task': 'analytics.tasks.reconcile_counters',
+        'schedule': crontab(hour=3, minute=15),
+    },
+    'expire-jobs': {
+        'task': 'jobs.tasks.expire_jobs',
+        'schedule': crontab(minute='*/15'),
+    },
+    'archive-jobs': {
+        'task': 'jobs.tasks.archive_jobs',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    'maintain-application-partitions': {
+        'task': 'applications.tasks.maintain_application_partitions',
+        'schedule': crontab(hour=2, minute=30),
+    },
+    'resume-deletions': {
+        'task': 'users.tasks.resume_deletions',
+        'schedule': crontab(minute=45),
+    },
+    'send-saved-search-digests': {
+        'task': 'alerts.tasks.send_saved_search_digests',
+        'schedule': crontab(minute=0),
+    },
+}
+CELERY_TIMEZONE = TIME_ZONE
+
+# How long run_once() remembers a completed side effect (seconds)
+TASK_IDEMPOTENCY_TTL = 7 * 24 * 3600
+
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='no-reply@jobboard.local')
+
+# New postings expire after this many days unless the employer sets expires_at (0 disables)
+JOB_DEFAULT_LIFETIME_DAYS = config('JOB_DEFAULT_LIFETIME_DAYS', default=60, cast=int)
+# Postings deactivated per UPDATE by the expiry sweep
+JOB_EXPIRY_BATCH_SIZE = 1000
+# Jobs inactive (unchanged) for this many days move with their applications to
+# the archive tables (0 disables); batches bound the rows moved per transaction
+JOB_ARCHIVE_AFTER_DAYS = config('JOB_ARCHIVE_AFTER_DAYS', default=180, cast=int)
+JOB_ARCHIVE_BATCH_SIZE = 100
+JOB_ARCHIVE_APPLICATION_BATCH_SIZE = 1000
+
+# Paginated counts stay exact up to this many rows; larger results use
+# PostgreSQL's row estimates (jobboard.counts)
+COUNT_ESTIMATE_THRESHOLD = config('COUNT_ESTIMATE_THRESHOLD', default=10000, cast=int)
+
+# GraphQL (/api/graphql/): queries nested deeper than MAX_DEPTH or estimated
+# above MAX_COMPLEXITY resolved fields (jobboard.graphql.limits) are rejected
+# before they run. Lists take at most MAX_PAGE_SIZE items; lists without
+# `first` are estimated at LIST_SIZE items.
+GRAPHQL = {
+    'MAX_DEPTH': config('GRAPHQL_MAX_DEPTH', default=6, cast=int),
+    'MAX_COMPLEXITY': config('GRAPHQL_MAX_COMPLEXITY', default=10000, cast=int),
+    'MAX_PAGE_SIZE': 100,
+    'LIST_SIZE': 10,
+}
+
+# /api/batch/: requests per batch, and seconds after which the requests not
+# yet started are answered with 504
+BATCH_REQUESTS = {
+    'MAX_REQUESTS': config('BATCH_MAX_REQUESTS', default=20, cast=int),
+    'TIMEOUT': config('BATCH_TIMEOUT', default=10.0, cast=float),
+}
+
+# Saved-search alerts (alerts.percolator): new and reactivated jobs are matched
+# MATCH_BATCH_SIZE per task; hourly digests go out DIGEST_BATCH_SIZE users at a
+# time and list at most DIGEST_MAX_JOBS jobs each
+SAVED_SEARCH_ALERTS = {
+    'MAX_SEARCHES_PER_USER': config('SAVED_SEARCH_MAX_PER_USER', default=20, cast=int),
+    'MATCH_BATCH_SIZE': 100,
+    'DIGEST_BATCH_SIZE': 500,
+    'DIGEST_MAX_JOBS': 20,
+}
+
+# Deleted companies and users are hidden at once and purged in the background
+# (users.purge): applications per transaction, jobs per batch. Purges without
+# progress for DELETION_STALL_AFTER seconds are requeued.
+DELETION_BATCH_SIZE = 1000
+DELETION_JOB_BATCH_SIZE = 100
+DELETION_STALL_AFTER = 3600
+
+# Monthly partitions of applications by applied_date (PostgreSQL, once converted
+# with `manage.py partition_applications convert`). Partitions are created
+# MONTHS_AHEAD months ahead; those older than RETAIN_MONTHS are detached
+# (0 keeps everything) and kept as archive tables unless DROP_DETACHED.
+APPLICATION_PARTITIONS = {
+    'MONTHS_AHEAD': config('APPLICATION_PARTITION_MONTHS_AHEAD', default=3, cast=int),
+    'RETAIN_MONTHS': config('APPLICATION_PARTITION_RETAIN_MONTHS', default=0, cast=int),
+    'DROP_DETACHED': config('APPLICATION_PARTITION_DROP_DETACHED', default=False, cast=bool),
+}
+
+# Prometheus scrape endpoint (/metrics): bearer token if set, otherwise these client IPs only
+METRICS_AUTH_TOKEN = config('METRICS_AUTH_TOKEN', default='')
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=lambda v: [ip.strip() for ip in v.split(',') if ip.strip()])
+
+# Repeated identical SELECTs within one request (N+1 queries): 'off', 'log',
+# 'header' (X-N-Plus-One response header) or 'raise' (NPlusOneDetected)
+N_PLUS_ONE = {
+    'MODE': config('N_PLUS_ONE_MODE', default='raise' if IS_TESTING else 'log'),
+    'THRESHOLD': config('N_PLUS_ONE_THRESHOLD', default=5, cast=int),
+}
+
+# Per-process SQL fingerprint statistics (see jobboard/sqlstats.py), served at
+# /api/analytics/admin/sql-stats/. Plans of SELECTs slower than the threshold
+# are captured with EXPLAIN (ANALYZE, BUFFERS) on a background thread.
+SQL_STATS = {
+    'ENABLED': config('SQL_STATS_ENABLED', default=True, cast=bool),
+    'MAX_FINGERPRINTS': config('SQL_STATS_MAX_FINGERPRINTS', default=500, cast=int),
+    'MAX_VIEWS_PER_FINGERPRINT': config('SQL_STATS_MAX_VIEWS_PER_FINGERPRINT', default=20, cast=int),
+    'SAMPLES_PER_FINGERPRINT': config('SQL_STATS_SAMPLES_PER_FINGERPRINT', default=256, cast=int),
+    'SAMPLES_PER_VIEW': config('SQL_STATS_SAMPLES_PER_VIEW', default=32, cast=int),
+    'EXPLAIN_THRESHOLD_MS': config('SQL_STATS_EXPLAIN_THRESHOLD_MS', default=500, cast=float),
+    'EXPLAIN_BUFFER_SIZE': config('SQL_STATS_EXPLAIN_BUFFER_SIZE', default=50, cast=int),
+    'EXPLAIN_COOLDOWN_SECONDS': config('SQL_STATS_EXPLAIN_COOLDOWN_SECONDS', default=300, cast=int),
+    'EXPLAIN_MAX_PENDING': config('SQL_STATS_EXPLAIN_MAX_PENDING', default=4, cast=int),
+}
+
+# Seconds a company dashboard stays cached; writes invalidate it earlier
+COMPANY_DASHBOARD_CACHE_TIMEOUT = config('COMPANY_DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -218,6 +488,7 @@ SPECTACULAR_SETTINGS = {
         {'name': 'jobs', 'description': 'Job posting and search endpoints'},
         {'name': 'applications', 'description': 'Job application endpoints'},
         {'name': 'categories', 'description': 'Category and skill management'},
+        {'name': 'analytics', 'description': 'Platform statistics from pre-aggregated rollups'},
     ],
 }
 
@@ -0,0 +1,259 @@
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import lru_cache
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.utils import timezone
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_FINGERPRINTS': 500,
+    'MAX_VIEWS_PER_FINGERPRINT': 20,
+    'SAMPLES_PER_FINGERPRINT': 256,
+    'SAMPLES_PER_VIEW': 32,
+    'EXPLAIN_THRESHOLD_MS': 500,
+    'EXPLAIN_BUFFER_SIZE': 50,
+    'EXPLAIN_COOLDOWN_SECONDS': 300,
+    'EXPLAIN_MAX_PENDING': 4,
+}
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'(?<![\w."])-?\b\d+(?:\.\d+)?\b')
+_PLACEHOLDERS = re.compile(r'%s|\?|%\(\w+\)s')
+_IN_LISTS = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.I)
+_VALUES_LISTS = re.compile(r'(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+_SPACES = re.compile(r'\s+')
+
+# Set in the EXPLAIN worker so its own queries are not recorded (or explained) again
+_suppressed = ContextVar('sql_stats_suppressed', default=False)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """
+    Normalize ``sql`` so statements differing only in literals, placeholder
+    counts or whitespace share one fingerprint. Returns ``(id, normalized)``.
+    """
+    normalized = _COMMENTS.sub(' ', sql)
+    normalized = _STRINGS.sub('?', normalized)
+    normalized = _PLACEHOLDERS.sub('?', normalized)
+    normalized = _NUMBERS.sub('?', normalized)
+    normalized = _IN_LISTS.sub('IN (...)', normalized)
+    normalized = _VALUES_LISTS.sub(r'\1, ...', normalized)
+    normalized = _SPACES.sub(' ', normalized).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16], normalized
+
+
+class Timings:
+    """Calls, time, rows and a fixed-size reservoir of timings (for p95) of one statement, or of one view's share."""
+    __slots__ = ('calls', 'total_time', 'max_time', 'rows', 'samples')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.samples = []
+
+    def add(self, duration, rows, sample_size):
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        if rows is not None and rows >= 0:
+            self.rows += rows
+        # Reservoir sampling keeps an unbiased fixed-size sample for percentiles
+        if len(self.samples) < sample_size:
+            self.samples.append(duration)
+        else:
+            slot = random.randrange(self.calls)
+            if slot < len(self.samples):
+                self.samples[slot] = duration
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total_time * 1000, 3),
+            'mean_ms': round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+            'p95_ms': round(self.percentile(0.95) * 1000, 3),
+            'max_ms': round(self.max_time * 1000, 3),
+            'rows': self.rows,
+        }
+
+
+class FingerprintStats(Timings):
+    __slots__ = ('id', 'sql', 'views', 'last_explained')
+
+    def __init__(self, fingerprint_id, sql):
+        super().__init__()
+        self.id = fingerprint_id
+        self.sql = sql
+        self.views = {}
+        self.last_explained = None
+
+    def as_dict(self, view=None):
+        """With ``view``, every figure (calls, times, p95, rows) is that view's share alone."""
+        scope = self if view is None else self.views.get(view, Timings())
+        return {
+            'fingerprint': self.id,
+            'sql': self.sql,
+            **Timings.as_dict(scope),
+            'views': {
+                name: timings.as_dict()
+                for name, timings in sorted(self.views.items(), key=lambda item: -item[1].total_time)
+            },
+        }
+
+
+class SQLStatsCollector:
+    """
+    Bounded in-memory aggregation of executed SQL by fingerprint and view.
+
+    At most ``MAX_FINGERPRINTS`` statements are tracked (least recently seen
+    are evicted), each keeping a fixed-size reservoir of timings for p95 and
+    at most ``MAX_VIEWS_PER_FINGERPRINT`` per-view breakdowns with smaller
+    reservoirs of their own (``SAMPLES_PER_VIEW``). Statements slower than
+    ``EXPLAIN_THRESHOLD_MS`` have their plan captured on a background thread
+    into a ring buffer; only plain SELECTs are explained,
+    since ``EXPLAIN ANALYZE`` executes the statement (and would take row locks
+    for ``SELECT ... FOR UPDATE``).
+    """
+
+    def __init__(self, options):
+        self.options = {**DEFAULTS, **options}
+        self.enabled = self.options['ENABLED']
+        self._lock = threading.Lock()
+        self._stats = OrderedDict()
+        self.plans = deque(maxlen=self.options['EXPLAIN_BUFFER_SIZE'])
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sql-explain')
+        self._pending = threading.BoundedSemaphore(self.options['EXPLAIN_MAX_PENDING'])
+        self._futures = set()
+
+    def record(self, sql, params, duration, rows, alias, view):
+        if not self.enabled or _suppressed.get():
+            return
+        fingerprint_id, normalized = fingerprint(sql)
+        explain = False
+        with self._lock:
+            stats = self._stats.get(fingerprint_id)
+            if stats is None:
+                stats = self._stats[fingerprint_id] = FingerprintStats(fingerprint_id, normalized)
+                if len(self._stats) > self.options['MAX_FINGERPRINTS']:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(fingerprint_id)
+            stats.add(duration, rows, self.options['SAMPLES_PER_FINGERPRINT'])
+            timings = stats.views.get(view)
+            if timings is None and len(stats.views) < self.options['MAX_VIEWS_PER_FINGERPRINT']:
+                timings = stats.views[view] = Timings()
+            if timings is not None:
+                timings.add(duration, rows, self.options['SAMPLES_PER_VIEW'])
+
+            now = time.monotonic()
+            if (
+                duration * 1000 >= self.options['EXPLAIN_THRESHOLD_MS']
+                and params is not None
+                and normalized[:6].upper() == 'SELECT'
+                and 'FOR UPDATE' not in normalized.upper()
+                and (stats.last_explained is None
+                     or now - stats.last_explained >= self.options['EXPLAIN_COOLDOWN_SECONDS'])
+                # Never queue unbounded work behind a slow database; skip the capture instead
+                and self._pending.acquire(blocking=False)
+            ):
+                stats.last_explained = now
+                explain = True
+
+        if explain:
+            self._submit_explain(fingerprint_id, sql, params, duration, alias, view)
+
+    def _submit_explain(self, fingerprint_id, sql, params, duration, alias, view):
+        future = self._executor.submit(self._explain, fingerprint_id, sql, params, duration, alias, view)
+        with self._lock:
+            self._futures.add(future)
+
+        def done(finished):
+            self._pending.release()
+            with self._lock:
+                self._futures.discard(finished)
+        future.add_done_callback(done)
+
+    def _explain(self, fingerprint_id, sql, params, duration, alias, view):
+        _suppressed.set(True)
+        connection = connections[alias]
+        options = {'analyze': True, 'buffers': True} if connection.vendor == 'postgresql' else {}
+        try:
+            prefix = connection.ops.explain_query_prefix(**options)
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                plan = '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+        except Exception as exc:
+            plan = f'EXPLAIN failed: {exc}'
+        finally:
+            connection.close()
+        self.plans.append({
+            'fingerprint': fingerprint_id,
+            'sql': sql,
+            'duration_ms': round(duration * 1000, 3),
+            'view': view,
+            'captured_at': timezone.now(),
+            'plan': plan,
+        })
+
+    def wait_for_plans(self, timeout=None):
+        """Block until queued EXPLAIN captures finish (used by tests and the reset endpoint)."""
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.result(timeout)
+
+    def snapshot(self, view=None, order='total_ms', limit=50):
+        with self._lock:
+            entries = [
+                stats.as_dict(view) for stats in self._stats.values()
+                if view is None or view in stats.views
+            ]
+        entries.sort(key=lambda entry: entry[order], reverse=True)
+        return entries[:limit]
+
+    def reset(self):
+        self.wait_for_plans()
+        with self._lock:
+            self._stats.clear()
+            self.plans.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+def get_sql_stats():
+    """Return the process-wide collector, built lazily from ``settings.SQL_STATS``."""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                _collector = SQLStatsCollector(getattr(settings, 'SQL_STATS', {}))
+    return _collector
+
+@receiver(setting_changed)
+def reset_sql_stats(*, setting, **kwargs):
+    global _collector
+    if setting == 'SQL_STATS' and _collector is not None:
+        _collector.shutdown()
+        _collector = None
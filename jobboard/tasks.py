@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from celery import Task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError, transaction
+
+class RetryingTask(Task):
+    """Base task: retries transient database failures with exponential backoff and jitter."""
+    autoretry_for = (OperationalError, InterfaceError)
+    retry_backoff = True
+    retry_backoff_max = 300
+    retry_jitter = True
+    max_retries = 5
+
+def enqueue_on_commit(task, *args, **kwargs):
+    """Queue ``task`` once the current transaction commits, so workers never read uncommitted rows."""
+    transaction.on_commit(lambda: task.delay(*args, **kwargs))
+
+def chunked(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+@contextmanager
+def run_once(key, timeout=None):
+    """
+    Claim ``key`` so a side effect happens at most once across retries and
+    duplicate deliveries. Yields False when it already ran. An exception inside
+    the block releases the claim so the retry can redo the work.
+
+    Claims live in the cache, shared by all workers once CACHE_URL is set.
+    """
+    cache_key = f'tasks:once:{key}'
+    if not cache.add(cache_key, True, timeout or settings.TASK_IDEMPOTENCY_TTL):
+        yield False
+        return
+    try:
+        yield True
+    except BaseException:
+        cache.delete(cache_key)
+        raise
+
+@contextmanager
+def single_flight(name, timeout):
+    """
+    Yield True to exactly one concurrent holder of ``name``; periodic tasks use
+    it to avoid overlapping runs. Like run_once, it needs the shared cache.
+    """
+    cache_key = f'tasks:lock:{name}'
+    acquired = cache.add(cache_key, True, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(cache_key)
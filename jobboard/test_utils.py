@@ -1,14 +1,36 @@
-from rest_framework.test import APITestCase
+import threading
+from dataclasses import dataclass, field
+from unittest import SkipTest
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 User = get_user_model()
 
-class BaseAPITestCase(APITestCase):
+@dataclass(frozen=True)
+class QueryBudget:
+    """
+    Query budget for one list endpoint, declared in ``query_budgets`` on a
+    BaseAPITestCase subclass. ``populate`` names a test case method that
+    adds ``n`` more listed rows and returns the URL kwargs; ``user`` names
+    the attribute of the user to authenticate as (anonymous if empty).
+    """
+    url_name: str
+    max_queries: int
+    populate: str
+    user: str = ''
+    params: dict = field(default_factory=dict)
+    # Rows listed on each measured request; the query count must not change between them
+    sizes: tuple = (1, 5)
+
+class APITestHelpers:
     @classmethod
-    def setUpTestData(cls):
-        """Create test data that will be available for all test methods"""
+    def create_base_users(cls):
+        """Create the admin, employer and job seeker users shared by the tests"""
         cls.admin_user = User.objects.create_superuser(
             username='admin',
             email='admin@test.com',
@@ -175,3 +197,106 @@ class BaseAPITestCase(APITestCase):
         application = Application.objects.create(**defaults)
         return application
 
+
+class BaseAPITestCase(APITestHelpers, APITestCase):
+    # QueryBudget declarations; each becomes a ``test_query_budget_<url_name>[_as_<user>]`` test
+    query_budgets = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for budget in cls.__dict__.get('query_budgets', ()):
+            name = f"test_query_budget_{budget.url_name.replace('-', '_')}"
+            if budget.user:
+                name += f'_as_{budget.user}'
+            setattr(cls, name, lambda self, budget=budget: self.assertWithinQueryBudget(budget))
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create test data that will be available for all test methods"""
+        cls.create_base_users()
+
+    def setUp(self):
+        super().setUp()
+        # Cached dashboards and task claims are keyed by ids the database reuses between tests
+        cache.clear()
+
+    def assertWithinQueryBudget(self, budget):
+        """
+        Request ``budget.url_name`` listing each of ``budget.sizes`` rows and
+        fail if the query count differs between them (a per-row query) or
+        exceeds ``budget.max_queries``.
+        """
+        if budget.user:
+            self.authenticate_user(getattr(self, budget.user))
+        listed = 0
+        counts = {}
+        for size in budget.sizes:
+            url = reverse(budget.url_name, kwargs=getattr(self, budget.populate)(size - listed))
+            listed = size
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, budget.params)
+            self.assertEqual(response.status_code, 200, f'{budget.url_name}: {response.status_code}')
+            counts[size] = len(queries)
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'{budget.url_name}: query count grows with rows listed {counts}'
+        )
+        self.assertLessEqual(
+            max(counts.values()), budget.max_queries,
+            f'{budget.url_name}: {max(counts.values())} queries, budget is {budget.max_queries}'
+        )
+
+
+class ConcurrentAPITestCase(APITestHelpers, APITransactionTestCase):
+    """
+    Commits test data for real so requests issued from other threads, each on
+    its own database connection, can see it. Use ``run_concurrently`` to
+    release many requests at the same instant and inspect every outcome.
+    """
+    threads = 8
+
+    @classmethod
+    def setUpClass(cls):
+        # Threads would share one connection (and its transactions) on in-memory SQLite
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise SkipTest('Concurrency tests need a database that accepts multiple connections')
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.create_base_users()
+
+    def client_for(self, user):
+        """A separate API client authenticated as ``user``, safe to use from another thread"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def run_concurrently(self, func, threads=None):
+        """
+        Call ``func(index)`` from ``threads`` threads that start together.
+        Returns the results in thread order; re-raises the first exception.
+        """
+        threads = threads or self.threads
+        barrier = threading.Barrier(threads)
+        results = [None] * threads
+        errors = []
+
+        def worker(index):
+            try:
+                barrier.wait()
+                results[index] = func(index)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return results
@@ -0,0 +1,591 @@
+import json
+import time
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from .instrumentation import NPlusOneDetected, RequestStats, current_request_stats, parse_request_start
+from jobs.models import Job
+from .sqlstats import SQLStatsCollector, fingerprint, get_sql_stats
+from .routers import replica_selector
+from .dbpool import connection_pool, forget_inherited_pools
+from .counts import EstimatedCountPaginator, estimated_count
+from .test_utils import BaseAPITestCase, ConcurrentAPITestCase
+from .views import metrics_view
+
+
+class RequestMetricsTests(BaseAPITestCase):
+    """Test request and database instrumentation without DEBUG"""
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_metrics_recorded(self):
+        """Test per-view latency, query count and response size histograms"""
+        self.create_test_job()
+        labels = {'view': 'job-list-create'}
+        requests_before = self.sample('jobboard_http_request_duration_seconds_count', method='GET', **labels)
+        queries_before = self.sample('jobboard_http_request_db_queries_sum', **labels)
+
+        response = self.client.get(reverse('job-list-create'), HTTP_X_REQUEST_START='t=1')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.sample('jobboard_http_request_duration_seconds_count', method='GET', **labels), requests_before + 1
+        )
+        self.assertGreater(self.sample('jobboard_http_request_db_queries_sum', **labels), queries_before)
+        self.assertGreater(self.sample('jobboard_http_response_size_bytes_sum', **labels), 0)
+        self.assertEqual(
+            self.sample('jobboard_http_requests_total', method='GET', status='200', **labels),
+            self.sample('jobboard_http_request_duration_seconds_count', method='GET', **labels)
+        )
+
+    async def test_asgi_request_metrics(self):
+        """Test that requests served through the ASGI handler are measured, including sync_to_async queries"""
+        labels = {'view': 'login-async'}
+        requests_before = self.sample('jobboard_http_request_duration_seconds_count', method='POST', **labels)
+        queries_before = self.sample('jobboard_http_request_db_queries_sum', **labels)
+
+        response = await self.async_client.post(
+            reverse('login-async'), {'username': 'jobseeker1', 'password': 'testpass123'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.sample('jobboard_http_request_duration_seconds_count', method='POST', **labels), requests_before + 1
+        )
+        self.assertGreater(self.sample('jobboard_http_request_db_queries_sum', **labels), queries_before)
+
+    def test_parse_request_start(self):
+        """Test queue time parsing across header formats"""
+        self.assertAlmostEqual(parse_request_start('t=1000.5', now=1001.0), 0.5)
+        self.assertAlmostEqual(parse_request_start('1700000000500', now=1700000001.0), 0.5)
+        self.assertAlmostEqual(parse_request_start('t=1700000000500000', now=1700000001.0), 0.5)
+        self.assertEqual(parse_request_start('t=2000', now=1000), 0.0)
+        self.assertIsNone(parse_request_start('garbage'))
+
+    def test_metrics_endpoint(self):
+        """Test the Prometheus endpoint and its access control"""
+        self.client.get(reverse('job-list-create'))
+        response = self.client.get(reverse('metrics'))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertIn(b'jobboard_http_request_duration_seconds_bucket', response.content)
+        self.assertIn(b'jobboard_db_queries_total', response.content)
+
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.1.2.3')
+        self.assertResponseError(response, status.HTTP_403_FORBIDDEN)
+
+        with override_settings(METRICS_AUTH_TOKEN='scrape-secret'):
+            self.assertResponseError(self.client.get(reverse('metrics')), status.HTTP_403_FORBIDDEN)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+            self.assertResponseSuccess(response, status.HTTP_200_OK)
+            for header in ('Bearer wrong-secret', 'Bearer é'):
+                request = RequestFactory().get(reverse('metrics'), HTTP_AUTHORIZATION=header)
+                self.assertEqual(metrics_view(request).status_code, status.HTTP_403_FORBIDDEN, header)
+
+
+class ConnectionPoolTests(BaseAPITestCase):
+    """Test connection pool metrics and fork handling (SQLite has no pool, so one is faked)"""
+
+    class FakePool:
+        def get_stats(self):
+            return {
+                'pool_min': 2, 'pool_max': 10, 'pool_size': 4, 'pool_available': 1,
+                'requests_num': 40, 'requests_wait_ms': 1500, 'requests_errors': 2,
+            }
+
+    def test_sqlite_has_no_pool(self):
+        """Test that looking up a pool never opens one"""
+        self.assertIsNone(connection_pool('default'))
+
+    def test_pool_stats_exported(self):
+        """Test that pool gauges and counters appear per alias at scrape time"""
+        pools = {'default': self.FakePool()}
+        with mock.patch('jobboard.dbpool.connection_pool', side_effect=pools.get):
+            response = self.client.get(reverse('metrics'))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertIn(b'jobboard_db_pool_size{alias="default"} 4.0', response.content)
+        self.assertIn(b'jobboard_db_pool_available{alias="default"} 1.0', response.content)
+        self.assertIn(b'jobboard_db_pool_requests_total{alias="default"} 40.0', response.content)
+        self.assertIn(b'jobboard_db_pool_wait_seconds_total{alias="default"} 1.5', response.content)
+        self.assertIn(b'jobboard_db_pool_timeouts_total{alias="default"} 2.0', response.content)
+        # Counters psycopg has not reported yet read as zero
+        self.assertIn(b'jobboard_db_pool_connections_lost_total{alias="default"} 0.0', response.content)
+        self.assertNotIn(b'jobboard_db_pool_size{alias="replica"}', response.content)
+
+    def test_forget_inherited_pools(self):
+        """Test that pools copied by fork are dropped without being closed"""
+        wrapper = mock.Mock(_connection_pools={'default': mock.Mock()})
+        with mock.patch('jobboard.dbpool.connections') as handler:
+            handler.all.return_value = [wrapper]
+            forget_inherited_pools()
+        self.assertEqual(wrapper._connection_pools, {})
+        self.assertIsNone(wrapper.connection)
+        wrapper.close.assert_not_called()
+
+
+class EstimatedCountTests(BaseAPITestCase):
+    """Test bounded exact counts and the PostgreSQL estimates behind them (faked on SQLite)"""
+
+    def setUp(self):
+        super().setUp()
+        company = self.create_test_company()
+        for _ in range(4):
+            self.create_test_job(company=company)
+
+    def test_exact_below_threshold(self):
+        self.assertEqual(estimated_count(Job.objects.all(), threshold=10), (4, False))
+
+    def test_sqlite_counts_exactly(self):
+        self.assertEqual(estimated_count(Job.objects.all(), threshold=2), (4, False))
+
+    def test_estimates_past_threshold(self):
+        """Test that whole tables use reltuples and filtered querysets the planner estimate"""
+        with mock.patch.object(connection, 'vendor', 'postgresql'), \
+                mock.patch('jobboard.counts.table_estimate', return_value=5000) as table, \
+                mock.patch('jobboard.counts.plan_estimate', return_value=1200) as plan:
+            self.assertEqual(estimated_count(Job.objects.all(), threshold=2), (5000, True))
+            self.assertEqual(estimated_count(Job.objects.filter(is_active=True), threshold=2), (1200, True))
+            # Never below what was actually counted
+            plan.return_value = 0
+            self.assertEqual(estimated_count(Job.objects.filter(is_active=True), threshold=2), (2, True))
+        table.assert_called_once()
+
+    def test_paginator_flags_estimates(self):
+        with mock.patch('jobboard.counts.estimated_count', return_value=(900, True)):
+            paginator = EstimatedCountPaginator(Job.objects.order_by('pk'), 2)
+            self.assertEqual(paginator.num_pages, 450)
+        self.assertTrue(paginator.approximate)
+        self.assertEqual(len(paginator.page(2).object_list), 2)
+
+class EstimatedCountPaginationTests(BaseAPITestCase):
+    """Test opt-in page-number pagination with estimated counts on API lists"""
+
+    def setUp(self):
+        super().setUp()
+        company = self.create_test_company()
+        for _ in range(5):
+            self.create_test_job(company=company)
+        self.authenticate_user(self.admin_user)
+
+    def test_unpaginated_without_page_params(self):
+        response = self.client.get(reverse('admin-job-list'))
+        self.assertResponseSuccess(response)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_exact_count_and_links(self):
+        response = self.client.get(reverse('admin-job-list'), {'page_size': 2, 'page': 2})
+        self.assertResponseSuccess(response)
+        self.assertEqual(response.data['count'], 5)
+        self.assertFalse(response.data['count_approximate'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('page=3', response.data['next'])
+        self.assertNotIn('page=', response.data['previous'])
+
+        last = self.client.get(reverse('admin-job-list'), {'page_size': 2, 'page': 3})
+        self.assertEqual(len(last.data['results']), 1)
+        self.assertIsNone(last.data['next'])
+        beyond = self.client.get(reverse('admin-job-list'), {'page_size': 2, 'page': 4})
+        self.assertEqual(beyond.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_estimated_count_is_flagged(self):
+        with mock.patch('jobboard.pagination.estimated_count', return_value=(250000, True)):
+            response = self.client.get(reverse('job-list-create'), {'page_size': 2})
+        self.assertEqual(response.data['count'], 250000)
+        self.assertTrue(response.data['count_approximate'])
+
+    def test_counts_can_be_skipped(self):
+        with mock.patch('jobboard.pagination.estimated_count') as counted:
+            response = self.client.get(reverse('admin-job-list'), {'page_size': 2, 'count': 'false'})
+        counted.assert_not_called()
+        self.assertIsNone(response.data['count'])
+        self.assertIsNone(response.data['count_approximate'])
+        self.assertIsNotNone(response.data['next'])
+
+class SQLStatsTests(BaseAPITestCase):
+    """Test SQL fingerprinting, bounded aggregation and slow-query plan capture"""
+
+    def test_fingerprint_normalizes_literals(self):
+        """Test that statements differing only in literals share a fingerprint"""
+        first = fingerprint("SELECT * FROM jobs_job WHERE id IN (%s, %s, %s) AND title = 'a' LIMIT 21")
+        second = fingerprint("SELECT *  FROM jobs_job\nWHERE id IN (%s) AND title = 'it''s' LIMIT 5")
+        self.assertEqual(first, second)
+        self.assertEqual(first[1], 'SELECT * FROM jobs_job WHERE id IN (...) AND title = ? LIMIT ?')
+        self.assertNotEqual(first[0], fingerprint('SELECT * FROM jobs_job WHERE id = %s')[0])
+        # Digits inside identifiers are kept
+        self.assertIn('t1', fingerprint('SELECT t1.id FROM jobs_job t1')[1])
+
+    def test_collector_is_bounded(self):
+        """Test fingerprint eviction, sample reservoir and per-view caps"""
+        collector = SQLStatsCollector({
+            'MAX_FINGERPRINTS': 2, 'MAX_VIEWS_PER_FINGERPRINT': 1, 'SAMPLES_PER_FINGERPRINT': 10,
+            'SAMPLES_PER_VIEW': 10,
+            'EXPLAIN_THRESHOLD_MS': 10 ** 9,
+        })
+        try:
+            for index in range(100):
+                collector.record('SELECT 1 FROM a WHERE id = %s', (index,), index / 1000, 1, 'default', 'view-a')
+            collector.record('SELECT 1 FROM b', (), 0.001, 0, 'default', 'view-a')
+            # Touching ``a`` again makes ``b`` the least recently seen
+            collector.record('SELECT 1 FROM a WHERE id = %s', (1,), 0.001, 1, 'default', 'view-b')
+            collector.record('SELECT 1 FROM c', (), 0.001, 0, 'default', 'view-a')
+
+            entries = collector.snapshot()
+            self.assertEqual(len(entries), 2)
+            self.assertNotIn('SELECT ? FROM b', [entry['sql'] for entry in entries])
+
+            stats = next(entry for entry in entries if entry['sql'] == 'SELECT ? FROM a WHERE id = ?')
+            self.assertEqual(stats['calls'], 101)
+            self.assertEqual(stats['rows'], 101)
+            self.assertEqual(list(stats['views']), ['view-a'])
+            self.assertLessEqual(stats['p95_ms'], stats['max_ms'])
+            self.assertEqual(len(collector._stats[stats['fingerprint']].samples), 10)
+            self.assertEqual(len(collector._stats[stats['fingerprint']].views['view-a'].samples), 10)
+        finally:
+            collector.shutdown()
+
+    def test_view_filter_reports_that_view_only(self):
+        """Test that filtering by view reports the view's own timings, rows and p95, and sorts by them"""
+        collector = SQLStatsCollector({'EXPLAIN_THRESHOLD_MS': 10 ** 9})
+        try:
+            for _ in range(10):
+                collector.record('SELECT 1 FROM a', (), 0.5, 100, 'default', 'slow-view')
+                collector.record('SELECT 1 FROM b', (), 0.2, 1, 'default', 'slow-view')
+            collector.record('SELECT 1 FROM a', (), 0.001, 1, 'default', 'fast-view')
+            collector.record('SELECT 1 FROM b', (), 0.01, 1, 'default', 'fast-view')
+
+            fast = collector.snapshot(view='fast-view', order='p95_ms')
+            self.assertEqual([entry['sql'] for entry in fast], ['SELECT ? FROM b', 'SELECT ? FROM a'])
+            self.assertEqual(
+                {key: fast[1][key] for key in ('calls', 'total_ms', 'p95_ms', 'max_ms', 'rows')},
+                {'calls': 1, 'total_ms': 1.0, 'p95_ms': 1.0, 'max_ms': 1.0, 'rows': 1}
+            )
+            overall = next(entry for entry in collector.snapshot() if entry['sql'] == 'SELECT ? FROM a')
+            self.assertEqual((overall['calls'], overall['rows'], overall['max_ms']), (11, 1001, 500.0))
+            self.assertEqual(overall['views']['slow-view']['rows'], 1000)
+            self.assertEqual(overall['views']['fast-view']['p95_ms'], 1.0)
+        finally:
+            collector.shutdown()
+
+    def test_requests_are_recorded_per_view(self):
+        """Test that queries made while serving a request are attributed to its view"""
+        self.create_test_job()
+        self.client.get(reverse('job-list-create'))
+
+        entries = get_sql_stats().snapshot(view='job-list-create')
+        self.assertTrue(entries)
+        self.assertTrue(all(entry['views']['job-list-create']['calls'] for entry in entries))
+        self.assertTrue(any('jobs_job' in entry['sql'] for entry in entries))
+
+    def test_slow_select_plan_captured(self):
+        """Test that statements over the threshold get their plan captured in the background, once"""
+        with override_settings(SQL_STATS={'EXPLAIN_THRESHOLD_MS': 0, 'EXPLAIN_COOLDOWN_SECONDS': 3600}):
+            collector = get_sql_stats()
+            self.create_test_job()
+            self.client.get(reverse('job-list-create'))
+            self.client.get(reverse('job-list-create'))
+            collector.wait_for_plans(timeout=10)
+
+            plans = list(collector.plans)
+            self.assertTrue(plans)
+            self.assertTrue(all(plan['sql'].lstrip().upper().startswith('SELECT') for plan in plans))
+            self.assertTrue(all('FOR UPDATE' not in plan['sql'].upper() for plan in plans))
+            self.assertTrue(all(plan['plan'] for plan in plans))
+            # The cooldown keeps repeated statements from being explained again
+            fingerprints = [plan['fingerprint'] for plan in plans]
+            self.assertEqual(len(fingerprints), len(set(fingerprints)))
+
+
+class NPlusOneDetectorTests(BaseAPITestCase):
+    """Test detection of repeated SELECT templates within a request"""
+
+    def run_repeated_lookups(self, count):
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        try:
+            for user in get_user_model().objects.all()[:count]:
+                get_user_model().objects.filter(pk=user.pk).first()
+        finally:
+            current_request_stats.reset(token)
+        return stats
+
+    @override_settings(N_PLUS_ONE={'MODE': 'log', 'THRESHOLD': 3})
+    def test_repeated_templates_counted(self):
+        """Test that lookups differing only in parameters count as one template"""
+        stats = self.run_repeated_lookups(3)
+        repeated = stats.repeated_templates(3)
+        self.assertEqual(len(repeated), 1)
+        self.assertIn('WHERE "users_user"."id" = ?', repeated[0][0])
+        self.assertEqual(repeated[0][1], 3)
+
+    @override_settings(N_PLUS_ONE={'MODE': 'raise', 'THRESHOLD': 3})
+    def test_raise_mode(self):
+        """Test that raise mode stops at the query reaching the threshold"""
+        with self.assertRaises(NPlusOneDetected):
+            self.run_repeated_lookups(3)
+
+    @override_settings(N_PLUS_ONE={'MODE': 'off', 'THRESHOLD': 3})
+    def test_off_mode(self):
+        """Test that nothing is tracked when the detector is off"""
+        self.assertEqual(self.run_repeated_lookups(3).repeated_templates(1), [])
+
+    @override_settings(N_PLUS_ONE={'MODE': 'header', 'THRESHOLD': 2})
+    def test_header_mode(self):
+        """Test that the header names repeated fingerprints and is absent on prefetched lists"""
+        company = self.create_test_company()
+        for _ in range(3):
+            self.create_test_job(company=company)
+
+        response = self.client.get(reverse('company-jobs', kwargs={'company_id': company.pk}))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertNotIn('X-N-Plus-One', response)
+
+        # Every SELECT template qualifies at threshold 1
+        with override_settings(N_PLUS_ONE={'MODE': 'header', 'THRESHOLD': 1}):
+            response = self.client.get(reverse('company-jobs', kwargs={'company_id': company.pk}))
+        self.assertRegex(response['X-N-Plus-One'], r'^1x[0-9a-f]{16}')
+
+    @override_settings(N_PLUS_ONE={'MODE': 'log', 'THRESHOLD': 1})
+    def test_log_mode(self):
+        """Test that log mode reports repeated templates as warnings"""
+        with self.assertLogs('jobboard.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('job-search'))
+        self.assertIn('N+1 QUERY: GET /api/jobs/search/', logs.output[0])
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_PIN_SECONDS=30)
+class ReplicaRoutingTests(ConcurrentAPITestCase):
+    """Test replica reads and read-your-writes pinning, with a second SQLite database as the replica"""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        super().setUp()
+        # "Replicate" the users so token authentication works on either database
+        get_user_model().objects.using('replica').bulk_create(get_user_model().objects.all())
+        self.job = self.create_test_job()
+
+    def listed_job_ids(self, client=None):
+        response = (client or self.client).get(reverse('job-list-create'))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        return [job['id'] for job in response.data]
+
+    def test_safe_requests_read_from_replica(self):
+        """Test that GETs read the replica, which has not received the job yet"""
+        self.assertEqual(self.listed_job_ids(), [])
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.listed_job_ids(), [self.job.pk])
+
+    def test_writer_pinned_to_primary(self):
+        """Test that a client that just wrote reads its write back, by cookie and by user"""
+        self.authenticate_user(self.job_seeker_user)
+        response = self.client.post(reverse('application-list-create'), {'job': self.job.pk, 'cover_letter': 'Hi'})
+        self.assertResponseSuccess(response, status.HTTP_201_CREATED)
+        self.assertIn('db_pin', response.cookies)
+
+        response = self.client.get(reverse('user-applications'))
+        self.assertEqual(len(response.data['results']), 1)
+
+        # A token client without cookies is pinned by user id
+        self.client.cookies.clear()
+        response = self.client.get(reverse('user-applications'))
+        self.assertEqual(len(response.data['results']), 1)
+
+        # Other clients still read the replica
+        self.assertEqual(self.listed_job_ids(self.client_for(self.employer_user)), [])
+
+    def test_lagging_replica_skipped(self):
+        """Test that a replica over the lag limit, or failing the probe, is not used"""
+        with override_settings(REPLICA_MAX_LAG_SECONDS=1, REPLICA_LAG_CHECK_INTERVAL=0):
+            with mock.patch.object(replica_selector, 'measure_lag', return_value=5.0):
+                self.assertEqual(self.listed_job_ids(), [self.job.pk])
+            with mock.patch.object(replica_selector, 'measure_lag', side_effect=DatabaseError):
+                self.assertEqual(self.listed_job_ids(), [self.job.pk])
+            with mock.patch.object(replica_selector, 'measure_lag', return_value=0.5):
+                self.assertEqual(self.listed_job_ids(), [])
+
+    def test_no_routing_outside_requests(self):
+        """Test that tasks and commands use the primary"""
+        self.assertEqual(Job.objects.all().db, 'default')
+
+
+class GraphQLTests(BaseAPITestCase):
+    """Test the GraphQL endpoint: batching, visibility and query limits"""
+
+    JOBS_QUERY = '''
+        query Jobs($first: Int) {
+            jobs(first: $first) {
+                id title
+                company { id name }
+                categories { name }
+                requiredSkills { name }
+            }
+        }
+    '''
+
+    def graphql(self, query, variables=None):
+        return self.client.post(reverse('graphql'), {'query': query, 'variables': variables}, format='json')
+
+    def add_jobs(self, count):
+        company = self.create_test_company()
+        for _ in range(count):
+            self.create_test_job(company=company)
+
+    def test_query_count_constant_in_list_size(self):
+        """Test that relations are batched: 10 and 100 jobs cost the same statements"""
+        counts = {}
+        for total in (10, 100):
+            self.add_jobs(total - Job.objects.count())
+            with CaptureQueriesContext(connection) as queries:
+                response = self.graphql(self.JOBS_QUERY, {'first': 100})
+            self.assertResponseSuccess(response)
+            self.assertNotIn('errors', response.data)
+            jobs = response.data['data']['jobs']
+            self.assertEqual(len(jobs), total)
+            self.assertEqual(jobs[0]['categories'], [{'name': 'Technology'}])
+            self.assertEqual(jobs[0]['requiredSkills'], [{'name': 'Python'}])
+            counts[total] = len(queries)
+        self.assertEqual(counts[10], counts[100])
+
+    def test_inactive_jobs_hidden_from_public(self):
+        active = self.create_test_job()
+        inactive = self.create_test_job(is_active=False)
+        response = self.graphql('{ jobs { id } job(id: %d) { id } }' % inactive.pk)
+        self.assertEqual([job['id'] for job in response.data['data']['jobs']], [str(active.pk)])
+        self.assertIsNone(response.data['data']['job'])
+
+        self.authenticate_user(self.admin_user)
+        response = self.graphql('{ job(id: %d) { id isActive } }' % inactive.pk)
+        self.assertEqual(response.data['data']['job'], {'id': str(inactive.pk), 'isActive': False})
+
+    def test_application_permissions(self):
+        application = self.create_test_application()
+        job_query = '{ job(id: %d) { applications { id applicant { username email } } } }' % application.job_id
+        application_query = '{ application(id: %d) { id } }' % application.pk
+
+        outsider = self.create_user()
+        self.authenticate_user(outsider)
+        response = self.graphql(job_query)
+        self.assertIsNone(response.data['data']['job']['applications'])
+        self.assertIn('permission', response.data['errors'][0]['message'])
+        self.assertIsNone(self.graphql(application_query).data['data']['application'])
+
+        self.authenticate_user(self.employer_user)
+        response = self.graphql(job_query)
+        self.assertEqual(
+            response.data['data']['job']['applications'],
+            [{'id': str(application.pk), 'applicant': {'username': 'jobseeker1', 'email': None}}]
+        )
+
+        self.authenticate_user(self.job_seeker_user)
+        self.assertEqual(self.graphql(application_query).data['data']['application'], {'id': str(application.pk)})
+        response = self.graphql('{ me { email } myApplications { id } }')
+        self.assertEqual(response.data['data']['me'], {'email': 'seeker@test.com'})
+        self.assertEqual(response.data['data']['myApplications'], [{'id': str(application.pk)}])
+
+    @override_settings(GRAPHQL={'MAX_DEPTH': 3, 'MAX_COMPLEXITY': 500, 'MAX_PAGE_SIZE': 100, 'LIST_SIZE': 10})
+    def test_depth_and_complexity_limits(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.graphql('{ jobs { company { jobs { company { name } } } } }')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('depth', response.data['errors'][0]['message'])
+        self.assertEqual(len(queries), 0)
+
+        response = self.graphql(self.JOBS_QUERY, {'first': 10})
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('complexity', response.data['errors'][0]['message'])
+
+        response = self.graphql('{ jobs(first: 10) { id title company { name } } }')
+        self.assertResponseSuccess(response)
+
+    def test_query_required(self):
+        response = self.client.post(reverse('graphql'), {}, format='json')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+
+class BatchRequestTests(BaseAPITestCase):
+    """Test batched GETs dispatched in-process"""
+
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_test_job()
+        self.create_test_application(job=self.job)
+
+    def batch(self, *paths):
+        return self.client.post(reverse('batch'), {'requests': list(paths)}, format='json')
+
+    def test_job_screen_in_one_round_trip(self):
+        """Test that every response matches the request made on its own"""
+        paths = [
+            f'/api/jobs/{self.job.pk}/',
+            f'/api/jobs/company/{self.job.company_id}/',
+            f'/api/applications/job/{self.job.pk}/count/',
+            '/api/categories/?search=Tech',
+        ]
+        response = self.batch(*paths)
+        self.assertResponseSuccess(response)
+        results = response.data['responses']
+        self.assertEqual([result['path'] for result in results], paths)
+        for path, result in zip(paths, results):
+            direct = self.client.get(path)
+            self.assertEqual(result['status'], direct.status_code, path)
+            self.assertEqual(result['body'], json.loads(direct.content), path)
+        self.assertEqual(results[2]['body']['application_count'], 1)
+        self.assertEqual([category['name'] for category in results[3]['body']], ['Technology'])
+
+    def test_authentication_shared(self):
+        """Test that sub-requests run as the batch's user"""
+        paths = ['/api/applications/my-applications/', '/api/auth/profile/']
+        anonymous = self.batch(*paths)
+        self.assertEqual([result['status'] for result in anonymous.data['responses']], [401, 401])
+
+        self.authenticate_user(self.job_seeker_user)
+        response = self.batch(*paths)
+        applications, profile = response.data['responses']
+        self.assertEqual(applications['status'], status.HTTP_200_OK)
+        self.assertEqual(len(applications['body']['results']), 1)
+        self.assertEqual(profile['body']['username'], 'jobseeker1')
+
+    def test_identical_paths_served_once(self):
+        with CaptureQueriesContext(connection) as once:
+            self.batch('/api/categories/')
+        with CaptureQueriesContext(connection) as twice:
+            response = self.batch('/api/categories/', '/api/categories/')
+        self.assertEqual(len(twice), len(once))
+        first, second = response.data['responses']
+        self.assertEqual(first, second)
+
+    def test_rejected_paths(self):
+        response = self.batch('https://example.com/api/categories/', '/api/batch/', '/api/missing/', '/admin/')
+        self.assertResponseSuccess(response)
+        self.assertEqual([result['status'] for result in response.data['responses']], [400, 400, 404, 400])
+
+    def test_async_views_and_failures_answered_per_request(self):
+        """Test that async views run and a failing sub-request does not lose the others"""
+        response = self.batch('/api/auth/async/login/', '/api/categories/')
+        self.assertResponseSuccess(response)
+        self.assertEqual(
+            [result['status'] for result in response.data['responses']], [status.HTTP_405_METHOD_NOT_ALLOWED, 200]
+        )
+
+        with mock.patch('jobboard.batch.response_body', side_effect=[ValueError, None]):
+            response = self.batch('/api/categories/', '/api/skills/')
+        self.assertResponseSuccess(response)
+        self.assertEqual([result['status'] for result in response.data['responses']], [500, 200])
+
+    def test_limits(self):
+        with override_settings(BATCH_REQUESTS={'MAX_REQUESTS': 2, 'TIMEOUT': 10}):
+            response = self.batch('/api/categories/', '/api/skills/', f'/api/jobs/{self.job.pk}/')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+        self.assertResponseError(self.batch(), status.HTTP_400_BAD_REQUEST)
+
+        with override_settings(BATCH_REQUESTS={'MAX_REQUESTS': 20, 'TIMEOUT': 5}):
+            clock = mock.Mock(perf_counter=time.perf_counter, monotonic=mock.Mock(side_effect=[0, 1, 6]))
+            with mock.patch('jobboard.batch.time', clock):
+                response = self.batch('/api/categories/', '/api/skills/')
+        self.assertEqual([result['status'] for result in response.data['responses']], [200, 504])
@@ -19,6 +19,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from .batch import BatchView
+from .graphql.views import GraphQLView
+from .views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,12 +32,19 @@ urlpatterns = [
     path('api/companies/', include('companies.urls')),
     path('api/', include('categories.urls')),
     path('api/applications/', include('applications.urls')),
+    path('api/analytics/', include('analytics.urls')),
+    path('api/alerts/', include('alerts.urls')),
+    path('api/graphql/', GraphQLView.as_view(), name='graphql'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
 
     # API Documentation URLs
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
+
 ]
 
 # Serve media files in development
@@ -0,0 +1,30 @@
+import hmac
+import os
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from .dbpool import pool_collector
+
+def metrics_view(request):
+    """
+    Prometheus text exposition. Under a pre-forking server set
+    ``PROMETHEUS_MULTIPROC_DIR`` so every worker writes its samples there and
+    this view aggregates all of them, whichever worker answers the scrape.
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if token:
+        supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ')
+        # compare_digest refuses non-ASCII str; WSGI headers are latin-1 decoded
+        if not hmac.compare_digest(supplied.encode('latin-1', 'replace'), token.encode()):
+            return HttpResponseForbidden()
+    elif request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Pool statistics live in each worker's memory: this reports the worker answering the scrape
+        registry.register(pool_collector)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,51 @@
 from django.contrib import admin
-from .models import Job
+from django.db import transaction
+from django.utils import timezone
+from alerts.tasks import queue_job_matching
+from analytics.rollups import record_job_events
+from applications.models import Application
+from companies.dashboard import invalidate_company_dashboard
+from jobboard.counts import EstimatedCountPaginator, count_subquery
+from .models import Job, fresh_expiry
+
+def set_jobs_active(queryset, is_active):
+    """
+    Activate or deactivate every job in ``queryset`` with one UPDATE, then
+    bump counters and caches once for the batch. Returns the number changed.
+    """
+    now = timezone.now()
+    targets = Job.objects.filter(pk__in=queryset.values('pk'), is_active=not is_active)
+    with transaction.atomic():
+        rows = list(targets.select_for_update().order_by('pk').values_list('pk', 'company_id'))
+        if not rows:
+            return 0
+        jobs = Job.objects.filter(pk__in=[pk for pk, _ in rows])
+        if is_active:
+            # Reactivated expired postings start a fresh lifetime instead of being swept again
+            jobs.filter(expires_at__lte=now).update(expires_at=fresh_expiry(now))
+        updated = jobs.update(is_active=is_active, updated_at=now)
+        # QuerySet.update() bypasses the model signal handlers
+        record_job_events(activated=updated if is_active else 0, deactivated=0 if is_active else updated)
+        for company_id in {company_id for _, company_id in rows}:
+            invalidate_company_dashboard(company_id)
+        if is_active:
+            queue_job_matching([pk for pk, _ in rows])
+    return updated
 
 # Register your models here.
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ('title', 'company', 'location', 'job_type',
                    'salary_range', 'is_active', 'application_count', 'created_at')
-    list_filter = ('job_type', 'is_active', 'created_at', 'updated_at', 'categories')
+    # No categories filter: its DISTINCT over the job/category join scans the whole table
+    list_filter = ('job_type', 'is_active', 'created_at', 'updated_at')
     search_fields = ('title', 'description', 'location', 'company__name')
     ordering = ('-created_at',)
+    list_select_related = ('company',)
+    autocomplete_fields = ('company', 'posted_by')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ('activate_jobs', 'deactivate_jobs')
 
     fieldsets = (
         ('Job Details', {
@@ -42,7 +79,20 @@ class JobAdmin(admin.ModelAdmin):
             obj.posted_by = request.user
         super().save_model(request, obj, form, change)
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.annotate(_application_count=count_subquery(Application, 'job'))
+
     def application_count(self, obj):
-        return obj.applications.count()
+        return obj._application_count
+    application_count.admin_order_field = '_application_count'
     application_count.short_description = "Applications"
 
+    @admin.action(description='Activate selected jobs', permissions=['change'])
+    def activate_jobs(self, request, queryset):
+        self.message_user(request, f'{set_jobs_active(queryset, True)} job(s) activated.')
+
+    @admin.action(description='Deactivate selected jobs', permissions=['change'])
+    def deactivate_jobs(self, request, queryset):
+        self.message_user(request, f'{set_jobs_active(queryset, False)} job(s) deactivated.')
+
@@ -0,0 +1,218 @@
+"""
+Hot/cold archival of inactive jobs.
+
+Jobs inactive for JOB_ARCHIVE_AFTER_DAYS move with their applications,
+category/skill links and funnel rollups into the archive tables (ArchivedJob,
+ArchivedApplication), and back on restore. Rows move set-based with
+``INSERT ... SELECT`` + ``DELETE`` in bounded batches, each in its own
+transaction, so no step holds locks on a large job's applications at once.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_filters.utils import translate_validation
+from rest_framework.response import Response
+from applications.models import Application, ArchivedApplication, FunnelStageRollup
+from companies.dashboard import invalidate_company_dashboard
+from jobboard.pagination import merge_querysets
+from .models import ArchivedJob, Job
+
+FUNNEL_FIELDS = ('stage', 'entered', 'exited', 'total_seconds_in_stage', 'duration_histogram')
+
+
+def _columns(model):
+    """Columns shared by a live model and its archive twin."""
+    return [field.column for field in model._meta.concrete_fields]
+
+
+def _copy_rows(source, target, columns, ids, **extra):
+    """
+    ``INSERT INTO target SELECT ... FROM source WHERE id IN ids``, setting the
+    target-only ``extra`` fields to fixed values; rows already copied are skipped.
+    """
+    quote = connection.ops.quote_name
+    fields = [target._meta.get_field(name) for name in extra]
+    target_columns = ', '.join(quote(column) for column in [*columns, *(field.column for field in fields)])
+    selected = ', '.join([*(quote(column) for column in columns), *(['%s'] * len(fields))])
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(target._meta.db_table)} ({target_columns}) SELECT {selected} '
+            f'FROM {quote(source._meta.db_table)} WHERE {quote("id")} IN ({placeholders}) ON CONFLICT DO NOTHING',
+            [*(field.get_db_prep_save(value, connection) for field, value in zip(fields, extra.values())), *ids]
+        )
+
+
+def _copy_m2m(source_model, target_model, ids):
+    for name in ('categories', 'required_skills'):
+        source = source_model._meta.get_field(name)
+        target = target_model._meta.get_field(name)
+        quote = connection.ops.quote_name
+        placeholders = ', '.join(['%s'] * len(ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {quote(target.m2m_db_table())} '
+                f'({quote(target.m2m_column_name())}, {quote(target.m2m_reverse_name())}) '
+                f'SELECT {quote(source.m2m_column_name())}, {quote(source.m2m_reverse_name())} '
+                f'FROM {quote(source.m2m_db_table())} WHERE {quote(source.m2m_column_name())} IN ({placeholders}) '
+                'ON CONFLICT DO NOTHING',
+                ids
+            )
+
+
+def _move_applications(source, target, job_ids, batch_size, **extra):
+    """Move the applications of ``job_ids`` from ``source`` to ``target`` in batches; returns the count."""
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                source.objects.filter(job_id__in=job_ids).select_for_update()
+                .order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return moved
+            _copy_rows(source, target, _columns(Application), ids, **extra)
+            # Set-based delete: nothing references applications through a database constraint
+            source.objects.filter(pk__in=ids)._raw_delete(connection.alias)
+        moved += len(ids)
+
+
+def archive_job_batch(cutoff, batch_size, application_batch_size, now=None):
+    """
+    Archive up to ``batch_size`` jobs inactive since before ``cutoff``.
+    Returns ``(jobs, applications)`` archived; ``(0, 0)`` means nothing is left.
+    """
+    now = now or timezone.now()
+    eligible = Job.objects.filter(is_active=False, updated_at__lt=cutoff)
+    with transaction.atomic():
+        # skip_locked leaves jobs an admin is editing for the next run
+        rows = list(
+            eligible.select_for_update(skip_locked=True)
+            .order_by('updated_at', 'pk').values_list('pk', 'company_id')[:batch_size]
+        )
+        if not rows:
+            return 0, 0
+        ids = [pk for pk, _ in rows]
+        _copy_rows(Job, ArchivedJob, _columns(Job), ids, archived_at=now, funnel_stages=[])
+        _copy_m2m(Job, ArchivedJob, ids)
+        funnels = defaultdict(list)
+        for row in FunnelStageRollup.objects.filter(job_id__in=ids).values('job_id', *FUNNEL_FIELDS):
+            funnels[row.pop('job_id')].append(row)
+        ArchivedJob.objects.bulk_update(
+            [ArchivedJob(pk=pk, funnel_stages=stages) for pk, stages in funnels.items()], ['funnel_stages']
+        )
+
+    applications = _move_applications(Application, ArchivedApplication, ids, application_batch_size, archived_at=now)
+
+    with transaction.atomic():
+        # A job reactivated while its applications moved goes back to the hot tables
+        archived = set(eligible.filter(pk__in=ids).select_for_update().values_list('pk', flat=True))
+        Job.objects.filter(pk__in=archived).delete()
+    reactivated = [pk for pk in ids if pk not in archived]
+    if reactivated:
+        applications -= restore_jobs(reactivated, application_batch_size)[1]
+    for company_id in {company_id for _, company_id in rows}:
+        invalidate_company_dashboard(company_id)
+    return len(archived), applications
+
+
+def archive_inactive_jobs(days=None, batch_size=None, application_batch_size=None, max_batches=None, now=None):
+    """Archive every job inactive for ``days``; returns ``(jobs, applications)`` archived."""
+    days = settings.JOB_ARCHIVE_AFTER_DAYS if days is None else days
+    if days <= 0:
+        return 0, 0
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=days)
+    total_jobs = total_applications = batches = 0
+    while max_batches is None or batches < max_batches:
+        jobs, applications = archive_job_batch(
+            cutoff, batch_size or settings.JOB_ARCHIVE_BATCH_SIZE,
+            application_batch_size or settings.JOB_ARCHIVE_APPLICATION_BATCH_SIZE, now=now,
+        )
+        if not jobs and not applications:
+            break
+        total_jobs += jobs
+        total_applications += applications
+        batches += 1
+    return total_jobs, total_applications
+
+
+def restore_jobs(job_ids, application_batch_size=None):
+    """
+    Move archived jobs (with their applications, links and funnel rollups)
+    back to the hot tables, inactive. Returns ``(jobs, applications)`` restored.
+    """
+    application_batch_size = application_batch_size or settings.JOB_ARCHIVE_APPLICATION_BATCH_SIZE
+    with transaction.atomic():
+        archived = list(
+            ArchivedJob.objects.filter(pk__in=job_ids).select_for_update()
+            .values('pk', 'company_id', 'funnel_stages')
+        )
+        if not archived:
+            return 0, 0
+        ids = [row['pk'] for row in archived]
+        # Jobs reactivated mid-archive are still live and keep their state
+        live = set(Job.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        _copy_rows(ArchivedJob, Job, _columns(Job), ids)
+        _copy_m2m(ArchivedJob, Job, ids)
+        # A fresh updated_at keeps the next sweep from archiving it straight away
+        Job.objects.filter(pk__in=[pk for pk in ids if pk not in live]).update(updated_at=timezone.now())
+        FunnelStageRollup.objects.bulk_create([
+            FunnelStageRollup(company_id=row['company_id'], job_id=row['pk'], **stage)
+            for row in archived for stage in row['funnel_stages']
+        ], ignore_conflicts=True)
+
+    applications = _move_applications(ArchivedApplication, Application, ids, application_batch_size)
+
+    with transaction.atomic():
+        ArchivedJob.objects.filter(pk__in=ids).delete()
+    for company_id in {row['company_id'] for row in archived}:
+        invalidate_company_dashboard(company_id)
+    return len(ids), applications
+
+
+def archived_requested(request):
+    """
+    Which tables an admin list reads: True for the archive alone
+    (``?archived=true``), False for the live table alone (``?archived=false``),
+    None by default for both, merged (see ArchiveReadThroughMixin).
+    """
+    value = request.query_params.get('archived', '').lower()
+    if value in ('1', 'true', 'yes'):
+        return True
+    if value in ('0', 'false', 'no'):
+        return False
+    return None
+
+
+class ArchiveReadThroughMixin:
+    """
+    List view over a live model that also lists the rows of its archive twin,
+    merged in the live ordering and paged as one list by
+    EstimatedCountPagination. Views define ``get_archive_queryset()``,
+    returning the filtered archive queryset, or None to list one table alone.
+    """
+
+    def list(self, request, *args, **kwargs):
+        archive = self.get_archive_queryset()
+        if archive is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(merge_querysets([queryset, archive]), many=True).data)
+
+
+def filter_archive(filterset_class, request, queryset):
+    """
+    Apply a live model's FilterSet to its archive twin (same field names).
+    DjangoFilterBackend refuses querysets of another model, so views reading
+    archive tables filter through here.
+    """
+    filterset = filterset_class(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    return filterset.qs
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from jobs.archive import archive_inactive_jobs, restore_jobs
+
+
+class Command(BaseCommand):
+    help = 'Move jobs inactive for N days, with their applications, to the archive tables, or restore archived jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.JOB_ARCHIVE_AFTER_DAYS,
+            help='Archive jobs inactive (unchanged) for at least this many days'
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.JOB_ARCHIVE_BATCH_SIZE, help='Jobs per batch')
+        parser.add_argument(
+            '--application-batch-size', type=int, default=settings.JOB_ARCHIVE_APPLICATION_BATCH_SIZE,
+            help='Applications moved per transaction'
+        )
+        parser.add_argument('--restore', type=int, nargs='+', metavar='JOB_ID', help='Restore these archived jobs instead')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            jobs, applications = restore_jobs(options['restore'], options['application_batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Restored {jobs} job(s) and {applications} application(s)'))
+            return
+        jobs, applications = archive_inactive_jobs(
+            options['days'], options['batch_size'], options['application_batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {jobs} job(s) and {applications} application(s)'))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('companies', '0003_alter_company_options_and_more'),
+        ('jobs', '0003_alter_job_options_job_jobs_job_is_acti_745178_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('expires_at__isnull', False), ('is_active', True)), fields=['expires_at'], name='job_active_expiry_idx'),
+        ),
+    ]
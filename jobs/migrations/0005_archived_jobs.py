@@ -0,0 +1,67 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('companies', '0003_alter_company_options_and_more'),
+        ('jobs', '0004_job_expires_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=100)),
+                ('job_type', models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('internship', 'Internship'), ('remote', 'Remote')], max_length=20)),
+                ('salary_range', models.CharField(blank=True, max_length=100)),
+                ('is_active', models.BooleanField(default=False)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('funnel_stages', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['updated_at'], name='job_inactive_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedjob',
+            name='categories',
+            field=models.ManyToManyField(related_name='archived_jobs', to='categories.category'),
+        ),
+        migrations.AddField(
+            model_name='archivedjob',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to='companies.company'),
+        ),
+        migrations.AddField(
+            model_name='archivedjob',
+            name='posted_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_posted_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedjob',
+            name='required_skills',
+            field=models.ManyToManyField(related_name='archived_jobs', to='categories.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjob',
+            index=models.Index(fields=['company', '-created_at'], name='jobs_archiv_company_1a9bb2_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Max, Min
+from django.utils import timezone
+
+# Rows per UPDATE; each batch commits on its own so the table is never locked for long
+BATCH_SIZE = 10000
+
+
+def backfill_expires_at(apps, schema_editor):
+    """
+    Give postings active before expiry existed a full default lifetime from
+    now, so the expiry sweep reaches them too without closing old postings
+    all at once right after the deploy.
+    """
+    lifetime = settings.JOB_DEFAULT_LIFETIME_DAYS
+    if not lifetime:
+        return
+    Job = apps.get_model('jobs', 'Job')
+    expires_at = timezone.now() + timedelta(days=lifetime)
+    pending = Job.objects.filter(is_active=True, expires_at__isnull=True)
+    bounds = pending.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['low'] is None:
+        return
+    for start in range(bounds['low'], bounds['high'] + 1, BATCH_SIZE):
+        pending.filter(pk__gte=start, pk__lt=start + BATCH_SIZE).update(expires_at=expires_at)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0005_archived_jobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+    ]
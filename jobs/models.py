@@ -1,8 +1,16 @@
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from users.models import User
 from companies.models import Company
 from categories.models import Category, Skill
 
+def fresh_expiry(now):
+    """Expiry of a posting (re)opened at ``now``: JOB_DEFAULT_LIFETIME_DAYS later, or never when unset."""
+    lifetime = settings.JOB_DEFAULT_LIFETIME_DAYS
+    return now + timedelta(days=lifetime) if lifetime else None
+
 # Create your models here.
 class Job(models.Model):
     JOB_TYPES = (
@@ -23,6 +31,8 @@ class Job(models.Model):
     categories = models.ManyToManyField(Category, related_name='jobs')
     required_skills = models.ManyToManyField(Skill, related_name='jobs')
     is_active = models.BooleanField(default=True)
+    # Deactivated by the jobs.tasks.expire_jobs periodic task once passed; null never expires
+    expires_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -35,9 +45,51 @@ class Job(models.Model):
             models.Index(fields=['company', 'is_active']),
             models.Index(fields=['job_type', 'is_active']),
             models.Index(fields=['location', 'is_active']),
+
+            # Expiry sweep: only active postings with a deadline
+            models.Index(
+                fields=['expires_at'], name='job_active_expiry_idx',
+                condition=models.Q(is_active=True, expires_at__isnull=False)
+            ),
+            # Archival sweep: inactive postings by last change
+            models.Index(fields=['updated_at'], name='job_inactive_updated_idx', condition=models.Q(is_active=False)),
         ]
         ordering = ['-created_at']
 
     def __str__(self):
         return f"{self.title} - {self.company.name}"
 
+
+
+class ArchivedJob(models.Model):
+    """
+    Cold copy of a Job moved out of the hot table by jobs.archive after being
+    inactive for JOB_ARCHIVE_AFTER_DAYS. Columns (and the id) match Job so
+    rows move with INSERT ... SELECT and serializers read both; the job's
+    funnel rollups are kept in ``funnel_stages`` until it is restored.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='archived_jobs')
+    posted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_posted_jobs')
+    location = models.CharField(max_length=100)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES)
+    salary_range = models.CharField(max_length=100, blank=True)
+    categories = models.ManyToManyField(Category, related_name='archived_jobs')
+    required_skills = models.ManyToManyField(Skill, related_name='archived_jobs')
+    is_active = models.BooleanField(default=False)
+    expires_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    funnel_stages = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', '-created_at']),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.title} - {self.company.name} (archived)"
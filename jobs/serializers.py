@@ -1,10 +1,16 @@
+from django.utils import timezone
 from rest_framework import serializers
 from categories.serializers import CategorySerializer, SkillSerializer
 from companies.serializers import CompanySerializer
-from .models import Job
+from .models import Job, fresh_expiry
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 
+def validate_future_expiry(value):
+    if value is not None and value <= timezone.now():
+        raise serializers.ValidationError("Expiry must be in the future.")
+    return value
+
 class JobSerializer(serializers.ModelSerializer):
     company_details = CompanySerializer(source='company', read_only=True)
     posted_by_name = serializers.CharField(source='posted_by.username', read_only=True)
@@ -19,7 +25,7 @@ class JobSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'company', 'company_details',
             'posted_by', 'posted_by_name', 'location', 'job_type',
             'salary_range', 'categories', 'categories_details',
-            'required_skills', 'skills_details', 'is_active',
+            'required_skills', 'skills_details', 'is_active', 'expires_at',
             'application_count', 'is_owner', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'posted_by', 'created_at', 'updated_at']
@@ -31,9 +37,20 @@ class JobCreateSerializer(serializers.ModelSerializer):
         model = Job
         fields = [
             'title', 'description', 'company', 'location', 'job_type',
-            'salary_range', 'categories', 'required_skills', 'is_active'
+            'salary_range', 'categories', 'required_skills', 'is_active', 'expires_at'
         ]
+        extra_kwargs = {
+            'expires_at': {'help_text': 'Defaults to JOB_DEFAULT_LIFETIME_DAYS from now'}
+        }
     
+    def validate_expires_at(self, value):
+        return validate_future_expiry(value)
+
+    def create(self, validated_data):
+        if 'expires_at' not in validated_data:
+            validated_data['expires_at'] = fresh_expiry(timezone.now())
+        return super().create(validated_data)
+
     def validate_company(self, value):
         # Check if user is associated with the company
         request = self.context.get('request')
@@ -47,9 +64,20 @@ class JobUpdateSerializer(serializers.ModelSerializer):
         model = Job
         fields = [
             'title', 'description', 'location', 'job_type',
-            'salary_range', 'categories', 'required_skills', 'is_active'
+            'salary_range', 'categories', 'required_skills', 'is_active', 'expires_at'
         ]
 
+    def validate_expires_at(self, value):
+        return validate_future_expiry(value)
+
+    def update(self, instance, validated_data):
+        now = timezone.now()
+        if (validated_data.get('is_active') and 'expires_at' not in validated_data
+                and instance.expires_at and instance.expires_at <= now):
+            # Reactivating an expired posting starts a fresh lifetime instead of being swept again
+            validated_data['expires_at'] = fresh_expiry(now)
+        return super().update(instance, validated_data)
+
 class JobSummarySerializer(serializers.ModelSerializer):
     company_name = serializers.CharField(source='company.name', read_only=True)
     company_logo = serializers.ImageField(source='company.logo', read_only=True)
@@ -0,0 +1,57 @@
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from analytics.rollups import record_job_events
+from companies.dashboard import invalidate_company_dashboard
+from jobboard.tasks import RetryingTask, single_flight
+from .archive import archive_inactive_jobs
+from .models import Job
+
+def expire_job_batch(now, batch_size):
+    """
+    Deactivate up to ``batch_size`` expired postings with one conditional
+    UPDATE, then bump counters and caches once for the whole batch.
+    Returns the number of jobs deactivated; 0 means nothing is left.
+    """
+    expired = Job.objects.filter(is_active=True, expires_at__lt=now)
+    with transaction.atomic():
+        # skip_locked lets a concurrent sweep (or an admin edit) keep its rows
+        rows = list(
+            expired.select_for_update(skip_locked=True)
+            .order_by('expires_at', 'pk')
+            .values_list('pk', 'company_id')[:batch_size]
+        )
+        if not rows:
+            return 0
+        updated = expired.filter(pk__in=[pk for pk, _ in rows]).update(is_active=False, updated_at=now)
+        # QuerySet.update() bypasses the model signal handlers
+        record_job_events(deactivated=updated)
+        for company_id in {company_id for _, company_id in rows}:
+            invalidate_company_dashboard(company_id)
+    return updated
+
+@shared_task(base=RetryingTask)
+def expire_jobs(batch_size=None, max_batches=None):
+    """Periodic sweep deactivating every posting whose ``expires_at`` has passed."""
+    batch_size = batch_size or settings.JOB_EXPIRY_BATCH_SIZE
+    with single_flight('jobs:expire-jobs', timeout=3600) as acquired:
+        if not acquired:
+            return 0
+        now = timezone.now()
+        total = batches = 0
+        while max_batches is None or batches < max_batches:
+            updated = expire_job_batch(now, batch_size)
+            if not updated:
+                break
+            total += updated
+            batches += 1
+        return total
+
+@shared_task(base=RetryingTask)
+def archive_jobs(max_batches=None):
+    """Periodic move of long-inactive jobs and their applications to the archive tables."""
+    with single_flight('jobs:archive-jobs', timeout=6 * 3600) as acquired:
+        if not acquired:
+            return 0, 0
+        return archive_inactive_jobs(max_batches=max_batches)
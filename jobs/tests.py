@@ -1,9 +1,19 @@
+from importlib import import_module
+from django.apps import apps
 from django.test import TestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from jobboard.test_utils import BaseAPITestCase
-from .models import Job
+from jobboard.test_utils import BaseAPITestCase, ConcurrentAPITestCase, QueryBudget
+from analytics.models import DailyJobRollup
+from datetime import timedelta
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from applications.models import Application, ArchivedApplication, FunnelStageRollup
+from .archive import archive_inactive_jobs, restore_jobs
+from .tasks import archive_jobs, expire_jobs
+from .models import ArchivedJob, Job
 from categories.models import Category, Skill
 
 # Create your tests here.
@@ -171,6 +181,8 @@ class JobCreateTests(BaseAPITestCase):
         job = Job.objects.get(title='New Backend Developer Position')
         self.assertEqual(job.posted_by, self.employer_user)
         self.assertEqual(job.company, self.company)
+        # Postings expire by default
+        self.assertIsNotNone(job.expires_at)
         
         # Verify categories and skills were added
         self.assertEqual(job.categories.count(), 1)
@@ -501,6 +513,205 @@ class JobActivationTests(BaseAPITestCase):
         self.job.refresh_from_db()
         self.assertTrue(self.job.is_active)
 
+class JobExpiryTests(BaseAPITestCase):
+    """Test scheduled expiry of job postings"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company()
+        past = timezone.now() - timedelta(days=1)
+        self.expired = [self.create_test_job(company=self.company, expires_at=past) for _ in range(3)]
+        self.current = self.create_test_job(company=self.company, expires_at=timezone.now() + timedelta(days=5))
+        self.open_ended = self.create_test_job(company=self.company)
+
+    def test_expire_jobs_deactivates_in_batches(self):
+        """Test that expired postings are deactivated batch by batch and counted once per batch"""
+        deactivated_before = DailyJobRollup.objects.get().deactivated
+
+        self.assertEqual(expire_jobs.delay(batch_size=2).get(), 3)
+
+        self.assertEqual(Job.objects.filter(pk__in=[job.pk for job in self.expired], is_active=True).count(), 0)
+        self.assertTrue(Job.objects.get(pk=self.current.pk).is_active)
+        self.assertTrue(Job.objects.get(pk=self.open_ended.pk).is_active)
+        self.assertEqual(DailyJobRollup.objects.get().deactivated - deactivated_before, 3)
+        # Nothing left to do on the next run
+        self.assertEqual(expire_jobs.delay().get(), 0)
+
+    def test_expire_jobs_respects_max_batches(self):
+        """Test that one run can be bounded to a number of batches"""
+        self.assertEqual(expire_jobs.delay(batch_size=1, max_batches=2).get(), 2)
+        self.assertEqual(Job.objects.filter(is_active=True, expires_at__lt=timezone.now()).count(), 1)
+
+    def test_reactivating_expired_job_renews_expiry(self):
+        """Test that reactivating an expired posting gives it a fresh lifetime"""
+        expire_jobs.delay()
+        self.authenticate_user(self.employer_user)
+        response = self.client.patch(reverse('job-activation', args=[self.expired[0].id]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        job = Job.objects.get(pk=self.expired[0].pk)
+        self.assertTrue(job.is_active)
+        self.assertGreater(job.expires_at, timezone.now())
+
+    def test_reactivating_through_update_renews_expiry(self):
+        """Test that setting is_active on an expired posting renews it, and past expiries are rejected"""
+        expire_jobs.delay()
+        self.authenticate_user(self.employer_user)
+        url = reverse('job-detail', args=[self.expired[0].id])
+        response = self.client.patch(url, {'is_active': True}, format='json')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        job = Job.objects.get(pk=self.expired[0].pk)
+        self.assertTrue(job.is_active)
+        self.assertGreater(job.expires_at, timezone.now() + timedelta(days=1))
+
+        response = self.client.patch(url, {'expires_at': (timezone.now() - timedelta(hours=1)).isoformat()}, format='json')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_migration_backfills_active_jobs(self):
+        """Test that postings without an expiry get a full default lifetime from the migration"""
+        Job.objects.filter(pk=self.open_ended.pk).update(expires_at=None)
+        inactive = self.create_test_job(company=self.company, is_active=False)
+        migration = import_module('jobs.migrations.0006_backfill_job_expires_at')
+
+        Job.objects.filter(pk=self.open_ended.pk).update(created_at=timezone.now() - timedelta(days=400))
+        with self.settings(JOB_DEFAULT_LIFETIME_DAYS=30):
+            before = timezone.now()
+            migration.backfill_expires_at(apps, None)
+
+        # Even a posting older than the lifetime stays open for a full one
+        job = Job.objects.get(pk=self.open_ended.pk)
+        self.assertGreaterEqual(job.expires_at, before + timedelta(days=30))
+        self.assertLessEqual(job.expires_at, timezone.now() + timedelta(days=30))
+        self.assertEqual(expire_jobs.delay().get(), 3)
+        self.assertTrue(Job.objects.get(pk=self.open_ended.pk).is_active)
+        self.assertIsNone(Job.objects.get(pk=inactive.pk).expires_at)
+        self.assertEqual(Job.objects.get(pk=self.current.pk).expires_at, self.current.expires_at)
+
+
+class JobArchiveTests(BaseAPITestCase):
+    """Test moving long-inactive jobs to the archive tables and back"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company()
+        self.stale = [self.create_test_job(company=self.company, is_active=False) for _ in range(3)]
+        self.recent = self.create_test_job(company=self.company, is_active=False)
+        self.live = self.create_test_job(company=self.company)
+        for job in self.stale:
+            for _ in range(3):
+                self.create_test_application(job=job, applicant=self.create_user(user_type='job_seeker'))
+        Job.objects.filter(pk__in=[job.pk for job in self.stale]).update(updated_at=timezone.now() - timedelta(days=200))
+
+    def test_archive_moves_jobs_and_applications_in_batches(self):
+        """Test that stale jobs move with their applications, links and funnels in bounded batches"""
+        job = self.stale[0]
+        funnel = FunnelStageRollup.objects.get(job=job, stage='applied')
+
+        self.assertEqual(archive_inactive_jobs(days=180, batch_size=2, application_batch_size=2), (3, 9))
+
+        stale_ids = [stale.pk for stale in self.stale]
+        self.assertFalse(Job.objects.filter(pk__in=stale_ids).exists())
+        self.assertFalse(Application.objects.filter(job_id__in=stale_ids).exists())
+        self.assertEqual(ArchivedApplication.objects.filter(job_id__in=stale_ids).count(), 9)
+        self.assertEqual(Job.objects.filter(pk__in=[self.recent.pk, self.live.pk]).count(), 2)
+
+        archived = ArchivedJob.objects.get(pk=job.pk)
+        self.assertEqual(archived.title, job.title)
+        self.assertEqual(archived.created_at, job.created_at)
+        self.assertEqual(list(archived.categories.values_list('name', flat=True)), ['Technology'])
+        self.assertEqual(list(archived.required_skills.values_list('name', flat=True)), ['Python'])
+        self.assertIn({
+            'stage': 'applied', 'entered': funnel.entered, 'exited': funnel.exited,
+            'total_seconds_in_stage': 0, 'duration_histogram': funnel.duration_histogram,
+        }, archived.funnel_stages)
+        # Nothing left to do on the next run
+        self.assertEqual(archive_jobs.delay().get(), (0, 0))
+
+    def test_restore_brings_everything_back(self):
+        """Test that restoring an archived job reinstates it inactive, with applications and funnel"""
+        job = self.stale[0]
+        applications = list(Application.objects.filter(job=job).order_by('pk').values_list('pk', 'applied_date'))
+        archive_inactive_jobs(days=180)
+
+        self.assertEqual(restore_jobs([job.pk], application_batch_size=2), (1, 3))
+
+        restored = Job.objects.get(pk=job.pk)
+        self.assertFalse(restored.is_active)
+        self.assertEqual(restored.created_at, job.created_at)
+        self.assertGreater(restored.updated_at, timezone.now() - timedelta(minutes=1))
+        self.assertEqual(list(restored.categories.values_list('name', flat=True)), ['Technology'])
+        self.assertEqual(
+            list(Application.objects.filter(job=job).order_by('pk').values_list('pk', 'applied_date')), applications
+        )
+        self.assertEqual(FunnelStageRollup.objects.get(job=job, stage='applied').entered, 3)
+        self.assertFalse(ArchivedJob.objects.filter(pk=job.pk).exists())
+        self.assertFalse(ArchivedApplication.objects.filter(job_id=job.pk).exists())
+        self.assertEqual(restore_jobs([job.pk]), (0, 0))
+
+    def test_admin_lists_and_restores_archive(self):
+        """Test the admin archived job list and the restore endpoint"""
+        archive_inactive_jobs(days=180)
+        self.authenticate_user(self.admin_user)
+
+        response = self.client.get(reverse('admin-job-list'), {'archived': 'true'})
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(sorted(job['id'] for job in response.data), sorted(job.pk for job in self.stale))
+        self.assertEqual({job['application_count'] for job in response.data}, {3})
+        self.assertEqual(response.data[0]['skills_details'][0]['name'], 'Python')
+
+        response = self.client.get(reverse('admin-job-list'), {'archived': 'true', 'title': self.stale[1].title})
+        self.assertEqual([job['id'] for job in response.data], [self.stale[1].pk])
+
+        response = self.client.get(reverse('admin-job-list'), {'archived': 'false'})
+        self.assertEqual(sorted(job['id'] for job in response.data), sorted([self.recent.pk, self.live.pk]))
+
+        # By default live and archived jobs are listed together, newest first
+        everything = sorted([self.recent, self.live, *self.stale], key=lambda job: (job.created_at, job.pk), reverse=True)
+        response = self.client.get(reverse('admin-job-list'))
+        self.assertEqual([job['id'] for job in response.data], [job.pk for job in everything])
+        self.assertEqual({job['application_count'] for job in response.data if job['id'] == self.stale[0].pk}, {3})
+        response = self.client.get(reverse('admin-job-list'), {'page_size': 2, 'page': 2})
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([job['id'] for job in response.data['results']], [job.pk for job in everything[2:4]])
+        response = self.client.get(reverse('admin-job-list'), {'title': self.stale[1].title})
+        self.assertEqual([job['id'] for job in response.data], [self.stale[1].pk])
+
+        response = self.client.post(reverse('admin-job-restore', args=[self.stale[0].pk]))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'job_id': self.stale[0].pk, 'restored_applications': 3})
+        response = self.client.post(reverse('admin-job-restore', args=[self.stale[0].pk]))
+        self.assertResponseError(response, status.HTTP_404_NOT_FOUND)
+
+        self.authenticate_user(self.employer_user)
+        self.assertResponsePermissionDenied(self.client.post(reverse('admin-job-restore', args=[self.stale[1].pk])))
+
+    def test_archiving_disabled(self):
+        """Test that zero days turns archival off"""
+        self.assertEqual(archive_inactive_jobs(days=0), (0, 0))
+        self.assertEqual(Job.objects.filter(pk__in=[job.pk for job in self.stale]).count(), 3)
+
+
+class JobActivationConcurrencyTests(ConcurrentAPITestCase):
+    """Test that concurrent activation toggles never lose or double-apply a flip"""
+
+    def test_concurrent_toggles(self):
+        company = self.create_test_company()
+        job = self.create_test_job(company=company)
+        clients = [self.client_for(self.employer_user) for _ in range(self.threads)]
+
+        responses = self.run_concurrently(
+            lambda index: clients[index].patch(reverse('job-activation', args=[job.id]))
+        )
+
+        codes = [response.status_code for response in responses]
+        self.assertTrue(set(codes) <= {status.HTTP_200_OK, status.HTTP_409_CONFLICT}, codes)
+        flips = codes.count(status.HTTP_200_OK)
+        self.assertGreaterEqual(flips, 1)
+        job.refresh_from_db()
+        self.assertEqual(job.is_active, flips % 2 == 0)
+        rollup = DailyJobRollup.objects.get()
+        self.assertEqual(rollup.activated + rollup.deactivated, flips)
+
+
 class JobAdminAPITests(BaseAPITestCase):
     """Test admin-only job endpoints"""
     
@@ -546,6 +757,44 @@ class JobAdminAPITests(BaseAPITestCase):
         response = self.client.get(reverse('admin-job-list'))
         self.assertResponsePermissionDenied(response)
 
+class JobAdminSiteTests(BaseAPITestCase):
+    """Test the Django admin changelist and bulk actions for jobs"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_test_company()
+        self.client.force_login(self.admin_user)
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:jobs_job_changelist'))
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Test that application counts and companies are fetched with the page, not per row"""
+        job = self.create_test_job(company=self.company)
+        self.create_test_application(job=job)
+        few = self.changelist_queries()
+        for _ in range(5):
+            self.create_test_application(job=self.create_test_job(company=self.create_test_company()))
+        self.assertEqual(self.changelist_queries(), few)
+
+    def test_bulk_deactivate_and_activate(self):
+        """Test that the bulk actions flip every selected job with one UPDATE"""
+        jobs = [self.create_test_job(company=self.company) for _ in range(3)]
+        url = reverse('admin:jobs_job_changelist')
+        selected = [job.pk for job in jobs[:2]]
+
+        response = self.client.post(url, {'action': 'deactivate_jobs', '_selected_action': selected})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(set(Job.objects.filter(is_active=False).values_list('pk', flat=True)), set(selected))
+        self.assertEqual(DailyJobRollup.objects.get(day=timezone.localdate()).deactivated, 2)
+
+        self.client.post(url, {'action': 'activate_jobs', '_selected_action': [job.pk for job in jobs]})
+        self.assertFalse(Job.objects.filter(is_active=False).exists())
+        self.assertEqual(DailyJobRollup.objects.get(day=timezone.localdate()).activated, 2)
+
 class JobFilterTests(BaseAPITestCase):
     """Test advanced job filtering"""
     
@@ -641,3 +890,27 @@ class JobFilterTests(BaseAPITestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['title'], 'Remote Python Developer')
 
+
+
+class JobQueryBudgetTests(BaseAPITestCase):
+    """Job list endpoints must not run a query per listed job"""
+    query_budgets = [
+        QueryBudget('job-list-create', max_queries=4, populate='add_jobs'),
+        QueryBudget('job-list-create', max_queries=5, populate='add_jobs', user='job_seeker_user'),
+        QueryBudget('job-search', max_queries=3, populate='add_jobs', params={'search': 'Job'}),
+        QueryBudget('company-jobs', max_queries=3, populate='add_company_jobs'),
+        # One more for the UNION ordering live and archived jobs together
+        QueryBudget('admin-job-list', max_queries=6, populate='add_jobs', user='admin_user'),
+    ]
+
+    def add_jobs(self, count):
+        for _ in range(count):
+            self.create_test_job()
+        return {}
+
+    def add_company_jobs(self, count):
+        if not hasattr(self, 'company'):
+            self.company = self.create_test_company()
+        for _ in range(count):
+            self.create_test_job(company=self.company)
+        return {'company_id': self.company.pk}
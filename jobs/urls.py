@@ -2,7 +2,7 @@ from django.urls import path
 from .views import (
     JobListCreateView, JobRetrieveUpdateDestroyView, 
     JobSearchView, CompanyJobsView, JobAdminListView,
-    JobActivationView
+    JobActivationView, JobRestoreView
 )
 
 urlpatterns = [
@@ -21,5 +21,6 @@ urlpatterns = [
     # Admin-only endpoints
     path('admin/all/', JobAdminListView.as_view(), name='admin-job-list'),
     path('<int:pk>/activation/', JobActivationView.as_view(), name='job-activation'),
+    path('admin/archived/<int:pk>/restore/', JobRestoreView.as_view(), name='admin-job-restore'),
 ]
 
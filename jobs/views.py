@@ -1,9 +1,17 @@
 from django.shortcuts import render
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions, filters, status
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db import transaction
 from django.db.models import Count, Q
-from .models import Job
+from django.utils import timezone
+from jobboard.exceptions import Conflict
+from alerts.tasks import queue_job_matching
+from analytics.rollups import record_job_events
+from companies.dashboard import invalidate_company_dashboard
+from .archive import ArchiveReadThroughMixin, archived_requested, filter_archive, restore_jobs
+from .models import ArchivedJob, Job, fresh_expiry
 from .serializers import JobSerializer, JobCreateSerializer, JobUpdateSerializer, JobSummarySerializer, JobActivationResponseSerializer
 from .filters import JobFilter
 from users.permissions import IsAdminUserRole, IsCompanyManager
@@ -31,9 +39,9 @@ class JobListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         queryset = Job.objects.filter(is_active=True).select_related(
-            'company', 'posted_by'
+            'company', 'company__created_by', 'posted_by'
         ).prefetch_related(
-            'categories', 'required_skills'
+            'categories', 'required_skills', 'company__managers'
         ).annotate(application_count=Count('applications'))
 
         # Add owner annotation for authenticated users
@@ -55,7 +63,9 @@ class JobListCreateView(generics.ListCreateAPIView):
         return [permissions.AllowAny()]
 
     def perform_create(self, serializer):
-        serializer.save(posted_by=self.request.user)
+        # Atomic so saved-search matching, queued on commit, sees the categories and skills
+        with transaction.atomic():
+            serializer.save(posted_by=self.request.user)
 
 @extend_schema(
     tags=['jobs'],
@@ -134,7 +144,7 @@ class JobSearchView(generics.ListAPIView):
         return Job.objects.filter(is_active=True).select_related(
             'company'
         ).prefetch_related(
-            'categories'
+            'categories', 'required_skills'
         ).annotate(application_count=Count('applications'))
 
 @extend_schema(
@@ -162,36 +172,87 @@ class CompanyJobsView(generics.ListAPIView):
         company_id = self.kwargs['company_id']
         return Job.objects.filter(company_id=company_id, is_active=True).select_related(
             'company'
+        ).prefetch_related(
+            'categories', 'required_skills'
         ).annotate(application_count=Count('applications'))
 
 # Admin-only endpoints
 @extend_schema(
     tags=['jobs', 'admin'],
     summary='Admin: List all jobs',
-    description='Admins can list all jobs, regardless of status',
+    description=(
+        'Admins can list all jobs, regardless of status, archived ones included, newest first. '
+        'archived=true lists only archived jobs, archived=false only live ones.'
+    ),
+    parameters=[
+        OpenApiParameter(name='archived', type=bool, description='Only archived (true) or only live (false) jobs', required=False),
+    ],
 )
-class JobAdminListView(generics.ListAPIView):
+class JobAdminListView(ArchiveReadThroughMixin, generics.ListAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAdminUserRole]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_class = JobFilter
     search_fields = ['title', 'description', 'location', 'company__name']
 
-    def get_queryset(self):
-        return Job.objects.select_related(
-            'company', 'posted_by'
+    def get_queryset(self, model=None):
+        model = model or (ArchivedJob if archived_requested(self.request) else Job)
+        return model.objects.select_related(
+            'company', 'company__created_by', 'posted_by'
         ).prefetch_related(
-            'categories', 'required_skills'
+            'categories', 'required_skills', 'company__managers'
         ).annotate(application_count=Count('applications'))
 
+    def get_archive_queryset(self):
+        if archived_requested(self.request) is not None:
+            return None
+        return self.filter_queryset(self.get_queryset(ArchivedJob))
+
+    def filter_queryset(self, queryset):
+        if queryset.model is Job:
+            return super().filter_queryset(queryset)
+        queryset = filter_archive(JobFilter, self.request, queryset)
+        return filters.SearchFilter().filter_queryset(self.request, queryset, self)
+
+@extend_schema(
+    tags=['jobs', 'admin'],
+    summary='Restore an archived job',
+    description=(
+        'Move an archived job back to the live tables with its applications, categories, '
+        'skills and funnel counts. The job comes back inactive.'
+    ),
+    request=None,
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'job_id': {'type': 'integer'},
+                'restored_applications': {'type': 'integer'},
+            }
+        }
+    }
+)
+class JobRestoreView(APIView):
+    permission_classes = [IsAdminUserRole]
+
+    def post(self, request, pk):
+        jobs, applications = restore_jobs([pk])
+        if not jobs:
+            return Response({'error': 'Archived job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'job_id': pk, 'restored_applications': applications})
+
 @extend_schema(
     tags=['jobs', 'admin'],
     summary='Activate/deactivate job',
-    description='Toggle job activation status. Only admins or company managers can perform this action.',
+    description=(
+        'Toggle job activation status. Only admins or company managers can perform this action. '
+        'Returns 409 if the job was toggled by another request in the meantime.'
+    ),
     responses={
         200: JobActivationResponseSerializer,
         403: JobActivationResponseSerializer,
         404: JobActivationResponseSerializer,
+        409: JobActivationResponseSerializer,
     }
 )
 class JobActivationView(generics.UpdateAPIView):
@@ -207,8 +268,23 @@ class JobActivationView(generics.UpdateAPIView):
 
     def patch(self, request, *args, **kwargs):
         job = self.get_object()
-        job.is_active = not job.is_active
-        job.save()
+        is_active = not job.is_active
+        now = timezone.now()
+        changes = {'is_active': is_active, 'updated_at': now}
+        if is_active and job.expires_at and job.expires_at <= now:
+            # Reactivating an expired posting starts a fresh lifetime instead of being swept again
+            changes['expires_at'] = fresh_expiry(now)
+        with transaction.atomic():
+            # Compare-and-set: a concurrent toggle since our read makes this a no-op
+            updated = Job.objects.filter(pk=job.pk, is_active=job.is_active).update(**changes)
+            if not updated:
+                raise Conflict('Job activation was changed by another request. Reload and retry.')
+            # QuerySet.update() bypasses the model signal handlers
+            record_job_events(activated=int(is_active), deactivated=int(not is_active))
+            invalidate_company_dashboard(job.company_id)
+            if is_active:
+                queue_job_matching([job.pk])
+        job.is_active = is_active
         action = "activated" if job.is_active else "deactivated"
         return Response({
             'message': f'Job "{job.title}" has been {action}',
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from django.db.models import Count
+from applications.models import Application
+from jobboard.counts import EstimatedCountPaginator, count_subquery
 from .models import User
 
 # Register your models here.
@@ -8,9 +9,13 @@ from .models import User
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'user_type', 'company',
                    'is_active', 'is_staff', 'last_login', 'date_joined', 'application_count')
-    list_filter = ('user_type', 'is_active', 'is_staff', 'date_joined', 'company')
+    # No company filter: it would list every company in the sidebar
+    list_filter = ('user_type', 'is_active', 'is_staff', 'date_joined')
     search_fields = ('username', 'email', 'first_name', 'last_name', 'company__name')
     ordering = ('-date_joined',)
+    list_select_related = ('company',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = UserAdmin.fieldsets + (
         ('Profile Details', {
@@ -35,7 +40,7 @@ class CustomUserAdmin(UserAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.annotate(_application_count=Count('applications'))
+        return qs.annotate(_application_count=count_subquery(Application, 'applicant'))
 
     def application_count(self, obj):
         return obj._application_count
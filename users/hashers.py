@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher whose work factor comes from settings.PASSWORD_HASHER_ITERATIONS.
+
+    It keeps Django's ``pbkdf2_sha256`` algorithm name, so existing hashes still
+    verify. Hashes stored with a different iteration count report ``must_update``
+    and are re-encoded transparently on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASHER_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from .models import User
+
+class HashingPoolSaturated(Exception):
+    """Raised when every hashing slot is busy and the request should be shed."""
+
+class HashingPool:
+    """
+    Bounded thread pool for CPU-bound password hashing.
+
+    PBKDF2 runs in ``hashlib`` with the GIL released, so a thread pool gives real
+    parallelism without the pickling cost of a process pool. At most
+    ``max_workers`` hashes run at once and at most ``max_pending`` more may wait;
+    anything beyond that fails fast with HashingPoolSaturated instead of queueing.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='password-hashing'
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolSaturated()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_hashing_pool():
+    """Return the process-wide hashing pool, built lazily from settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                options = getattr(settings, 'PASSWORD_HASHING_POOL', {})
+                _pool = HashingPool(
+                    max_workers=options.get('MAX_WORKERS', 2),
+                    max_pending=options.get('MAX_PENDING', 16),
+                )
+    return _pool
+
+@receiver(setting_changed)
+def reset_hashing_pool(*, setting, **kwargs):
+    global _pool
+    if setting == 'PASSWORD_HASHING_POOL' and _pool is not None:
+        _pool.shutdown(wait=False)
+        _pool = None
+
+def _get_user_by_username(username):
+    try:
+        return User._default_manager.get_by_natural_key(username)
+    except User.DoesNotExist:
+        return None
+
+async def acheck_credentials(username, password):
+    """
+    Async counterpart of ``authenticate()`` for the model backend.
+
+    The user lookup and any rehash write run on the request's DB thread; only
+    the hashing itself is sent to the bounded pool. A stale hash (different
+    algorithm or work factor) is re-encoded after a successful check.
+    """
+    pool = get_hashing_pool()
+    user = await sync_to_async(_get_user_by_username)(username)
+
+    if user is None:
+        # Run the hasher once to reduce the timing difference between an
+        # existing and a nonexistent user (mirrors ModelBackend).
+        await pool.run(make_password, password)
+        return None
+
+    is_correct, must_update = await pool.run(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+
+    if must_update:
+        user.password = await pool.run(make_password, password)
+        await sync_to_async(user.save)(update_fields=['password'])
+    return user
+
+async def amake_password(password):
+    """Hash a raw password on the bounded pool."""
+    return await get_hashing_pool().run(make_password, password)
@@ -0,0 +1,53 @@
+import os
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, verify_password
+from django.core.management.base import BaseCommand
+from users.hashing import HashingPool
+
+class Command(BaseCommand):
+    help = 'Measure password-check throughput (logins/sec and logins/sec per core) through the hashing pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200, help='Number of password checks to run')
+        parser.add_argument(
+            '--workers', type=int,
+            default=settings.PASSWORD_HASHING_POOL.get('MAX_WORKERS', 2),
+            help='Hashing pool size'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=settings.PASSWORD_HASHER_ITERATIONS,
+            help='PBKDF2 iterations to benchmark'
+        )
+
+    def handle(self, *args, **options):
+        logins = options['logins']
+        workers = options['workers']
+        iterations = options['iterations']
+
+        hasher = get_hasher('default')
+        encoded = hasher.encode('benchmark-password', hasher.salt(), iterations)
+
+        # Pending slots cover the whole run so nothing is shed while measuring
+        pool = HashingPool(max_workers=workers, max_pending=logins)
+        try:
+            started = time.perf_counter()
+            futures = [
+                pool.submit(verify_password, 'benchmark-password', encoded)
+                for _ in range(logins)
+            ]
+            failures = sum(1 for future in futures if not future.result()[0])
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.shutdown()
+
+        cores = min(workers, os.cpu_count() or 1)
+        per_second = logins / elapsed if elapsed else 0.0
+
+        self.stdout.write(f'{hasher.algorithm} iterations: {iterations}')
+        self.stdout.write(f'Workers: {workers} (cores used: {cores})')
+        self.stdout.write(f'Logins: {logins} in {elapsed:.2f}s')
+        self.stdout.write(f'Logins/sec: {per_second:.1f}')
+        self.stdout.write(self.style.SUCCESS(f'Logins/sec per core: {per_second / cores:.1f}'))
+        if failures:
+            self.stderr.write(f'{failures} password checks failed')
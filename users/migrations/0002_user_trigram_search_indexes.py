@@ -0,0 +1,34 @@
+from django.db import migrations
+
+TRIGRAM_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm GIN indexes only exist on PostgreSQL; other backends fall back
+    # to plain LIKE scans in UserSearchView
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS users_user_{field}_trgm '
+            f'ON users_user USING gin ((UPPER({field}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS users_user_{field}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -41,3 +41,50 @@ class User(AbstractUser):
     def is_admin_user(self):
         return self.user_type == 'admin' or self.is_staff
 
+
+
+class Deletion(models.Model):
+    """
+    Progress of the background purge of a deleted company or user. The
+    target is hidden when the deletion is requested; ``progress`` counts the
+    rows removed so far per kind (see users.purge).
+    """
+    TARGETS = (
+        ('company', 'Company'),
+        ('user', 'User'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+    ACTIVE_STATUSES = ('pending', 'running')
+
+    target = models.CharField(max_length=20, choices=TARGETS)
+    # No foreign key: the target row is gone once the purge completes
+    target_id = models.BigIntegerField()
+    requested_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='requested_deletions'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    progress = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['target', 'target_id'], condition=models.Q(status__in=['pending', 'running']),
+                name='unique_active_deletion'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.target} {self.target_id} ({self.status})"
@@ -0,0 +1,158 @@
+"""
+Background deletion of companies and users.
+
+Deleting a company or user only hides it in the request: the company
+disappears from every listing, the user can no longer log in and their
+postings are deactivated. A Deletion records the request, and ``purge``
+(run by users.tasks.purge_deletion) then removes the dependents in bounded
+batches, each in its own transaction, before deleting the row itself, so
+no request or single statement cascades over a large company. Progress is
+saved after every batch; a retried purge resumes with what is left.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from analytics.rollups import record_job_events
+from applications.models import Application, ArchivedApplication
+from companies.dashboard import invalidate_company_dashboard
+from companies.models import Company
+from companies.tasks import cleanup_deleted_company
+from jobboard.tasks import chunked, enqueue_on_commit
+from jobs.models import ArchivedJob, Job
+from .models import Deletion, User
+
+# Stored files handed to each cleanup task
+CLEANUP_BATCH_SIZE = 500
+
+
+def _deactivate_jobs(jobs, now):
+    company_ids = set(jobs.filter(is_active=True).values_list('company_id', flat=True).distinct())
+    deactivated = jobs.filter(is_active=True).update(is_active=False, updated_at=now)
+    if deactivated:
+        # QuerySet.update() bypasses the model signal handlers
+        record_job_events(deactivated=deactivated)
+    return company_ids
+
+
+def hide_company(company, now=None):
+    now = now or timezone.now()
+    Company.all_objects.filter(pk=company.pk, deleted_at__isnull=True).update(deleted_at=now)
+    _deactivate_jobs(Job.objects.filter(company_id=company.pk), now)
+    invalidate_company_dashboard(company.pk)
+
+
+def hide_user(user, now=None):
+    now = now or timezone.now()
+    if user.is_active:
+        # save() so the platform counters see the deactivation
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+    for company in Company.objects.filter(created_by=user):
+        hide_company(company, now)
+    for company_id in _deactivate_jobs(Job.objects.filter(posted_by=user), now):
+        invalidate_company_dashboard(company_id)
+
+
+def request_deletion(instance, requested_by=None):
+    """
+    Hide ``instance`` (a Company or User) and queue its purge. Returns the
+    Deletion; a deletion already in progress for it is returned as is.
+    """
+    target = 'company' if isinstance(instance, Company) else 'user'
+    with transaction.atomic():
+        deletion = Deletion.objects.filter(
+            target=target, target_id=instance.pk, status__in=Deletion.ACTIVE_STATUSES
+        ).first()
+        if deletion is not None:
+            return deletion
+        if target == 'company':
+            hide_company(instance)
+        else:
+            hide_user(instance)
+        deletion = Deletion.objects.create(target=target, target_id=instance.pk, requested_by=requested_by)
+        from .tasks import purge_deletion
+        enqueue_on_commit(purge_deletion, deletion.pk)
+    return deletion
+
+
+class Purge:
+    """Deletes one Deletion's rows batch by batch, counting them in ``deletion.progress``."""
+
+    def __init__(self, deletion, batch_size=None, job_batch_size=None):
+        self.deletion = deletion
+        self.batch_size = batch_size or settings.DELETION_BATCH_SIZE
+        self.job_batch_size = job_batch_size or settings.DELETION_JOB_BATCH_SIZE
+
+    def record(self, kind, count):
+        progress = self.deletion.progress
+        progress[kind] = progress.get(kind, 0) + count
+        self.deletion.save(update_fields=['progress', 'updated_at'])
+
+    def delete_applications(self, model, queryset, company_id=None):
+        kind = 'archived_applications' if model is ArchivedApplication else 'applications'
+        while True:
+            with transaction.atomic():
+                ids = list(queryset.select_for_update().order_by('pk').values_list('pk', flat=True)[:self.batch_size])
+                if not ids:
+                    return
+                rows = model.objects.filter(pk__in=ids)
+                # The database delete does not touch storage; collect the resumes first
+                resumes = list(rows.exclude(resume='').exclude(resume__isnull=True).values_list('resume', flat=True))
+                for batch in chunked(resumes, CLEANUP_BATCH_SIZE):
+                    enqueue_on_commit(cleanup_deleted_company, company_id, batch)
+                # Set-based delete: nothing references applications through a database constraint
+                rows._raw_delete(connection.alias)
+                self.record(kind, len(ids))
+
+    def delete_jobs(self, model, queryset, company_id=None):
+        applications = ArchivedApplication if model is ArchivedJob else Application
+        while True:
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:self.job_batch_size])
+            if not ids:
+                return
+            # Hidden jobs take no new applications, so the batch's are gone after this
+            self.delete_applications(applications, applications.objects.filter(job_id__in=ids), company_id)
+            with transaction.atomic():
+                # The ORM delete clears category/skill links and funnel rollups of the batch
+                model.objects.filter(pk__in=ids).delete()
+                self.record('archived_jobs' if model is ArchivedJob else 'jobs', len(ids))
+
+    def purge_company(self, company_id):
+        self.delete_applications(Application, Application.objects.filter(company_id=company_id), company_id)
+        self.delete_jobs(Job, Job.objects.filter(company_id=company_id), company_id)
+        self.delete_jobs(ArchivedJob, ArchivedJob.objects.filter(company_id=company_id), company_id)
+        with transaction.atomic():
+            company = Company.all_objects.filter(pk=company_id).first()
+            if company is None:
+                return
+            if company.logo:
+                enqueue_on_commit(cleanup_deleted_company, company_id, [company.logo.name])
+            company.delete()
+            self.record('companies', 1)
+        invalidate_company_dashboard(company_id)
+
+    def purge_user(self, user_id):
+        for company_id in Company.all_objects.filter(created_by_id=user_id).values_list('pk', flat=True):
+            self.purge_company(company_id)
+        self.delete_jobs(Job, Job.objects.filter(posted_by_id=user_id))
+        self.delete_jobs(ArchivedJob, ArchivedJob.objects.filter(posted_by_id=user_id))
+        self.delete_applications(Application, Application.objects.filter(applicant_id=user_id))
+        self.delete_applications(ArchivedApplication, ArchivedApplication.objects.filter(applicant_id=user_id))
+        with transaction.atomic():
+            # Remaining relations (manager links, employees) are small and cascade here
+            deleted, _ = User.objects.filter(pk=user_id).delete()
+            if deleted:
+                self.record('users', 1)
+
+    def run(self):
+        deletion = self.deletion
+        deletion.status = 'running'
+        deletion.save(update_fields=['status', 'updated_at'])
+        if deletion.target == 'company':
+            self.purge_company(deletion.target_id)
+        else:
+            self.purge_user(deletion.target_id)
+        deletion.status = 'completed'
+        deletion.completed_at = timezone.now()
+        deletion.save(update_fields=['status', 'completed_at', 'updated_at'])
+        return deletion
@@ -3,7 +3,7 @@ from phonenumber_field.serializerfields import PhoneNumberField
 from django.contrib.auth.password_validation import validate_password
 from companies.serializers import CompanySummarySerializer
 from django.contrib.auth import authenticate
-from .models import User
+from .models import Deletion, User
 
 class UserSerializer(serializers.ModelSerializer):
     phone_number = PhoneNumberField(required=False, allow_null=True)
@@ -67,15 +67,26 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password_confirmation')
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password'],
-            user_type=validated_data.get('user_type', 'job_seeker'),
-            first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', ''),
-            phone_number=validated_data.get('phone_number')
+        # Async registration hashes on the worker pool and passes the result in
+        password_hash = validated_data.pop('password_hash', None)
+        fields = {
+            'user_type': validated_data.get('user_type', 'job_seeker'),
+            'first_name': validated_data.get('first_name', ''),
+            'last_name': validated_data.get('last_name', ''),
+            'phone_number': validated_data.get('phone_number'),
+        }
+        if not password_hash:
+            return User.objects.create_user(
+                username=validated_data['username'], email=validated_data['email'],
+                password=validated_data['password'], **fields
+            )
+        # Normalized like create_user, with the hash in place for a single INSERT
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
+            password=password_hash, **fields
         )
+        user.save()
         return user
 
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
@@ -187,3 +198,12 @@ class TokenRefreshRequestSerializer(serializers.Serializer):
 class TokenRefreshResponseSerializer(serializers.Serializer):
     access = serializers.CharField()
 
+
+class DeletionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Deletion
+        fields = [
+            'id', 'target', 'target_id', 'status', 'progress', 'error',
+            'created_at', 'updated_at', 'completed_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,44 @@
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from django.utils import timezone
+from jobboard.tasks import RetryingTask, single_flight
+from .models import Deletion
+from .purge import Purge
+
+@shared_task(base=RetryingTask)
+def purge_deletion(deletion_id):
+    """
+    Purge a deleted company or user batch by batch (see users.purge). Safe to
+    redeliver: finished batches are gone, so a rerun continues with the rest.
+    """
+    with single_flight(f'users:purge:{deletion_id}', timeout=settings.DELETION_STALL_AFTER) as acquired:
+        if not acquired:
+            return None
+        deletion = Deletion.objects.filter(pk=deletion_id, status__in=Deletion.ACTIVE_STATUSES).first()
+        if deletion is None:
+            return None
+        try:
+            Purge(deletion).run()
+        except (OperationalError, InterfaceError):
+            # Transient: left running for the retry
+            raise
+        except Exception as exc:
+            deletion.status = 'failed'
+            deletion.error = repr(exc)
+            deletion.save(update_fields=['status', 'error', 'updated_at'])
+            raise
+        return deletion.progress
+
+@shared_task(base=RetryingTask)
+def resume_deletions():
+    """Requeue purges whose task was lost (worker killed, retries exhausted) going by their last progress."""
+    stalled = Deletion.objects.filter(
+        status__in=Deletion.ACTIVE_STATUSES,
+        updated_at__lt=timezone.now() - timedelta(seconds=settings.DELETION_STALL_AFTER),
+    ).values_list('pk', flat=True)
+    resumed = list(stalled)
+    for deletion_id in resumed:
+        purge_deletion.delay(deletion_id)
+    return resumed
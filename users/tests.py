@@ -1,8 +1,21 @@
+import shutil
+import tempfile
 from django.test import TestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from jobboard.test_utils import BaseAPITestCase
+from django.contrib.auth.hashers import get_hasher
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.signals import post_save
+from django.test import override_settings
+from jobboard.test_utils import BaseAPITestCase, ConcurrentAPITestCase
+from analytics.rollups import get_user_counters
+from applications.models import Application
+from companies.models import Company
+from jobs.models import Job
+from .hashing import get_hashing_pool
+from .models import Deletion
 
 # Create your tests here.
 User = get_user_model()
@@ -204,6 +217,62 @@ class UserPermissionTests(BaseAPITestCase):
         self.assertResponseSuccess(response, status.HTTP_200_OK)
         self.assertIn('is_active', response.data)
 
+class UserDirectoryTests(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user(self.admin_user)
+
+    def test_search_requires_minimum_length(self):
+        """Test that short or missing search terms are rejected instead of listing everyone"""
+        response = self.client.get(reverse('admin-user-search'))
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse('admin-user-search') + '?search=ab')
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_ranks_closer_matches_first(self):
+        """Test that exact and prefix matches outrank substring matches"""
+        self.create_user(username='blacksmith', email='bs@test.com')
+        self.create_user(username='smithson', email='ss@test.com')
+        self.create_user(username='smith', email='s@test.com')
+
+        response = self.client.get(reverse('admin-user-search') + '?search=smith')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        usernames = [user['username'] for user in response.data['results']]
+        self.assertEqual(usernames, ['smith', 'smithson', 'blacksmith'])
+
+    def test_search_keyset_pagination(self):
+        """Test walking search results page by page via the next cursor"""
+        for i in range(5):
+            self.create_user(username=f'pager{i}', email=f'pager{i}@test.com')
+
+        url = reverse('admin-user-search') + '?search=pager&page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertResponseSuccess(response, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(user['username'] for user in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(sorted(seen), [f'pager{i}' for i in range(5)])
+
+    def test_user_list_paginated_with_counts(self):
+        """Test the user list pages newest-first and reports per-user activity counts"""
+        job = self.create_test_job()
+        self.create_test_application(job=job)
+
+        response = self.client.get(reverse('admin-user-list') + '?page_size=2')
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(reverse('admin-user-list') + '?page_size=100')
+        users = {user['username']: user for user in response.data['results']}
+        self.assertEqual(users['jobseeker1']['application_count'], 1)
+        self.assertEqual(users['employer1']['posted_job_count'], 1)
+        self.assertEqual(users['admin']['application_count'], 0)
+
 class UserStatsTests(BaseAPITestCase):
     def test_user_stats_admin_only(self):
         """Test that user statistics are admin-only"""
@@ -218,3 +287,215 @@ class UserStatsTests(BaseAPITestCase):
         self.assertIn('job_seekers', response.data)
         self.assertIn('employers', response.data)
 
+
+class AsyncAuthenticationTests(BaseAPITestCase):
+    def test_async_login_success(self):
+        """Test login through the async hashing-pool endpoint"""
+        response = self.client.post(reverse('login-async'), {
+            'username': 'jobseeker1',
+            'password': 'testpass123'
+        })
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+        data = response.json()
+        self.assertIn('access', data)
+        self.assertEqual(data['user']['username'], 'jobseeker1')
+
+    def test_async_login_invalid_credentials(self):
+        """Test async login with a wrong password or unknown user"""
+        response = self.client.post(reverse('login-async'), {
+            'username': 'jobseeker1',
+            'password': 'wrongpassword'
+        })
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', response.json())
+
+        response = self.client.post(reverse('login-async'), {
+            'username': 'nobody',
+            'password': 'wrongpassword'
+        })
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+
+    def test_async_registration(self):
+        """Test async registration creates a usable account"""
+        saves = []
+        def record(sender, instance, created, **kwargs):
+            saves.append(created)
+        post_save.connect(record, sender=User)
+        self.addCleanup(post_save.disconnect, record, sender=User)
+        response = self.client.post(reverse('register-async'), {
+            'username': 'asyncuser',
+            'email': 'asyncuser@TEST.com',
+            'password': 'asyncpass123',
+            'password_confirmation': 'asyncpass123',
+            'user_type': 'job_seeker'
+        })
+        self.assertResponseSuccess(response, status.HTTP_201_CREATED)
+        self.assertIn('access', response.json())
+        user = User.objects.get(username='asyncuser')
+        self.assertTrue(user.check_password('asyncpass123'))
+        self.assertEqual(user.email, 'asyncuser@test.com')
+        # The precomputed hash goes in with the INSERT: no second write
+        self.assertEqual(saves, [True])
+
+        # Validation errors are reported like the sync endpoint
+        response = self.client.post(reverse('register-async'), {
+            'username': 'asyncuser',
+            'password': 'short',
+            'password_confirmation': 'short'
+        })
+        self.assertResponseError(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.json())
+
+    @override_settings(PASSWORD_HASHING_POOL={'MAX_WORKERS': 1, 'MAX_PENDING': 0})
+    def test_async_login_sheds_load_when_pool_saturated(self):
+        """Test that a saturated hashing pool answers 503 immediately"""
+        pool = get_hashing_pool()
+        pool._slots.acquire()
+        try:
+            response = self.client.post(reverse('login-async'), {
+                'username': 'jobseeker1',
+                'password': 'testpass123'
+            })
+        finally:
+            pool._slots.release()
+
+        self.assertResponseError(response, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+    @override_settings(PASSWORD_HASHER_ITERATIONS=2000)
+    def test_login_rehashes_stale_password(self):
+        """Test that a hash with an outdated work factor is upgraded on login"""
+        hasher = get_hasher('default')
+        user = self.create_user(username='stalehash')
+        user.password = hasher.encode('testpass123', hasher.salt(), 1000)
+        user.save(update_fields=['password'])
+
+        response = self.client.post(reverse('login-async'), {
+            'username': 'stalehash',
+            'password': 'testpass123'
+        })
+        self.assertResponseSuccess(response, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertEqual(hasher.decode(user.password)['iterations'], 2000)
+        self.assertTrue(user.check_password('testpass123'))
+
+
+class UserActivationConcurrencyTests(ConcurrentAPITestCase):
+    """Test that concurrent admin activation toggles stay consistent with the counters"""
+
+    def test_concurrent_toggles(self):
+        user = self.create_user()
+        active_before = get_user_counters()['active']
+        clients = [self.client_for(self.admin_user) for _ in range(self.threads)]
+
+        responses = self.run_concurrently(
+            lambda index: clients[index].patch(reverse('admin-user-activation', args=[user.id]))
+        )
+
+        codes = [response.status_code for response in responses]
+        self.assertTrue(set(codes) <= {status.HTTP_200_OK, status.HTTP_409_CONFLICT}, codes)
+        flips = codes.count(status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(user.is_active, flips % 2 == 0)
+        self.assertEqual(get_user_counters()['active'], active_before - (flips % 2))
+
+class DeletionTests(BaseAPITestCase):
+    """Test that company and user deletion hides at once and purges in bounded batches"""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_user(username='owner', user_type='employer')
+        self.company = self.create_test_company(name='Purged Co', created_by=self.owner)
+        self.jobs = [self.create_test_job(company=self.company, posted_by=self.owner) for _ in range(3)]
+        self.seekers = [self.create_user() for _ in range(2)]
+        for job in self.jobs:
+            for seeker in self.seekers:
+                self.create_test_application(job=job, applicant=seeker)
+
+    def test_delete_company_hides_without_cascading(self):
+        self.authenticate_user(self.owner)
+        response = self.client.delete(reverse('company-delete', args=[self.company.id]))
+
+        self.assertResponseSuccess(response, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertFalse(Company.objects.filter(pk=self.company.pk).exists())
+        # Nothing is deleted in the request: the rows wait for the purge task
+        self.assertTrue(Company.all_objects.filter(pk=self.company.pk).exists())
+        self.assertEqual(Application.objects.filter(company=self.company).count(), 6)
+        self.assertFalse(Job.objects.filter(company=self.company, is_active=True).exists())
+
+        progress = self.client.get(reverse('deletion-detail', args=[response.data['id']]))
+        self.assertResponseSuccess(progress)
+        self.assertEqual(progress.data['status'], 'pending')
+
+    @override_settings(DELETION_BATCH_SIZE=4, DELETION_JOB_BATCH_SIZE=2)
+    def test_company_purge_runs_in_batches(self):
+        self.authenticate_user(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('company-delete', args=[self.company.id]))
+
+        deletion = Deletion.objects.get(pk=response.data['id'])
+        self.assertEqual(deletion.status, 'completed')
+        self.assertEqual(deletion.progress, {'applications': 6, 'jobs': 3, 'companies': 1})
+        self.assertFalse(Company.all_objects.filter(pk=self.company.pk).exists())
+        self.assertFalse(Job.objects.filter(pk__in=[job.pk for job in self.jobs]).exists())
+        self.assertTrue(User.objects.filter(pk=self.owner.pk).exists())
+
+    def test_repeated_delete_returns_deletion_in_progress(self):
+        self.authenticate_user(self.owner)
+        first = self.client.delete(reverse('company-delete', args=[self.company.id]))
+        second = self.client.delete(reverse('company-delete', args=[self.company.id]))
+
+        self.assertResponseSuccess(second, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data['id'], first.data['id'])
+
+    def test_delete_user_deactivates_then_purges(self):
+        seeker = self.seekers[0]
+        self.authenticate_user(self.admin_user)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.delete(reverse('admin-user-detail', args=[self.owner.id]))
+
+        self.assertResponseSuccess(response, status.HTTP_202_ACCEPTED)
+        self.owner.refresh_from_db()
+        self.assertFalse(self.owner.is_active)
+        self.assertFalse(Company.objects.filter(pk=self.company.pk).exists())
+        conflict = self.client.patch(reverse('admin-user-activation', args=[self.owner.id]))
+        self.assertEqual(conflict.status_code, status.HTTP_409_CONFLICT)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for callback in callbacks:
+                callback()
+
+        progress = self.client.get(reverse('deletion-detail', args=[response.data['id']]))
+        self.assertEqual(progress.data['status'], 'completed')
+        self.assertEqual(progress.data['progress'], {'applications': 6, 'jobs': 3, 'companies': 1, 'users': 1})
+        self.assertFalse(User.objects.filter(pk=self.owner.pk).exists())
+        self.assertTrue(User.objects.filter(pk=seeker.pk).exists())
+
+    def test_delete_user_cleans_up_resumes(self):
+        """Test that the resumes of a deleted applicant's applications are removed by the cleanup task"""
+        seeker = self.seekers[0]
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media_root):
+            application = Application.objects.get(job=self.jobs[0], applicant=seeker)
+            application.resume = SimpleUploadedFile('cv.pdf', b'%PDF-1.4', content_type='application/pdf')
+            application.save()
+            self.assertTrue(default_storage.exists(application.resume.name))
+
+            self.authenticate_user(self.admin_user)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(reverse('admin-user-detail', args=[seeker.id]))
+
+            self.assertResponseSuccess(response, status.HTTP_202_ACCEPTED)
+            self.assertFalse(User.objects.filter(pk=seeker.pk).exists())
+            self.assertFalse(default_storage.exists(application.resume.name))
+
+    def test_deletion_progress_hidden_from_other_users(self):
+        self.authenticate_user(self.owner)
+        response = self.client.delete(reverse('company-delete', args=[self.company.id]))
+
+        self.authenticate_user(self.seekers[0])
+        progress = self.client.get(reverse('deletion-detail', args=[response.data['id']]))
+        self.assertEqual(progress.status_code, status.HTTP_404_NOT_FOUND)
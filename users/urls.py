@@ -1,16 +1,18 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenVerifyView
 from .views import (
-    RegisterView, LoginView, UserProfileView,
+    RegisterView, LoginView, AsyncRegisterView, AsyncLoginView, UserProfileView,
     UserPasswordUpdateView, RefreshTokenView,
     UserListView, UserDetailView, UserSearchView,
-    UserStatsView, UserActivationView
+    UserStatsView, UserActivationView, DeletionRetrieveView
 )
 
 urlpatterns = [
     # Authentication endpoints
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
+    path('async/register/', AsyncRegisterView.as_view(), name='register-async'),
+    path('async/login/', AsyncLoginView.as_view(), name='login-async'),
     path('token/refresh/', RefreshTokenView.as_view(), name='token-refresh'),
     path('token/verify/', TokenVerifyView.as_view(), name='token-verify'),
     
@@ -24,5 +26,6 @@ urlpatterns = [
     path('admin/users/search/', UserSearchView.as_view(), name='admin-user-search'),
     path('admin/stats/', UserStatsView.as_view(), name='admin-user-stats'),
     path('admin/users/<int:pk>/activation/', UserActivationView.as_view(), name='admin-user-activation'),
+    path('deletions/<int:pk>/', DeletionRetrieveView.as_view(), name='deletion-detail'),
 ]
 
@@ -1,18 +1,35 @@
 from django.shortcuts import render
 from rest_framework import status, permissions, generics
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
+from asgiref.sync import sync_to_async
 from django.contrib.auth import update_session_auth_hash
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
-from .models import User
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+from jobboard.counts import count_subquery
+from jobboard.pagination import KeysetPagination
+from analytics.rollups import USER_COUNTERS, bump_counters, get_user_counters
+from jobboard.exceptions import Conflict
+from .models import Deletion, User
+from .hashing import HashingPoolSaturated, acheck_credentials, amake_password
 from .serializers import (
     UserSerializer, UserAdminSerializer, UserRegistrationSerializer,
     UserLoginSerializer, UserProfileUpdateSerializer, UserPasswordUpdateSerializer,
     UserSummarySerializer, LoginResponseSerializer, RegisterResponseSerializer,
-    TokenRefreshRequestSerializer, TokenRefreshResponseSerializer
+    TokenRefreshRequestSerializer, TokenRefreshResponseSerializer, DeletionSerializer
 )
+from .purge import request_deletion
 from .permissions import IsAdminUserRole, IsOwnerOrAdmin, IsUserOwnerOrAdmin
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 
@@ -96,6 +113,94 @@ class LoginView(APIView):
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+# Async authentication endpoints
+def _parse_request_data(request):
+    """Parse a JSON, form or multipart body the same way the DRF views do."""
+    drf_request = Request(request, parsers=[JSONParser(), FormParser(), MultiPartParser()])
+    return drf_request.data
+
+def _auth_payload(user):
+    refresh = RefreshToken.for_user(user)
+    return {
+        'user': UserSerializer(user).data,
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+def _hashing_busy_response():
+    return JsonResponse(
+        {'error': 'Authentication service is busy, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': '1'}
+    )
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncRegisterView(View):
+    """
+    Async variant of RegisterView. Validation and the insert run on the DB
+    thread, password hashing runs on the bounded hashing pool, and a saturated
+    pool is answered with 503 instead of queueing behind other logins.
+    """
+    http_method_names = ['post']
+
+    async def post(self, request):
+        try:
+            data = _parse_request_data(request)
+        except ParseError as e:
+            return JsonResponse({'detail': str(e.detail)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = UserRegistrationSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            password_hash = await amake_password(serializer.validated_data['password'])
+        except HashingPoolSaturated:
+            return _hashing_busy_response()
+
+        payload = await sync_to_async(self._create_user)(serializer, password_hash)
+        return JsonResponse(payload, status=status.HTTP_201_CREATED)
+
+    def _create_user(self, serializer, password_hash):
+        user = serializer.save(password_hash=password_hash)
+        return _auth_payload(user)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncLoginView(View):
+    """
+    Async variant of LoginView. The password check runs on the bounded hashing
+    pool (with rehash-on-login) and a saturated pool is answered with 503.
+    """
+    http_method_names = ['post']
+
+    async def post(self, request):
+        try:
+            data = _parse_request_data(request)
+        except ParseError as e:
+            return JsonResponse({'detail': str(e.detail)}, status=status.HTTP_400_BAD_REQUEST)
+
+        username = data.get('username')
+        password = data.get('password')
+        if not username or not password:
+            return JsonResponse(
+                {'non_field_errors': ['Must include "username" and "password".']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            user = await acheck_credentials(username, password)
+        except HashingPoolSaturated:
+            return _hashing_busy_response()
+
+        if user is None:
+            return JsonResponse(
+                {'non_field_errors': ['Unable to log in with provided credentials.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        payload = await sync_to_async(_auth_payload)(user)
+        return JsonResponse(payload, status=status.HTTP_200_OK)
+
 @extend_schema(
     tags=['users'],
     summary='Retrieve user profile',
@@ -180,31 +285,44 @@ class RefreshTokenView(APIView):
             return Response({'error': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
 
 # Admin-only endpoints
+def annotate_activity_counts(queryset):
+    from applications.models import Application
+    from jobs.models import Job
+
+    return queryset.annotate(
+        application_count=count_subquery(Application, 'applicant'),
+        posted_job_count=count_subquery(Job, 'posted_by')
+    )
+
+class UserKeysetPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
+
 @extend_schema(
     tags=['users'],
     summary='List all users',
-    description='Admin-only endpoint to list all users with detailed information',
-    parameters=[
-        OpenApiParameter(name='page', description='Page number', required=False, type=int),
-        OpenApiParameter(name='page_size', description='Number of items per page', required=False, type=int),
-    ]
+    description='Admin-only endpoint to list all users with detailed information, newest first, using keyset pagination'
 )
 class UserListView(generics.ListAPIView):
     serializer_class = UserAdminSerializer
     permission_classes = [IsAdminUserRole]
+    pagination_class = UserKeysetPagination
     queryset = User.objects.all()
 
     def get_queryset(self):
-        return User.objects.annotate(
-            application_count=Count('applications', distinct=True),
-            posted_job_count=Count('posted_jobs', distinct=True)
-        ).select_related('company').prefetch_related('managed_companies')
+        return annotate_activity_counts(
+            User.objects.select_related('company').prefetch_related('managed_companies')
+        )
 
 @extend_schema(
     tags=['users'],
     summary='Retrieve, update or delete user',
-    description='Admin can manage any user, regular users can only view their own profile'
+    description=(
+        'Admin can manage any user, regular users can only view their own profile. '
+        'DELETE deactivates the user at once and returns 202 with the deletion, whose '
+        'companies, postings and applications are then purged in the background.'
+    )
 )
+@extend_schema(methods=['DELETE'], responses={202: DeletionSerializer})
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsUserOwnerOrAdmin]
     queryset = User.objects.all()
@@ -228,30 +346,89 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
         if getattr(self, 'swagger_fake_view', False):
             return User.objects.none()
 
-        return User.objects.annotate(
-            application_count=Count('applications', distinct=True),
-            posted_job_count=Count('posted_jobs', distinct=True)
-        ).select_related('company').prefetch_related('managed_companies')
+        return annotate_activity_counts(
+            User.objects.select_related('company').prefetch_related('managed_companies')
+        )
+
+    def destroy(self, request, *args, **kwargs):
+        deletion = request_deletion(self.get_object(), requested_by=request.user)
+        return Response(DeletionSerializer(deletion).data, status=status.HTTP_202_ACCEPTED)
+
+@extend_schema(
+    tags=['users'],
+    summary='Deletion progress',
+    description='Status and per-kind row counts of a company or user deletion, for admins or whoever requested it'
+)
+class DeletionRetrieveView(generics.RetrieveAPIView):
+    serializer_class = DeletionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Deletion.objects.none()
+        if self.request.user.is_admin_user():
+            return Deletion.objects.all()
+        return Deletion.objects.filter(requested_by=self.request.user)
+
+USER_SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+class UserSearchPagination(KeysetPagination):
+    ordering = ('-rank', 'id')
 
 @extend_schema(
     tags=['users'],
     summary='Search users',
+    description=(
+        'Search by username, email, first or last name. Results are ranked by trigram '
+        'similarity on PostgreSQL (prefix/exact matching elsewhere) and keyset paginated.'
+    ),
     parameters=[
-        OpenApiParameter(name='search', description='Search by username, email, first/last name', required=False, type=str),
+        OpenApiParameter(name='search', description='Search by username, email, first/last name', required=True, type=str),
     ],
     responses={200: UserSummarySerializer(many=True)}
 )
 class UserSearchView(generics.ListAPIView):
     serializer_class = UserSummarySerializer
     permission_classes = [IsAdminUserRole]
+    pagination_class = UserSearchPagination
+
+    def list(self, request, *args, **kwargs):
+        search_term = request.query_params.get('search', '').strip()
+        min_length = getattr(settings, 'USER_SEARCH_MIN_LENGTH', 3)
+        if len(search_term) < min_length:
+            return Response(
+                {'error': f'Search term must be at least {min_length} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().list(request, *args, **kwargs)
 
     def get_queryset(self):
-        search_term = self.request.query_params.get('search', '')
-        return User.objects.filter(
-            Q(username__icontains=search_term) |
-            Q(email__icontains=search_term) |
-            Q(first_name__icontains=search_term) |
-            Q(last_name__icontains=search_term)
+        search_term = self.request.query_params.get('search', '').strip()
+
+        # icontains on PostgreSQL compiles to UPPER(col::text) LIKE ..., which the
+        # UPPER(col) gin_trgm_ops indexes from users.0002 serve directly
+        matches = Q()
+        for field in USER_SEARCH_FIELDS:
+            matches |= Q(**{f'{field}__icontains': search_term})
+
+        return User.objects.filter(matches).annotate(rank=self.rank_expression(search_term))
+
+    def rank_expression(self, search_term):
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import TrigramSimilarity
+            return Greatest(*[TrigramSimilarity(field, search_term) for field in USER_SEARCH_FIELDS])
+
+        # Fallback for backends without pg_trgm: exact > prefix > substring
+        exact = Q()
+        prefix = Q()
+        for field in USER_SEARCH_FIELDS:
+            exact |= Q(**{f'{field}__iexact': search_term})
+            prefix |= Q(**{f'{field}__istartswith': search_term})
+        return Case(
+            When(exact, then=Value(1.0)),
+            When(prefix, then=Value(0.75)),
+            default=Value(0.5),
+            output_field=FloatField()
         )
 
 @extend_schema(
@@ -274,12 +451,14 @@ class UserStatsView(APIView):
     permission_classes = [IsAdminUserRole]
 
     def get(self, request):
+        # Served from the incrementally maintained platform counters (one query)
+        counters = get_user_counters()
         stats = {
-            'total_users': User.objects.count(),
-            'job_seekers': User.objects.filter(user_type='job_seeker').count(),
-            'employers': User.objects.filter(user_type='employer').count(),
-            'admins': User.objects.filter(user_type='admin').count(),
-            'active_users': User.objects.filter(is_active=True).count(),
+            'total_users': counters['total'],
+            'job_seekers': counters['job_seeker'],
+            'employers': counters['employer'],
+            'admins': counters['admin'],
+            'active_users': counters['active'],
         }
         return Response(stats)
 
@@ -287,7 +466,10 @@ class UserStatsView(APIView):
 @extend_schema(
     tags=['users'],
     summary='Activate/deactivate user',
-    description='Admin endpoint to activate or deactivate a user account',
+    description=(
+        'Admin endpoint to activate or deactivate a user account. '
+        'Returns 409 if the account was toggled by another request in the meantime.'
+    ),
     responses={
         200: OpenApiExample(
             'Activation Response',
@@ -303,8 +485,16 @@ class UserActivationView(APIView):
 
     def patch(self, request, pk):
         user = get_object_or_404(User, pk=pk)
-        user.is_active = not user.is_active
-        user.save()
+        if Deletion.objects.filter(target='user', target_id=user.pk, status__in=Deletion.ACTIVE_STATUSES).exists():
+            raise Conflict('User is being deleted.')
+        is_active = not user.is_active
+        with transaction.atomic():
+            # Compare-and-set: a concurrent toggle since our read makes this a no-op
+            if not User.objects.filter(pk=user.pk, is_active=user.is_active).update(is_active=is_active):
+                raise Conflict('User activation was changed by another request. Reload and retry.')
+            # QuerySet.update() bypasses the analytics signal handlers
+            bump_counters({USER_COUNTERS['active']: 1 if is_active else -1})
+        user.is_active = is_active
         action = "activated" if user.is_active else "deactivated"
         return Response({
             'message': f'User {user.username} has been {action}',